@@ -0,0 +1,212 @@
+"""Local stand-in for the Enable Banking API, for benchmarks.
+
+Serves the endpoints the backend calls with deterministic, generated data.
+Authentication is not checked and any session ID is accepted, each getting a
+stable fake bank and accounts. Latency and rate limiting (429 with
+`Retry-After`) can be injected.
+
+Point the backend at it with:
+    ENABLE_BANKING_API_ORIGIN=http://localhost:9000
+
+Usage:
+    python benchmarks/fake_enable_banking.py --port 9000 --latency-ms 80 --page-size 50
+"""
+import argparse
+import asyncio
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+import random
+from typing import Optional
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+import uvicorn
+
+
+@dataclass
+class Settings:
+    latency_ms: float = 50
+    latency_jitter_ms: float = 20
+    rate_limit_ratio: float = 0.0
+    retry_after: float = 1
+    aspsps: int = 500
+    accounts_per_session: int = 3
+    transactions_per_account: int = 500
+    page_size: int = 100
+    history_days: int = 365
+
+
+settings = Settings()
+
+app = FastAPI(title="Fake Enable Banking")
+
+COUNTRIES = ("FI", "SE", "DK", "NO", "DE", "FR", "ES", "IT", "NL", "BE")
+
+
+@app.middleware("http")
+async def inject_latency_and_rate_limits(request: Request, call_next):
+    await asyncio.sleep(
+        max(settings.latency_ms + random.uniform(-1, 1) * settings.latency_jitter_ms, 0) / 1000
+    )
+    if random.random() < settings.rate_limit_ratio:
+        return JSONResponse(
+            {"message": "Too many requests"},
+            status_code=429,
+            headers={"Retry-After": str(settings.retry_after)}
+        )
+    return await call_next(request)
+
+
+def aspsp(index: int) -> dict:
+    return {"name": f"Bank {index:04d}", "country": COUNTRIES[index % len(COUNTRIES)]}
+
+
+def aspsp_for_session(session_id: str) -> dict:
+    return aspsp(uuid.uuid5(uuid.NAMESPACE_URL, session_id).int % settings.aspsps)
+
+
+def account_uid(session_id: str, index: int) -> str:
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{session_id}/{index}"))
+
+
+def transaction(uid: str, index: int) -> dict:
+    """The `index`-th transaction of an account, newest first."""
+    rng = random.Random(f"{uid}/{index}")
+    day = date.today() - timedelta(
+        days=index * settings.history_days // max(settings.transactions_per_account, 1)
+    )
+    credit = rng.random() < 0.3
+    return {
+        "entry_reference": f"{uid[:8]}-{index:06d}",
+        "transaction_amount": {
+            "currency": "EUR",
+            "amount": f"{rng.uniform(1, 2500 if credit else 250):.2f}"
+        },
+        "credit_debit_indicator": "CRDT" if credit else "DBIT",
+        "status": "BOOK",
+        "booking_date": day.isoformat(),
+        "value_date": day.isoformat(),
+        "remittance_information": [f"Purchase {index}"],
+        "creditor": None if credit else {"name": f"Merchant {rng.randrange(200)}"},
+        "debtor": {"name": "Employer"} if credit else None
+    }
+
+
+@app.get("/application")
+async def get_application():
+    return {
+        "name": "Aureus (fake)",
+        "active": True,
+        "redirect_urls": ["http://localhost:8000/api/v1/banking/connect/callback"]
+    }
+
+
+@app.get("/aspsps")
+async def get_aspsps():
+    return {"aspsps": [aspsp(i) for i in range(settings.aspsps)]}
+
+
+@app.post("/auth")
+async def start_authorization(body: dict):
+    return {
+        "url": f"http://localhost/fake-bank/authorize?state={body.get('state', '')}",
+        "authorization_id": str(uuid.uuid4())
+    }
+
+
+@app.post("/sessions")
+async def create_session(body: dict):
+    session_id = str(uuid.uuid5(uuid.NAMESPACE_URL, body.get("code", "")))
+    return {
+        "session_id": session_id,
+        "access_token": session_id,
+        **(await get_session(session_id))
+    }
+
+
+@app.get("/sessions/{session_id}")
+async def get_session(session_id: str):
+    now = datetime.now(timezone.utc)
+    return {
+        "status": "AUTHORIZED",
+        "aspsp": aspsp_for_session(session_id),
+        "accounts": [
+            {
+                "uid": account_uid(session_id, i),
+                "name": f"Account {i + 1}",
+                "iban": f"FI{uuid.uuid5(uuid.NAMESPACE_URL, f'{session_id}/{i}').int % 10**16:016d}"
+            }
+            for i in range(settings.accounts_per_session)
+        ],
+        "access": {"valid_until": (now + timedelta(days=90)).isoformat()},
+        "authorized": (now - timedelta(days=1)).isoformat()
+    }
+
+
+@app.get("/accounts/{account_uid}/balances")
+async def get_balances(account_uid: str):
+    rng = random.Random(account_uid)
+    return {
+        "balances": [
+            {
+                "name": "Booked balance",
+                "balance_amount": {"currency": "EUR", "amount": f"{rng.uniform(0, 50000):.2f}"},
+                "balance_type": "CLBD",
+                "reference_date": date.today().isoformat()
+            }
+        ]
+    }
+
+
+@app.get("/accounts/{account_uid}/transactions")
+async def get_transactions(
+    account_uid: str,
+    date_from: Optional[str] = None,
+    continuation_key: Optional[str] = None
+):
+    start = int(continuation_key or 0)
+    since = date.fromisoformat(date_from) if date_from else date.min
+    page = []
+    index = start
+    while index < settings.transactions_per_account and len(page) < settings.page_size:
+        tx = transaction(account_uid, index)
+        index += 1
+        if date.fromisoformat(tx["booking_date"]) < since:
+            # Transactions are generated newest first: nothing older is wanted
+            index = settings.transactions_per_account
+            break
+        page.append(tx)
+    more = index < settings.transactions_per_account
+    return {"transactions": page, "continuation_key": str(index) if more else None}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a local fake Enable Banking API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=settings.latency_ms)
+    parser.add_argument("--latency-jitter-ms", type=float, default=settings.latency_jitter_ms)
+    parser.add_argument(
+        "--rate-limit-ratio",
+        type=float,
+        default=settings.rate_limit_ratio,
+        help="share of requests answered with 429 (0-1)"
+    )
+    parser.add_argument("--retry-after", type=float, default=settings.retry_after)
+    parser.add_argument("--aspsps", type=int, default=settings.aspsps)
+    parser.add_argument("--accounts-per-session", type=int, default=settings.accounts_per_session)
+    parser.add_argument(
+        "--transactions-per-account", type=int, default=settings.transactions_per_account
+    )
+    parser.add_argument("--page-size", type=int, default=settings.page_size)
+    parser.add_argument("--history-days", type=int, default=settings.history_days)
+    args = parser.parse_args()
+
+    for field in Settings.__dataclass_fields__:
+        setattr(settings, field, getattr(args, field))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
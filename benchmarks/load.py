@@ -0,0 +1,196 @@
+"""Drive the API at a controlled concurrency and report latency and throughput.
+
+Run the API against the fake Enable Banking server
+(`benchmarks/fake_enable_banking.py`) so results don't depend on, or hit, the
+real upstream. Request scenarios report throughput and p50/p95/p99 latency;
+the ingestion scenario queues ingestion jobs, polls them to completion and
+also reports rows loaded per second.
+
+Usage:
+    python benchmarks/load.py banks --concurrency 50 --duration 30
+    python benchmarks/load.py balances --account-uid <uid> --requests 2000
+    python benchmarks/load.py ingestion --concurrency 4 --requests 20 --full-refresh
+
+The bearer token is taken from `--token` or `AUREUS_BENCH_TOKEN`.
+"""
+import argparse
+import asyncio
+from collections import Counter
+import json
+import os
+import statistics
+import time
+from typing import Optional
+
+import httpx
+
+SCENARIOS = {
+    "banks": ("GET", "/api/v1/banking/banks", {"country": "FI", "q": "bank"}),
+    "connections": ("GET", "/api/v1/banking/connect/connections", {}),
+    "balances": ("GET", "/api/v1/banking/accounts/{account_uid}/balances", {}),
+    "portfolio": ("GET", "/api/v1/banking/balances", {"refresh": "true"}),
+    "transactions": ("GET", "/api/v1/banking/accounts/{account_uid}/transactions", {}),
+    "ingestion": ("POST", "/api/v1/ingestion/banking", {}),
+}
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class Recorder:
+    """Collects per-call latencies, statuses and ingested rows."""
+
+    def __init__(self):
+        self.latencies: list[float] = []
+        self.statuses: Counter = Counter()
+        self.rows_loaded = 0
+        self.job_durations: list[float] = []
+        # Concurrent requests of one user share its active job: count its rows once
+        self.finished_jobs: set[str] = set()
+
+    def record(self, latency: float, status: str) -> None:
+        self.latencies.append(latency)
+        self.statuses[status] += 1
+
+    def summary(self, elapsed: float) -> dict:
+        latencies = sorted(self.latencies)
+        summary = {
+            "requests": len(latencies),
+            "elapsed_s": round(elapsed, 3),
+            "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0,
+            "latency_ms": {
+                name: round(value * 1000, 2)
+                for name, value in (
+                    ("mean", statistics.fmean(latencies) if latencies else float("nan")),
+                    ("p50", percentile(latencies, 50)),
+                    ("p95", percentile(latencies, 95)),
+                    ("p99", percentile(latencies, 99)),
+                    ("max", latencies[-1] if latencies else float("nan")),
+                )
+            },
+            "statuses": dict(self.statuses)
+        }
+        if self.job_durations:
+            durations = sorted(self.job_durations)
+            summary["jobs"] = {
+                "completed": len(durations),
+                "duration_s_p50": round(percentile(durations, 50), 2),
+                "duration_s_max": round(durations[-1], 2),
+                "rows_loaded": self.rows_loaded,
+                "rows_per_s": round(self.rows_loaded / elapsed, 1) if elapsed else 0
+            }
+        return summary
+
+
+async def call(client: httpx.AsyncClient, recorder: Recorder, method: str, url: str, params: dict):
+    start = time.perf_counter()
+    try:
+        response = await client.request(method, url, params=params)
+    except httpx.HTTPError as e:
+        recorder.record(time.perf_counter() - start, type(e).__name__)
+        return None
+    recorder.record(time.perf_counter() - start, str(response.status_code))
+    return response
+
+
+async def wait_for_job(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    job_id: str,
+    queued_at: float,
+    poll_interval: float
+) -> None:
+    """Poll an ingestion job until it finishes and record its duration and rows."""
+    while True:
+        await asyncio.sleep(poll_interval)
+        response = await client.get(f"/api/v1/ingestion/jobs/{job_id}")
+        response.raise_for_status()
+        job = response.json()
+        if job["status"] in ("succeeded", "failed"):
+            recorder.job_durations.append(time.perf_counter() - queued_at)
+            if job_id in recorder.finished_jobs:
+                return
+            recorder.finished_jobs.add(job_id)
+            recorder.rows_loaded += job["progress"].get("rows_loaded", 0)
+            if job["status"] == "failed":
+                recorder.statuses["job_failed"] += 1
+            return
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    args: argparse.Namespace,
+    deadline: Optional[float],
+    remaining: list[int]
+) -> None:
+    method, path, params = SCENARIOS[args.scenario]
+    url = path.format(account_uid=args.account_uid)
+    if args.scenario == "ingestion" and args.full_refresh:
+        params = {**params, "full_refresh": "true"}
+
+    while True:
+        if deadline is not None and time.perf_counter() >= deadline:
+            return
+        if deadline is None:
+            if remaining[0] <= 0:
+                return
+            remaining[0] -= 1
+
+        queued_at = time.perf_counter()
+        response = await call(client, recorder, method, url, params)
+        if args.scenario == "ingestion" and response is not None and response.status_code == 202:
+            await wait_for_job(
+                client, recorder, response.json()["job_id"], queued_at, args.poll_interval
+            )
+
+
+async def run(args: argparse.Namespace) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    headers = {"Authorization": f"Bearer {args.token}"}
+    recorder = Recorder()
+    async with httpx.AsyncClient(
+        base_url=args.base_url, headers=headers, limits=limits, timeout=args.timeout
+    ) as client:
+        start = time.perf_counter()
+        deadline = start + args.duration if args.requests is None else None
+        remaining = [args.requests or 0]
+        await asyncio.gather(
+            *(worker(client, recorder, args, deadline, remaining) for _ in range(args.concurrency))
+        )
+        elapsed = time.perf_counter() - start
+    return {"scenario": args.scenario, "concurrency": args.concurrency, **recorder.summary(elapsed)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the Aureus API.")
+    parser.add_argument("scenario", choices=sorted(SCENARIOS))
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--token", default=os.environ.get("AUREUS_BENCH_TOKEN"))
+    parser.add_argument("--concurrency", type=int, default=10)
+    run_length = parser.add_mutually_exclusive_group()
+    run_length.add_argument("--duration", type=float, default=30, help="seconds to run")
+    run_length.add_argument("--requests", type=int, help="total requests instead of a duration")
+    parser.add_argument("--account-uid", default="bench-account")
+    parser.add_argument("--full-refresh", action="store_true", help="ingestion: full refresh")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="ingestion: job polling")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--output", help="also write the results as JSON to this file")
+    args = parser.parse_args()
+    if not args.token:
+        parser.error("a bearer token is required (--token or AUREUS_BENCH_TOKEN)")
+
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
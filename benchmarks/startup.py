@@ -0,0 +1,119 @@
+"""Measure how long the API takes to import and to start.
+
+Each sample runs in a fresh interpreter, as a cold-started worker would:
+
+- import: `import aureus_backend.main`
+- startup: import plus running the app lifespan up to the point it serves
+  requests (background ingestion workers and scheduler disabled)
+
+Libraries that dominate import time are kept off this path by importing them
+inside the functions that need them: dlt is imported by the functions of
+`services.ingestion.enable_banking` that build and run a pipeline, with the
+first ingestion job, and NumPy with `services.net_worth`, which the net-worth
+endpoint imports on its first request.
+
+Usage:
+    python benchmarks/startup.py [--runs 10] [--importtime 15]
+"""
+import argparse
+import os
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import aureus_backend.main
+print(time.perf_counter() - start)
+"""
+
+STARTUP_SNIPPET = """
+import asyncio
+import time
+start = time.perf_counter()
+from aureus_backend.main import app
+
+async def main():
+    async with app.router.lifespan_context(app):
+        print(time.perf_counter() - start)
+
+asyncio.run(main())
+"""
+
+
+def child_env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    env["INGESTION_WORKERS"] = "0"
+    env["INGESTION_SCHEDULER_ENABLED"] = "false"
+    return env
+
+
+def sample(snippet: str, runs: int) -> list[float]:
+    """Run `snippet` in `runs` fresh interpreters and collect the seconds it prints."""
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", snippet],
+            env=child_env(),
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return timings
+
+
+def slowest_imports(limit: int) -> list[tuple[int, str]]:
+    """Modules with the highest cumulative import time, in microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import aureus_backend.main"],
+        env=child_env(),
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.append((int(cumulative), name.rstrip()))
+    return sorted(modules, reverse=True)[:limit]
+
+
+def report(label: str, timings: list[float]) -> None:
+    print(
+        f"{label:<8} min {min(timings) * 1000:8.1f} ms   "
+        f"median {statistics.median(timings) * 1000:8.1f} ms   "
+        f"max {max(timings) * 1000:8.1f} ms   ({len(timings)} runs)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters per measurement")
+    parser.add_argument(
+        "--importtime",
+        type=int,
+        default=0,
+        metavar="N",
+        help="also list the N slowest imports (python -X importtime)"
+    )
+    args = parser.parse_args()
+
+    report("import", sample(IMPORT_SNIPPET, args.runs))
+    report("startup", sample(STARTUP_SNIPPET, args.runs))
+
+    if args.importtime:
+        print("\nSlowest imports (cumulative):")
+        for cumulative, name in slowest_imports(args.importtime):
+            print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,83 +1,327 @@
-from sqlalchemy import create_engine, text
-from dotenv import load_dotenv
+"""Apply pending SQL migrations from `src/aureus_backend/migrations`.
+
+Applied migrations are recorded in `schema_migrations` with a checksum of
+their file, so each one runs exactly once and edits to applied files are
+detected. Every migration runs in its own transaction holding a transaction
+level advisory lock: Supavisor's transaction mode may hand each transaction a
+different backend, so session level locks would not be held reliably.
+
+Usage:
+    python run_migrations.py             # apply pending migrations
+    python run_migrations.py --status    # list applied, pending and changed migrations
+    python run_migrations.py --dry-run   # show what would be applied
+    python run_migrations.py --baseline [VERSION]
+        # record migrations (up to VERSION) as applied without running them,
+        # for databases migrated before schema_migrations existed
+"""
+import argparse
+from dataclasses import dataclass
+import hashlib
 import os
-import urllib.parse
 from pathlib import Path
+import re
+import sys
+import time
+from typing import Optional
+import urllib.parse
+
+from dotenv import load_dotenv
+from sqlalchemy import Connection, create_engine, text
+
+MIGRATIONS_DIR = Path(__file__).parent / "src" / "aureus_backend" / "migrations"
+
+# Key of the advisory lock serializing concurrent runs
+LOCK_KEY = "aureus_schema_migrations"
+
+# `$tag$` opening a dollar-quoted string; the tag is optional (`$$`)
+DOLLAR_QUOTE = re.compile(r"\$(?:[A-Za-z_][A-Za-z_0-9]*)?\$")
+
+CREATE_MIGRATIONS_TABLE = """
+    create table if not exists schema_migrations (
+        version varchar primary key,
+        checksum varchar not null,
+        applied_at timestamp with time zone not null default current_timestamp,
+        execution_ms integer
+    )
+"""
+
+
+@dataclass
+class Migration:
+    version: str
+    path: Path
+    sql: str
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.sql.encode()).hexdigest()
+
+
+def split_statements(sql: str) -> list[str]:
+    """Split a SQL script into statements on top-level semicolons.
+
+    Semicolons inside string literals, quoted identifiers, dollar-quoted bodies
+    (e.g. functions) and comments are not separators. Statements made only of
+    comments are dropped.
+    """
+    statements = []
+    start = 0
+    has_code = False
+    i = 0
+    n = len(sql)
+    while i < n:
+        char = sql[i]
+        if sql.startswith("--", i):
+            end = sql.find("\n", i)
+            i = n if end == -1 else end + 1
+        elif sql.startswith("/*", i):
+            # Block comments nest in Postgres
+            depth = 1
+            i += 2
+            while i < n and depth:
+                if sql.startswith("/*", i):
+                    depth += 1
+                    i += 2
+                elif sql.startswith("*/", i):
+                    depth -= 1
+                    i += 2
+                else:
+                    i += 1
+        elif char in ("'", '"'):
+            has_code = True
+            # E'...' strings allow backslash escapes
+            backslash_escapes = char == "'" and i > 0 and sql[i - 1] in "eE"
+            i += 1
+            while i < n:
+                if backslash_escapes and sql[i] == "\\":
+                    i += 2
+                elif sql.startswith(char * 2, i):
+                    i += 2
+                elif sql[i] == char:
+                    break
+                else:
+                    i += 1
+            i += 1
+        elif char == "$" and (match := DOLLAR_QUOTE.match(sql, i)) and not (
+            i > 0 and (sql[i - 1].isalnum() or sql[i - 1] == "_")
+        ):
+            has_code = True
+            end = sql.find(match.group(0), match.end())
+            i = n if end == -1 else end + len(match.group(0))
+        elif char == ";":
+            if has_code:
+                statements.append(sql[start:i].strip())
+            start = i + 1
+            has_code = False
+            i += 1
+        else:
+            has_code = has_code or not char.isspace()
+            i += 1
+    if has_code:
+        statements.append(sql[start:].strip())
+    return statements
+
+
+def load_migrations() -> list[Migration]:
+    """Migration files in version order."""
+    return [
+        Migration(version=path.stem, path=path, sql=path.read_text())
+        for path in sorted(MIGRATIONS_DIR.glob("*.sql"))
+    ]
+
+
+def get_engine():
+    """Engine for Supavisor transaction mode (no prepared statements)."""
+    project_ref = os.environ.get("SUPABASE_PROJECT_REF")
+    password = os.environ.get("SUPABASE_DB_PASSWORD")
+    region = os.environ.get("SUPABASE_REGION", "aws-0-eu-west-3")  # EU West 3 (Paris)
+    if not password:
+        raise RuntimeError("SUPABASE_DB_PASSWORD environment variable not set")
+
+    connection_string = (
+        f"postgresql://postgres.{project_ref}:{urllib.parse.quote(password)}"
+        f"@{region}.pooler.supabase.com:6543/postgres"
+    )
+    return create_engine(
+        connection_string,
+        connect_args={
+            "sslmode": "require"
+        },
+        execution_options={
+            "prepared_statement_cache_size": 0
+        }
+    )
+
+
+def lock(connection: Connection) -> None:
+    """Serialize with other runs until the current transaction ends."""
+    connection.execute(
+        text("select pg_advisory_xact_lock(hashtext(:key))"), {"key": LOCK_KEY}
+    )
+
+
+def applied_checksums(connection: Connection) -> dict[str, tuple[str, object, Optional[int]]]:
+    """Recorded migrations as {version: (checksum, applied_at, execution_ms)}."""
+    rows = connection.execute(
+        text("select version, checksum, applied_at, execution_ms from schema_migrations")
+    )
+    return {version: (checksum, applied_at, ms) for version, checksum, applied_at, ms in rows}
+
+
+def record(connection: Connection, migration: Migration, execution_ms: Optional[int]) -> None:
+    connection.execute(
+        text(
+            "insert into schema_migrations (version, checksum, execution_ms) "
+            "values (:version, :checksum, :execution_ms)"
+        ),
+        {
+            "version": migration.version,
+            "checksum": migration.checksum,
+            "execution_ms": execution_ms
+        }
+    )
+
 
-def run_migrations():
+def changed_migrations(migrations: list[Migration], applied: dict) -> list[Migration]:
+    return [
+        m for m in migrations if m.version in applied and applied[m.version][0] != m.checksum
+    ]
+
+
+def print_status(migrations: list[Migration], applied: dict) -> None:
+    print("Migration status:")
+    for migration in migrations:
+        if migration.version not in applied:
+            print(f"- {migration.version}: pending")
+            continue
+        checksum, applied_at, execution_ms = applied[migration.version]
+        state = "applied" if checksum == migration.checksum else "CHANGED since applied"
+        duration = f", {execution_ms} ms" if execution_ms is not None else ", baselined"
+        print(f"- {migration.version}: {state} ({applied_at:%Y-%m-%d %H:%M:%S}{duration})")
+    for version in sorted(set(applied) - {m.version for m in migrations}):
+        print(f"- {version}: applied, but its file is missing")
+
+
+def apply(engine, migration: Migration) -> Optional[int]:
+    """Apply one migration in its own locked transaction.
+
+    Returns:
+        Its execution time in ms, or None if another run applied it meanwhile
+    """
+    statements = split_statements(migration.sql)
+    with engine.begin() as connection:
+        lock(connection)
+        # Another deploy may have applied it while we waited for the lock
+        if migration.version in applied_checksums(connection):
+            return None
+
+        start = time.perf_counter()
+        # Run on the DBAPI cursor without parameters, so neither SQLAlchemy nor the
+        # driver parses placeholders: migrations may contain literal colons and
+        # percent signs (e.g. LIKE patterns, format())
+        cursor = connection.connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+        execution_ms = round((time.perf_counter() - start) * 1000)
+        record(connection, migration, execution_ms)
+        return execution_ms
+
+
+def run_migrations(
+    dry_run: bool = False,
+    status: bool = False,
+    baseline: Optional[str] = None
+) -> bool:
     # Load environment variables
     load_dotenv()
-    
+
     try:
-        # Get connection string components for Supavisor transaction mode
-        project_ref = os.environ.get("SUPABASE_PROJECT_REF")
-        password = os.environ.get("SUPABASE_DB_PASSWORD")
-        region = "aws-0-eu-west-3"  # EU West 3 (Paris) region
-        
-        # Use Supavisor transaction mode connection string
-        connection_string = f"postgresql://postgres.{project_ref}:{urllib.parse.quote(password)}@{region}.pooler.supabase.com:6543/postgres"
-        
-        print("Running migrations...")
-        
-        # Create engine with SSL mode require and disable prepared statements
-        engine = create_engine(
-            connection_string,
-            connect_args={
-                "sslmode": "require"
-            },
-            execution_options={
-                "prepared_statement_cache_size": 0
-            }
-        )
-        
-        # Get all migration files in order
-        migrations_dir = Path('src/aureus_backend/migrations')
-        migration_files = sorted(migrations_dir.glob('*.sql'))
-        
-        # Execute each migration file
-        with engine.connect() as connection:
-            for migration_file in migration_files:
-                print(f"\nApplying migration: {migration_file.name}")
-                
-                # Read the migration SQL file
-                migration_sql = migration_file.read_text()
-                
-                # Start transaction for this migration
-                with connection.begin():
-                    # Split and execute multiple statements if present
-                    for statement in migration_sql.split(';'):
-                        if statement.strip():
-                            connection.execute(text(statement))
-                
-                print(f"✅ Successfully applied {migration_file.name}")
-            
-            print("\n✅ All migrations completed successfully!")
-            
-            # Show created tables and their RLS status
-            result = connection.execute(text("""
-                select 
-                    t.table_name,
-                    obj_description((quote_ident(t.table_schema) || '.' || quote_ident(t.table_name))::regclass) as description,
-                    has_table_privilege(t.table_name, 'select') as has_select,
-                    has_table_privilege(t.table_name, 'insert') as has_insert
-                from information_schema.tables t
-                where t.table_schema = 'public'
-                  and t.table_type = 'BASE TABLE'
-            """))
-            tables = result.fetchall()
-            print("\nTables in database:")
-            for table in tables:
-                print(f"- {table[0]}")
-                if table[1]:  # If there's a description
-                    print(f"  Description: {table[1]}")
-                print(f"  Permissions: select={table[2]}, insert={table[3]}")
-            
+        engine = get_engine()
+        migrations = load_migrations()
+
+        with engine.begin() as connection:
+            lock(connection)
+            connection.execute(text(CREATE_MIGRATIONS_TABLE))
+            applied = applied_checksums(connection)
+
+        if status:
+            print_status(migrations, applied)
+            return True
+
+        changed = changed_migrations(migrations, applied)
+        if changed:
+            print("\n❌ Applied migrations were modified; add a new migration instead:")
+            for migration in changed:
+                print(f"- {migration.path.name}")
+            return False
+
+        pending = [m for m in migrations if m.version not in applied]
+
+        if baseline is not None:
+            baselined = [m for m in pending if baseline == "all" or m.version <= baseline]
+            with engine.begin() as connection:
+                lock(connection)
+                already = applied_checksums(connection)
+                for migration in baselined:
+                    if migration.version not in already:
+                        record(connection, migration, None)
+                        print(f"Baselined {migration.path.name}")
+            print(f"\n✅ Recorded {len(baselined)} migrations as applied")
+            return True
+
+        if not pending:
+            print("✅ Database is up to date")
             return True
-            
+
+        if dry_run:
+            print("Pending migrations (dry run, nothing applied):")
+            for migration in pending:
+                statements = split_statements(migration.sql)
+                print(f"- {migration.path.name} ({len(statements)} statements)")
+            return True
+
+        print("Running migrations...")
+        total_start = time.perf_counter()
+        for migration in pending:
+            print(f"\nApplying migration: {migration.path.name}")
+            execution_ms = apply(engine, migration)
+            if execution_ms is None:
+                print(f"⏭️  {migration.path.name} was applied by another run")
+            else:
+                print(f"✅ Successfully applied {migration.path.name} in {execution_ms} ms")
+
+        total_ms = round((time.perf_counter() - total_start) * 1000)
+        print(f"\n✅ All migrations completed successfully in {total_ms} ms!")
+        return True
+
     except Exception as e:
         print("\n❌ Error running migrations:")
         print(str(e))
         return False
 
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Apply pending SQL migrations.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--status", action="store_true", help="list migration status and exit")
+    mode.add_argument(
+        "--dry-run", action="store_true", help="list pending migrations without applying them"
+    )
+    mode.add_argument(
+        "--baseline",
+        nargs="?",
+        const="all",
+        metavar="VERSION",
+        help="record pending migrations up to VERSION (default: all) as applied without running"
+    )
+    args = parser.parse_args()
+
+    ok = run_migrations(dry_run=args.dry_run, status=args.status, baseline=args.baseline)
+    sys.exit(0 if ok else 1)
+
+
 if __name__ == "__main__":
-    run_migrations()
+    main()
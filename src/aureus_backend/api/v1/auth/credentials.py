@@ -6,7 +6,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
-from aureus_backend.repositories.api_credentials import ApiCredentialsRepository
+from aureus_backend.repositories.api_credentials import AsyncApiCredentialsRepository
 from aureus_backend.utils.dependencies import get_current_user, get_db_session
 
 router = APIRouter(prefix="/auth/credentials", tags=["auth"])
@@ -20,7 +20,7 @@ class CredentialResponse(BaseModel):
     is_expired: bool
 
 @router.get("/", response_model=list[CredentialResponse])
-def list_credentials(
+async def list_credentials(
     provider: Optional[str] = None,
     user_id: UUID = Depends(get_current_user),
     db_session = Depends(get_db_session)
@@ -36,8 +36,8 @@ def list_credentials(
     Returns:
         List of API credentials
     """
-    cred_repo = ApiCredentialsRepository(db_session)
-    credentials = cred_repo.list_by_user_provider(user_id, provider)
+    cred_repo = AsyncApiCredentialsRepository(db_session)
+    credentials = await cred_repo.list_by_user_provider(user_id, provider)
     
     now = datetime.utcnow()
     return [
@@ -52,7 +52,7 @@ def list_credentials(
     ]
 
 @router.delete("/{credential_id}")
-def delete_credential(
+async def delete_credential(
     credential_id: int,
     user_id: UUID = Depends(get_current_user),
     db_session = Depends(get_db_session)
@@ -68,8 +68,8 @@ def delete_credential(
     Returns:
         Success message
     """
-    cred_repo = ApiCredentialsRepository(db_session)
-    deleted = cred_repo.delete(credential_id, user_id)
+    cred_repo = AsyncApiCredentialsRepository(db_session)
+    deleted = await cred_repo.delete(credential_id, user_id)
     
     if not deleted:
         raise HTTPException(404, "Credential not found")
@@ -1,18 +1,106 @@
 """Bank account management endpoints."""
+import base64
+import binascii
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import AsyncIterator, Literal, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from aureus_backend.clients import EnableBankingClient
-from aureus_backend.utils.dependencies import get_current_user
+from aureus_backend.core import Config
+from aureus_backend.models.raw_transaction import TransactionFilters
+from aureus_backend.repositories.ingestion_jobs import AsyncIngestionJobsRepository
+from aureus_backend.repositories.transactions import AsyncTransactionsRepository, Keyset
+from aureus_backend.services.banking_service import BankingService
+from aureus_backend.utils.dependencies import (
+    get_banking_service,
+    get_current_user,
+    get_db_session,
+)
 
 router = APIRouter(prefix="/banking/accounts", tags=["banking"])
 
+# Continuation keys of pages read from the ingested store; other keys are upstream's
+STORE_KEY_PREFIX = "store:"
+
+def _encode_store_key(keyset: Keyset) -> str:
+    return STORE_KEY_PREFIX + base64.urlsafe_b64encode(orjson.dumps(keyset)).decode()
+
+def _decode_store_key(continuation_key: str) -> Keyset:
+    try:
+        booked, transaction_id = orjson.loads(
+            base64.urlsafe_b64decode(continuation_key.removeprefix(STORE_KEY_PREFIX))
+        )
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid continuation_key")
+    return booked, transaction_id
+
+async def _store_is_fresh(
+    db_session: AsyncSession,
+    user_id: UUID,
+    account_uid: str,
+    date_from: str
+) -> bool:
+    """Whether the ingested store can answer for the account from `date_from` on.
+
+    The user's last successful ingestion must be recent enough, the account
+    must have been ingested, and the range must start within the window the
+    first ingestion of an account covers.
+    """
+    oldest_ingested = datetime.now(timezone.utc).date() - timedelta(
+        days=Config.ingestion_lookback_days
+    )
+    if date_from < oldest_ingested.isoformat():
+        return False
+    last_ingested = await AsyncIngestionJobsRepository(db_session).last_succeeded_at(
+        user_id, "enablebanking"
+    )
+    max_age = timedelta(seconds=Config.transactions_store_max_age)
+    if last_ingested is None or datetime.now(timezone.utc) - last_ingested > max_age:
+        return False
+    return await AsyncTransactionsRepository(db_session).has_account(user_id, account_uid)
+
+async def _ndjson_transactions(
+    first_page: dict,
+    pages: AsyncIterator[dict],
+    continuation_key: Optional[str],
+    filters: TransactionFilters
+) -> AsyncIterator[bytes]:
+    """Write each page's transactions as NDJSON lines as soon as the page arrives.
+
+    The status code is already sent when a later page fails, so the failure is
+    reported as a last `{"error": ..., "continuation_key": ...}` line carrying
+    the key to resume from.
+    """
+    page = first_page
+    try:
+        while True:
+            continuation_key = page.get("continuation_key")
+            lines = [
+                orjson.dumps(transaction) + b"\n"
+                for transaction in page["transactions"] if filters.matches(transaction)
+            ]
+            if lines:
+                yield b"".join(lines)
+            if not continuation_key:
+                return
+            page = await anext(pages)
+    except StopAsyncIteration:
+        return
+    except Exception as e:
+        yield orjson.dumps({"error": str(e), "continuation_key": continuation_key}) + b"\n"
+    finally:
+        await pages.aclose()
+
 @router.get("/{account_uid}/balances")
 async def get_account_balances(
     account_uid: str,
     user_id: UUID = Depends(get_current_user),
-    banking_service = Depends(EnableBankingClient)
+    banking_service: BankingService = Depends(get_banking_service)
 ):
     """Get balances for a specific account."""
     try:
@@ -22,18 +110,109 @@ async def get_account_balances(
 
 @router.get("/{account_uid}/transactions")
 async def get_account_transactions(
+    response: Response,
     account_uid: str,
     days_back: int = 90,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    min_amount: Optional[Decimal] = Query(None, ge=0),
+    max_amount: Optional[Decimal] = Query(None, ge=0),
+    direction: Optional[Literal["CRDT", "DBIT"]] = None,
+    limit: int = Query(100, ge=1, le=1000),
     continuation_key: str = None,
+    stream: bool = False,
     user_id: UUID = Depends(get_current_user),
-    banking_service = Depends(EnableBankingClient)
+    db_session: AsyncSession = Depends(get_db_session),
+    banking_service: BankingService = Depends(get_banking_service)
 ):
-    """Get transactions for a specific account."""
+    """Get transactions for a specific account, newest first.
+
+    Transactions are read from the ingested store, with keyset pagination, when
+    the user's data is fresh enough (see `TRANSACTIONS_STORE_MAX_AGE`), and from
+    Enable Banking otherwise. The `X-Data-Source` header tells which one served
+    the page; a `continuation_key` always continues in the source that issued it.
+
+    Args:
+        days_back: Days of history to return, when `date_from` is not given
+        date_from: First booking date to return
+        date_to: Last booking date to return
+        min_amount: Smallest absolute amount to return
+        max_amount: Largest absolute amount to return
+        direction: `CRDT` for money in, `DBIT` for money out
+        limit: Page size when reading from the store (upstream pages are the bank's)
+        continuation_key: Key of the next page, from the previous response
+        stream: Follow continuation keys server-side and stream all transactions
+            from Enable Banking as NDJSON, the next page being fetched while the
+            previous one is written out
+    """
+    if date_from is None:
+        date_from = datetime.now(timezone.utc).date() - timedelta(days=days_back)
+    else:
+        days_back = (datetime.now(timezone.utc).date() - date_from).days
+    filters = TransactionFilters(
+        date_from=date_from.isoformat(),
+        date_to=date_to.isoformat() if date_to else None,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        direction=direction
+    )
+
+    if stream:
+        pages = banking_service.iter_account_transaction_pages(
+            account_uid=account_uid,
+            days_back=days_back,
+            continuation_key=continuation_key
+        )
+        # Fetch the first page before responding, so failures still get a 400
+        try:
+            first_page = await anext(pages)
+        except Exception as e:
+            await pages.aclose()
+            raise HTTPException(status_code=400, detail=str(e))
+        return StreamingResponse(
+            _ndjson_transactions(first_page, pages, continuation_key, filters),
+            media_type="application/x-ndjson",
+            headers={"X-Data-Source": "upstream"}
+        )
+
+    if continuation_key and continuation_key.startswith(STORE_KEY_PREFIX):
+        after = _decode_store_key(continuation_key)
+        from_store = True
+    else:
+        after = None
+        from_store = continuation_key is None and await _store_is_fresh(
+            db_session, user_id, account_uid, filters.date_from
+        )
+    if from_store:
+        transactions, next_keyset = await AsyncTransactionsRepository(db_session).list(
+            user_id, account_uid, filters, after=after, limit=limit
+        )
+        response.headers["X-Data-Source"] = "store"
+        return {
+            "transactions": transactions,
+            "continuation_key": _encode_store_key(next_keyset) if next_keyset else None
+        }
+
+    headers = {"X-Data-Source": "upstream"}
+    unfiltered = filters == TransactionFilters(date_from=filters.date_from)
     try:
-        return await banking_service.get_account_transactions(
+        if unfiltered:
+            # The page is returned unchanged: pass the upstream bytes through
+            content = await banking_service.get_account_transactions_raw(
+                account_uid=account_uid,
+                days_back=days_back,
+                continuation_key=continuation_key
+            )
+            return Response(content=content, media_type="application/json", headers=headers)
+        page = await banking_service.get_account_transactions(
             account_uid=account_uid,
             days_back=days_back,
             continuation_key=continuation_key
         )
     except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+    response.headers.update(headers)
+    return {
+        "transactions": [t for t in page["transactions"] if filters.matches(t)],
+        "continuation_key": page.get("continuation_key")
+    }
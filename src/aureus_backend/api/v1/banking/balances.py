@@ -0,0 +1,182 @@
+"""Portfolio-wide balance endpoints."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from aureus_backend.clients import AsyncEnableBankingClient
+from aureus_backend.core import Config
+from aureus_backend.models.api_credentials import ApiCredential, session_id_of
+from aureus_backend.models.balance_snapshot import BalanceSnapshot
+from aureus_backend.repositories.api_credentials import AsyncApiCredentialsRepository
+from aureus_backend.repositories.balance_snapshots import AsyncBalanceSnapshotsRepository
+from aureus_backend.utils.dependencies import (
+    get_current_user,
+    get_db_session,
+    get_enable_banking_client,
+)
+
+router = APIRouter(prefix="/banking/balances", tags=["banking"])
+
+def _account_balances(
+    snapshot: dict,
+    fetched_at: Optional[datetime],
+    stale: bool,
+    error: Optional[str]
+) -> dict:
+    """Response entry of one account from its snapshot column values."""
+    return {
+        "credential_id": snapshot["credential_id"],
+        "account_uid": snapshot["account_uid"],
+        "name": snapshot.get("account_name"),
+        "iban": snapshot.get("account_iban"),
+        "bank": {"name": snapshot.get("bank_name"), "country": snapshot.get("bank_country")},
+        "balances": snapshot.get("balances"),
+        "fetched_at": fetched_at.isoformat() if fetched_at else None,
+        "stale": stale,
+        "error": error
+    }
+
+def _snapshot_values(snapshot: BalanceSnapshot) -> dict:
+    return {
+        "credential_id": snapshot.credential_id,
+        "account_uid": snapshot.account_uid,
+        "account_name": snapshot.account_name,
+        "account_iban": snapshot.account_iban,
+        "bank_name": snapshot.bank_name,
+        "bank_country": snapshot.bank_country,
+        "balances": snapshot.balances
+    }
+
+def _error_message(error: BaseException) -> str:
+    if isinstance(error, asyncio.TimeoutError):
+        return "Timed out"
+    return str(error) or type(error).__name__
+
+@router.get("")
+async def list_balances(
+    refresh: bool = False,
+    user_id: UUID = Depends(get_current_user),
+    db_session: AsyncSession = Depends(get_db_session),
+    client: AsyncEnableBankingClient = Depends(get_enable_banking_client)
+):
+    """
+    List the balances of every account of every connected bank.
+
+    A bank whose accounts were all fetched less than `Config.balances_max_age`
+    seconds ago is served from its latest snapshots. The other banks' sessions
+    and account balances are fetched upstream concurrently, each call within
+    `Config.balances_timeout` seconds, and recorded as new snapshots. An
+    account whose lookup fails is still returned from its latest snapshot when
+    there is one, with `stale` set and the `error`.
+
+    Args:
+        refresh: Fetch every balance upstream, ignoring recent snapshots
+        user_id: Current user's ID
+        db_session: Database session
+
+    Returns:
+        Balances per account, with when they were fetched
+    """
+    cred_repo = AsyncApiCredentialsRepository(db_session)
+    snapshot_repo = AsyncBalanceSnapshotsRepository(db_session)
+
+    credentials = await cred_repo.list_by_user_provider(user_id, "enablebanking")
+    latest: dict[int, list[BalanceSnapshot]] = {}
+    for snapshot in await snapshot_repo.latest_by_user(user_id):
+        latest.setdefault(snapshot.credential_id, []).append(snapshot)
+
+    now = datetime.now(timezone.utc)
+    max_age = timedelta(seconds=Config.balances_max_age)
+
+    def is_fresh(cred: ApiCredential) -> bool:
+        snapshots = latest.get(cred.id)
+        return (
+            not refresh
+            and bool(snapshots)
+            and all(now - snapshot.fetched_at <= max_age for snapshot in snapshots)
+        )
+
+    async def fetch_account(cred: ApiCredential, session: dict, account: dict) -> dict:
+        balances = await asyncio.wait_for(
+            client.get_account_balances(account["uid"], aspsp=cred.provider_uid),
+            timeout=Config.balances_timeout
+        )
+        return {
+            "credential_id": cred.id,
+            "account_uid": account["uid"],
+            "account_name": account.get("name"),
+            "account_iban": account.get("iban"),
+            "bank_name": session["aspsp"]["name"],
+            "bank_country": session["aspsp"]["country"],
+            "balances": balances["balances"]
+        }
+
+    async def fetch_credential(cred: ApiCredential) -> list[tuple[dict, object]]:
+        """Each account of the bank with its new snapshot values, or the lookup error."""
+        session = await asyncio.wait_for(
+            client.get_session(session_id_of(cred), aspsp=cred.provider_uid),
+            timeout=Config.balances_timeout
+        )
+        results = await asyncio.gather(
+            *(fetch_account(cred, session, account) for account in session["accounts"]),
+            return_exceptions=True
+        )
+        return list(zip(session["accounts"], results))
+
+    to_fetch = [cred for cred in credentials if not is_fresh(cred)]
+    results = await asyncio.gather(
+        *(fetch_credential(cred) for cred in to_fetch), return_exceptions=True
+    )
+    fetched = dict(zip((cred.id for cred in to_fetch), results))
+
+    accounts = []
+    new_snapshots = []
+    for cred in credentials:
+        previous = {snapshot.account_uid: snapshot for snapshot in latest.get(cred.id, [])}
+        result = fetched.get(cred.id)
+        if result is None:
+            accounts.extend(
+                _account_balances(_snapshot_values(snapshot), snapshot.fetched_at, False, None)
+                for snapshot in previous.values()
+            )
+            continue
+        if isinstance(result, BaseException):
+            # The session lookup failed: every account of the bank is stale
+            accounts.extend(
+                _account_balances(
+                    _snapshot_values(snapshot), snapshot.fetched_at, True, _error_message(result)
+                )
+                for snapshot in previous.values()
+            )
+            continue
+        for account, account_result in result:
+            if not isinstance(account_result, BaseException):
+                new_snapshots.append(account_result)
+                accounts.append(_account_balances(account_result, now, False, None))
+                continue
+            error = _error_message(account_result)
+            snapshot = previous.get(account["uid"])
+            if snapshot is not None:
+                accounts.append(
+                    _account_balances(_snapshot_values(snapshot), snapshot.fetched_at, True, error)
+                )
+            else:
+                accounts.append(_account_balances(
+                    {
+                        "credential_id": cred.id,
+                        "account_uid": account["uid"],
+                        "account_name": account.get("name"),
+                        "account_iban": account.get("iban")
+                    },
+                    None,
+                    True,
+                    error
+                ))
+
+    await snapshot_repo.add_many(user_id, new_snapshots, now)
+
+    return {"accounts": accounts}
@@ -1,22 +1,72 @@
 """Bank information endpoints."""
-from fastapi import APIRouter, Depends, HTTPException
+import hashlib
+from typing import Optional
 
-from aureus_backend.clients import EnableBankingClient
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+import orjson
+
+from aureus_backend.services.aspsp_catalog import AspspCatalog, CatalogSnapshot
+from aureus_backend.utils.dependencies import get_aspsp_catalog
 
 router = APIRouter(prefix="/banking/banks", tags=["banking"])
 
+# Unfiltered response body of the latest catalog version, the largest and most requested one
+_all_banks_body: tuple[str, bytes] = ("", b"")
+
+def _encode_all_banks(snapshot: CatalogSnapshot) -> bytes:
+    """Encode the unfiltered bank list once per catalog version."""
+    global _all_banks_body
+    version, body = _all_banks_body
+    if version != snapshot.version:
+        body = orjson.dumps(
+            {"banks": snapshot.banks, "total": len(snapshot.banks), "offset": 0, "limit": None}
+        )
+        _all_banks_body = (snapshot.version, body)
+    return body
+
 @router.get("")
-def list_available_banks(
-    banking_service = Depends(EnableBankingClient)
+async def list_available_banks(
+    response: Response,
+    country: Optional[str] = Query(None, min_length=2, max_length=2),
+    q: Optional[str] = Query(None, max_length=100),
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    if_none_match: Optional[str] = Header(None),
+    catalog: AspspCatalog = Depends(get_aspsp_catalog)
 ):
     """
-    List all available banks that can be connected.
-    
+    List available banks that can be connected.
+
+    Banks are served from the in-memory ASPSP catalog. Responses carry an ETag
+    derived from the catalog version and the query, so repeated lookups can be
+    answered with `304 Not Modified`.
+
+    Args:
+        country: Optional two-letter country code filter
+        q: Optional name search (token prefix, tolerant to small typos)
+        offset: Number of matching banks to skip
+        limit: Maximum number of banks to return (all when omitted)
+
     Returns:
-        List of available banks with their details
+        Matching banks with their details and the total number of matches
     """
     try:
-        banks = banking_service.get_available_aspsps()
-        return {"banks": banks}
+        snapshot = await catalog.get()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+    query_key = f"{snapshot.version}|{country}|{q}|{offset}|{limit}".encode()
+    etag = f'"{hashlib.sha256(query_key).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=60"}
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    if country is None and q is None and offset == 0 and limit is None:
+        return Response(
+            content=_encode_all_banks(snapshot), media_type="application/json", headers=headers
+        )
+
+    banks = snapshot.search(country=country, q=q)
+    page = banks[offset:offset + limit] if limit else banks[offset:]
+    response.headers.update(headers)
+    return {"banks": page, "total": len(banks), "offset": offset, "limit": limit}
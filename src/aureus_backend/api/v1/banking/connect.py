@@ -1,14 +1,27 @@
 """Bank connection endpoints."""
-from datetime import datetime
+import asyncio
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from aureus_backend.clients import EnableBankingClient
-from aureus_backend.repositories.api_credentials import ApiCredentialsRepository
-from aureus_backend.utils.dependencies import get_current_user, get_db_session
+from aureus_backend.clients import (
+    AsyncEnableBankingClient,
+    aspsp_key,
+    invalidate_session,
+)
+from aureus_backend.models.api_credentials import session_id_of
+from aureus_backend.core import Config
+from aureus_backend.repositories.api_credentials import AsyncApiCredentialsRepository
+from aureus_backend.services.banking_service import BankingService
+from aureus_backend.utils.dependencies import (
+    get_banking_service,
+    get_current_user,
+    get_db_session,
+    get_enable_banking_client,
+)
 
 router = APIRouter(prefix="/banking/connect", tags=["banking"])
 
@@ -19,7 +32,7 @@ class BankAuthRequest(BaseModel):
 @router.post("/auth-url")
 async def get_auth_url(
     request: BankAuthRequest,
-    banking_service = Depends(EnableBankingClient)
+    banking_service: BankingService = Depends(get_banking_service)
 ):
     """Get authorization URL for bank connection."""
     try:
@@ -31,10 +44,11 @@ async def get_auth_url(
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/callback")
-def handle_callback(
+async def handle_callback(
     code: str,
     user_id: UUID = Depends(get_current_user),
-    db_session: Session = Depends(get_db_session)
+    db_session: AsyncSession = Depends(get_db_session),
+    client: AsyncEnableBankingClient = Depends(get_enable_banking_client)
 ):
     """
     Handle callback from Enable Banking after user authorization.
@@ -47,35 +61,36 @@ def handle_callback(
     Returns:
         Success message with bank details
     """
-    client = EnableBankingClient()
-    cred_repo = ApiCredentialsRepository(db_session)
+    cred_repo = AsyncApiCredentialsRepository(db_session)
     
     # Exchange code for session
-    session = client.create_session(code)
+    session = await client.create_session(code)
     if not session or "session_id" not in session:
         raise HTTPException(400, "Failed to create Enable Banking session")
     
-    # Get session details
-    session_details = client.get_session(session["session_id"])
+    # Get session details, dropping anything cached from a previous authorization
+    invalidate_session(session["session_id"])
+    session_details = await client.get_session(session["session_id"])
     if session_details["status"] != "AUTHORIZED":
         raise HTTPException(400, "Bank authorization failed or was cancelled")
     
     # Extract bank info
     bank = session_details["aspsp"]
-    bank_id = f"{bank['name']}_{bank['country']}".lower()
+    bank_id = aspsp_key(bank)
     
     # Calculate expiry from access details
     access = session_details["access"]
     expires_at = datetime.fromisoformat(access["valid_until"].replace("Z", "+00:00"))
     
     # Store credentials
-    cred_repo.create(
+    await cred_repo.create(
         user_id=user_id,
         provider="enablebanking",
         provider_uid=bank_id,
         access_token=session["access_token"],
         refresh_token=session.get("refresh_token"),
-        expires_at=expires_at
+        expires_at=expires_at,
+        session_id=session["session_id"]
     )
     
     return {
@@ -88,46 +103,98 @@ def handle_callback(
         }
     }
 
+def _connection_from_session(session: dict) -> dict:
+    """Connection status fields derived from upstream session details."""
+    return {
+        "bank": {
+            "name": session["aspsp"]["name"],
+            "country": session["aspsp"]["country"]
+        },
+        "status": session["status"],
+        "account_count": len(session["accounts"]),
+        "expires_at": session["access"]["valid_until"],
+        "last_update": session["authorized"]
+    }
+
 @router.get("/connections")
-def list_connections(
+async def list_connections(
+    use_snapshot: bool = False,
     user_id: UUID = Depends(get_current_user),
-    db_session: Session = Depends(get_db_session)
+    db_session: AsyncSession = Depends(get_db_session),
+    client: AsyncEnableBankingClient = Depends(get_enable_banking_client)
 ):
     """
-    List all active bank connections for the user.
-    
+    List all bank connections for the user with their status.
+
+    Statuses are looked up upstream concurrently, each within
+    `Config.connection_status_timeout` seconds. A connection whose lookup fails
+    or times out is still returned, from its last known status snapshot when
+    there is one, with `stale` set and the `error`.
+
     Args:
+        use_snapshot: Serve statuses checked less than
+            `Config.connection_snapshot_max_age` seconds ago without calling upstream
         user_id: Current user's ID
         db_session: Database session
-        
+
     Returns:
         List of connected banks with their status
     """
-    client = EnableBankingClient()
-    cred_repo = ApiCredentialsRepository(db_session)
-    
+    cred_repo = AsyncApiCredentialsRepository(db_session)
+
     # Get all Enable Banking credentials
-    credentials = cred_repo.list_by_user_provider(user_id, "enablebanking")
-    
+    credentials = await cred_repo.list_by_user_provider(user_id, "enablebanking")
+
+    now = datetime.now(timezone.utc)
+    max_age = timedelta(seconds=Config.connection_snapshot_max_age)
+
+    def is_fresh(cred) -> bool:
+        return (
+            use_snapshot
+            and cred.status_snapshot is not None
+            and cred.status_checked_at is not None
+            and now - cred.status_checked_at <= max_age
+        )
+
+    async def lookup(cred) -> dict:
+        session = await asyncio.wait_for(
+            client.get_session(session_id_of(cred), aspsp=cred.provider_uid),
+            timeout=Config.connection_status_timeout
+        )
+        return _connection_from_session(session)
+
+    to_check = [cred for cred in credentials if not is_fresh(cred)]
+    results = await asyncio.gather(
+        *(lookup(cred) for cred in to_check), return_exceptions=True
+    )
+    checked = dict(zip((cred.id for cred in to_check), results))
+
     connections = []
+    snapshots = {}
     for cred in credentials:
-        try:
-            # Get session details
-            session = client.get_session(cred.provider_uid)
-            
-            # Add connection info
-            connections.append({
-                "bank": {
-                    "name": session["aspsp"]["name"],
-                    "country": session["aspsp"]["country"]
-                },
-                "status": session["status"],
-                "account_count": len(session["accounts"]),
-                "expires_at": session["access"]["valid_until"],
-                "last_update": session["authorized"]
-            })
-        except Exception:
-            # Skip failed connections
-            continue
-    
+        result = checked.get(cred.id)
+        connection = {"id": cred.id, "provider_uid": cred.provider_uid}
+        if result is None:
+            connection.update(cred.status_snapshot, stale=False, error=None)
+            connection["checked_at"] = cred.status_checked_at.isoformat()
+        elif not isinstance(result, Exception):
+            snapshots[cred.id] = result
+            connection.update(result, stale=False, error=None, checked_at=now.isoformat())
+        else:
+            error = "Timed out" if isinstance(result, asyncio.TimeoutError) else str(result)
+            if cred.status_snapshot is not None:
+                connection.update(cred.status_snapshot)
+            else:
+                connection.update(bank=None, status="UNKNOWN")
+            connection.update(
+                stale=True,
+                error=error or type(result).__name__,
+                checked_at=(
+                    cred.status_checked_at.isoformat() if cred.status_checked_at else None
+                )
+            )
+        connections.append(connection)
+
+    await cred_repo.save_status_snapshots(snapshots, now)
+
     return {"connections": connections}
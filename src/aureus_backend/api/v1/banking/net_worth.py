@@ -0,0 +1,57 @@
+"""Net-worth time series endpoints."""
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from aureus_backend.utils.dependencies import get_current_user, get_db_session
+
+router = APIRouter(prefix="/banking/net-worth", tags=["banking"])
+
+# Longest series served in one response
+MAX_DAYS = 20 * 366
+
+@router.get("")
+async def get_net_worth(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    include_accounts: bool = False,
+    user_id: UUID = Depends(get_current_user),
+    db_session: AsyncSession = Depends(get_db_session)
+):
+    """
+    Get the user's daily net worth, per currency, between two dates.
+
+    Balances are reconstructed from each account's latest balance snapshot
+    (see `GET /banking/balances`) and the ingested transactions. Accounts
+    without a snapshot are listed in `unanchored` and left out of the totals.
+
+    Args:
+        date_from: First day of the series (defaults to one year ago)
+        date_to: Last day of the series (defaults to today)
+        include_accounts: Also return each account's daily balances
+
+    Returns:
+        `dates`, `net_worth` (currency -> balance per date), `unanchored` and,
+        when requested, `accounts`
+    """
+    from aureus_backend.services.net_worth import NetWorthService
+
+    date_to = date_to or datetime.now(timezone.utc).date()
+    date_from = date_from or date_to - timedelta(days=365)
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+    if (date_to - date_from).days >= MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_DAYS} days per request")
+
+    series = await NetWorthService(db_session).series(user_id, date_from, date_to)
+    if not include_accounts:
+        del series["accounts"]
+    # Series are NumPy arrays: let orjson encode them natively
+    return Response(
+        content=orjson.dumps(series, option=orjson.OPT_SERIALIZE_NUMPY),
+        media_type="application/json"
+    )
@@ -0,0 +1,60 @@
+"""Ingestion job status endpoints."""
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from aureus_backend.repositories.ingestion_jobs import AsyncIngestionJobsRepository
+from aureus_backend.utils.dependencies import get_current_user, get_db_session
+
+router = APIRouter(prefix="/ingestion/jobs", tags=["ingestion"])
+
+class IngestionJobResponse(BaseModel):
+    """Response model for ingestion job status."""
+    id: UUID
+    provider: str
+    status: str
+    full_refresh: bool
+    progress: dict
+    error: Optional[str]
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+@router.get("/{job_id}", response_model=IngestionJobResponse)
+async def get_ingestion_job(
+    job_id: UUID,
+    user_id: UUID = Depends(get_current_user),
+    db_session: AsyncSession = Depends(get_db_session)
+):
+    """
+    Get the status and progress of an ingestion job.
+
+    Args:
+        job_id: ID returned when the ingestion was queued
+        user_id: Current user's ID
+        db_session: Database session
+
+    Returns:
+        Job status with banks/accounts/pages done, rows loaded and errors
+    """
+    job = await AsyncIngestionJobsRepository(db_session).get(job_id, user_id)
+    if not job:
+        raise HTTPException(404, "Ingestion job not found")
+
+    return IngestionJobResponse(
+        id=job.id,
+        provider=job.provider,
+        status=job.status,
+        full_refresh=job.full_refresh,
+        progress=job.progress,
+        error=job.error,
+        attempts=job.attempts,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at
+    )
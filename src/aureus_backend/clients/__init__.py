@@ -1,5 +1,22 @@
 """External API clients package."""
 
-from .enable_banking import EnableBankingClient
+from .enable_banking import (
+    AsyncEnableBankingClient,
+    EnableBankingClient,
+    aspsp_key,
+    invalidate_session,
+)
+from .resilience import UpstreamPolicy, UpstreamUnavailableError, get_upstream_policy
+from .token_provider import EnableBankingTokenProvider, get_token_provider
 
-__all__ = ["EnableBankingClient"]
+__all__ = [
+    "AsyncEnableBankingClient",
+    "EnableBankingClient",
+    "EnableBankingTokenProvider",
+    "UpstreamPolicy",
+    "UpstreamUnavailableError",
+    "aspsp_key",
+    "get_token_provider",
+    "get_upstream_policy",
+    "invalidate_session",
+]
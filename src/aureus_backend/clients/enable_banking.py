@@ -1,191 +1,519 @@
 from datetime import datetime, timezone, timedelta
+from typing import AsyncIterator, Optional
+import asyncio
+import copy
+import time
 import uuid
+
+import httpx
 import requests
-import jwt as pyjwt
+from requests.adapters import HTTPAdapter
 
 from ..core import Config
+from ..utils.metrics import observe_upstream_call, register_cache
+from .cache import AsyncSingleFlight, SingleFlight, TTLCache
+from .resilience import get_upstream_policy
+from .token_provider import get_token_provider
+
+
+def aspsp_key(aspsp: dict) -> str:
+    """Identifier of a bank (e.g. `nordea_fi`) used for rate limits and circuit breakers."""
+    return f"{aspsp['name']}_{aspsp['country']}".lower()
+
+
+def _authorization_body(aspsp_name: str, aspsp_country: str, redirect_url: str) -> dict:
+    """Build the request body for `POST /auth`."""
+    return {
+        "access": {
+            "valid_until": (datetime.now(timezone.utc) + timedelta(days=10)).isoformat()
+        },
+        "aspsp": {"name": aspsp_name, "country": aspsp_country},
+        "state": str(uuid.uuid4()),
+        "redirect_url": redirect_url,
+        "psu_type": "personal",
+    }
+
+
+def _transactions_query(date_from: str, continuation_key: Optional[str]) -> dict:
+    """Build the query string for `GET /accounts/{uid}/transactions`."""
+    query = {"date_from": date_from}
+    if continuation_key:
+        query["continuation_key"] = continuation_key
+    return query
+
+
+# Session details shared by the sync and async clients, and coalescing of concurrent lookups
+_session_cache = TTLCache(
+    ttl=Config.enable_banking_session_cache_ttl,
+    max_size=Config.enable_banking_session_cache_size,
+)
+_session_flights = SingleFlight()
+register_cache("enable_banking_sessions", _session_cache)
+
+
+def invalidate_session(session_id: str) -> None:
+    """Drop cached details of a session, e.g. after it was (re)authorized."""
+    _session_cache.invalidate(session_id)
+
+
+# Process-wide HTTP session so that sync callers reuse keep-alive connections
+_http_session = requests.Session()
+_http_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=Config.enable_banking_max_keepalive_connections,
+        pool_maxsize=Config.enable_banking_max_connections,
+    ),
+)
 
 
 class EnableBankingClient:
     """Client for interacting with the Enable Banking API.
-    
+
     This client handles all direct API interactions with Enable Banking, including:
     - Authentication via JWT
     - Bank (ASPSP) discovery
     - Account authorization
     - Account information retrieval (balances, transactions)
-    
-    The client automatically handles JWT generation and token refresh.
+
+    The client automatically handles JWT generation and token refresh through the
+    process-wide `EnableBankingTokenProvider`, so constructing a client is cheap.
     Authentication is done using the private key file (.pem) stored in the secrets directory.
+    All instances share a pooled `requests.Session`, so connections to the API
+    are kept alive between calls.
     """
-    
-    API_ORIGIN = "https://api.enablebanking.com"
-    
-    def __init__(self):
-        """Initialize the client with authentication headers."""
-        self.base_headers = {"Authorization": f"Bearer {self._generate_jwt()}"}
-    
-    def _generate_jwt(self) -> str:
-        """Generate a JWT token for API authentication.
-        
-        The token is valid for 1 hour and includes:
-        - Application ID (kid) from the .pem filename
-        - Standard claims (iss, aud, iat, exp)
-        - RS256 signature using the private key
-        
-        Returns:
-            str: The generated JWT token
-        """
-        iat = int(datetime.now().timestamp())
-        jwt_body = {
-            "iss": "enablebanking.com",
-            "aud": "api.enablebanking.com",
-            "iat": iat,
-            "exp": iat + 3600,
-        }
-        return pyjwt.encode(
-            jwt_body,
-            Config.enable_banking_private_key,
-            algorithm="RS256",
-            headers={"kid": Config.enable_banking_application_id},
-        )
-    
+
+    API_ORIGIN = Config.enable_banking_api_origin
+
+    @property
+    def base_headers(self) -> dict:
+        """Authentication headers carrying the cached, shared JWT."""
+        return {"Authorization": f"Bearer {get_token_provider().get_token()}"}
+
+    def _request(
+        self, method: str, path: str, aspsp: Optional[str] = None, **kwargs
+    ) -> requests.Response:
+        """Send a request to the Enable Banking API and raise on HTTP errors.
+
+        Calls are rate limited globally and per bank (`aspsp`), retried with
+        backoff on 429/5xx/connection errors, and refused while the bank's
+        circuit breaker is open.
+
+        Raises:
+            requests.exceptions.HTTPError: If the API request fails
+            UpstreamUnavailableError: If the bank's circuit breaker is open
+        """
+        policy = get_upstream_policy()
+        attempt = 0
+        while True:
+            attempt += 1
+            time.sleep(policy.before_call(aspsp))
+            start = time.perf_counter()
+            try:
+                response = _http_session.request(
+                    method,
+                    f"{self.API_ORIGIN}{path}",
+                    headers=self.base_headers,
+                    timeout=(Config.enable_banking_connect_timeout, Config.enable_banking_timeout),
+                    **kwargs,
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                observe_upstream_call(method, path, aspsp, "error", time.perf_counter() - start)
+                delay = policy.after_call(aspsp, method, attempt, connection_error=True)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+
+            observe_upstream_call(
+                method, path, aspsp, str(response.status_code), time.perf_counter() - start
+            )
+            delay = policy.after_call(
+                aspsp,
+                method,
+                attempt,
+                status=response.status_code,
+                retry_after=response.headers.get("Retry-After"),
+            )
+            if delay is None:
+                response.raise_for_status()
+                return response
+            time.sleep(delay)
+
     def get_application_details(self) -> dict:
         """Get details about the registered Enable Banking application.
-        
+
         Returns:
             dict: Application details including redirect URLs and other settings
-        
+
         Raises:
             requests.exceptions.HTTPError: If the API request fails
         """
-        response = requests.get(f"{self.API_ORIGIN}/application", headers=self.base_headers)
-        response.raise_for_status()
-        return response.json()
-    
+        return self._request("GET", "/application").json()
+
     def get_available_aspsps(self) -> list:
         """Get list of available banks (ASPSPs - Account Servicing Payment Service Providers).
-        
+
         Returns:
             list: List of available banks with their details (name, country, etc.)
-        
+
         Raises:
             requests.exceptions.HTTPError: If the API request fails
         """
-        response = requests.get(f"{self.API_ORIGIN}/aspsps", headers=self.base_headers)
-        response.raise_for_status()
-        return response.json()["aspsps"]
-    
+        return self._request("GET", "/aspsps").json()["aspsps"]
+
     def start_authorization(self, aspsp_name: str, aspsp_country: str, redirect_url: str) -> dict:
         """Start the bank authorization process for a specific bank.
-        
+
         This initiates the OAuth flow where the user will be redirected to their bank
         to authorize access to their account information.
-        
+
         Args:
             aspsp_name: Name of the bank (e.g., "Nordea")
             aspsp_country: Two-letter country code (e.g., "FI" for Finland)
             redirect_url: URL where the user will be redirected after authorization
-        
+
         Returns:
             dict: Authorization details including the URL where the user should be redirected
-        
+
         Raises:
             requests.exceptions.HTTPError: If the API request fails
         """
-        body = {
-            "access": {
-                "valid_until": (datetime.now(timezone.utc) + timedelta(days=10)).isoformat()
-            },
-            "aspsp": {"name": aspsp_name, "country": aspsp_country},
-            "state": str(uuid.uuid4()),
-            "redirect_url": redirect_url,
-            "psu_type": "personal",
-        }
-        response = requests.post(f"{self.API_ORIGIN}/auth", json=body, headers=self.base_headers)
-        response.raise_for_status()
-        return response.json()
-    
+        body = _authorization_body(aspsp_name, aspsp_country, redirect_url)
+        return self._request("POST", "/auth", aspsp=aspsp_key(body["aspsp"]), json=body).json()
+
     def create_session(self, auth_code: str) -> dict:
         """Create a new banking session using the authorization code.
-        
+
         Args:
             auth_code: The authorization code received after user authorization
-        
+
         Returns:
             dict: Session details including session ID and authorized accounts
-        
+
         Raises:
             requests.exceptions.HTTPError: If the API request fails
         """
-        response = requests.post(
-            f"{self.API_ORIGIN}/sessions", 
-            json={"code": auth_code}, 
-            headers=self.base_headers
-        )
-        response.raise_for_status()
-        return response.json()
-    
-    def get_session(self, session_id: str) -> dict:
+        return self._request("POST", "/sessions", json={"code": auth_code}).json()
+
+    def get_session(self, session_id: str, aspsp: Optional[str] = None) -> dict:
         """Get details of an existing banking session.
-        
+
+        Details are cached for `Config.enable_banking_session_cache_ttl` seconds,
+        and concurrent lookups of the same session share one upstream call.
+
         Args:
             session_id: ID of the session to retrieve
-        
+            aspsp: Optional bank identifier (see `aspsp_key`) for per-bank policies
+
         Returns:
             dict: Session details including authorized accounts
-        
+
         Raises:
             requests.exceptions.HTTPError: If the API request fails
         """
-        response = requests.get(
-            f"{self.API_ORIGIN}/sessions/{session_id}", 
-            headers=self.base_headers
-        )
-        response.raise_for_status()
-        return response.json()
-    
-    def get_account_balances(self, account_uid: str) -> dict:
+        session = _session_cache.get(session_id)
+        if session is None:
+            def fetch() -> dict:
+                fetched = self._request("GET", f"/sessions/{session_id}", aspsp=aspsp).json()
+                _session_cache.set(session_id, fetched)
+                return fetched
+
+            session = _session_flights.do(session_id, fetch)
+        return copy.deepcopy(session)
+
+    def get_account_balances(self, account_uid: str, aspsp: Optional[str] = None) -> dict:
         """Get balances for a specific bank account.
-        
+
         Args:
             account_uid: Unique identifier of the account
-        
+            aspsp: Optional bank identifier (see `aspsp_key`) for per-bank policies
+
         Returns:
             dict: Account balances information
-        
+
         Raises:
             requests.exceptions.HTTPError: If the API request fails
         """
-        response = requests.get(
-            f"{self.API_ORIGIN}/accounts/{account_uid}/balances", 
-            headers=self.base_headers
-        )
-        response.raise_for_status()
-        return response.json()
-    
-    def get_account_transactions(self, account_uid: str, date_from: str, continuation_key: str = None) -> dict:
+        return self._request("GET", f"/accounts/{account_uid}/balances", aspsp=aspsp).json()
+
+    def get_account_transactions(
+        self,
+        account_uid: str,
+        date_from: str,
+        continuation_key: str = None,
+        aspsp: Optional[str] = None,
+    ) -> dict:
         """Get transactions for a specific bank account.
-        
+
         Args:
             account_uid: Unique identifier of the account
             date_from: Start date for transactions in ISO format (YYYY-MM-DD)
             continuation_key: Optional key for paginated results
-        
+            aspsp: Optional bank identifier (see `aspsp_key`) for per-bank policies
+
         Returns:
             dict: Account transactions with optional continuation key for pagination
-        
+
         Raises:
             requests.exceptions.HTTPError: If the API request fails
         """
-        query = {"date_from": date_from}
-        if continuation_key:
-            query["continuation_key"] = continuation_key
-            
-        response = requests.get(
-            f"{self.API_ORIGIN}/accounts/{account_uid}/transactions",
-            params=query,
-            headers=self.base_headers,
+        return self._request(
+            "GET",
+            f"/accounts/{account_uid}/transactions",
+            aspsp=aspsp,
+            params=_transactions_query(date_from, continuation_key),
+        ).json()
+
+
+class AsyncEnableBankingClient:
+    """Async client for the Enable Banking API backed by a pooled `httpx.AsyncClient`.
+
+    A single instance is meant to live for the whole process: it is created in the
+    FastAPI lifespan, shared by every request through `get_enable_banking_client`,
+    and closed on shutdown. Connections are kept alive (and multiplexed over HTTP/2
+    when enabled), so upstream calls skip the TCP+TLS handshake and never block the
+    event loop.
+
+    Concurrent calls for the same session, account balances or transactions
+    page share one in-flight upstream call (and the same result object, which
+    callers must therefore not mutate). Session details are additionally cached.
+    """
+
+    API_ORIGIN = EnableBankingClient.API_ORIGIN
+
+    def __init__(self, http: Optional[httpx.AsyncClient] = None):
+        """Initialize the client.
+
+        Args:
+            http: Optional pre-configured `httpx.AsyncClient`; a pooled one is
+                built from `Config` when omitted.
+        """
+        self._http = http or httpx.AsyncClient(
+            base_url=self.API_ORIGIN,
+            http2=Config.enable_banking_http2,
+            limits=httpx.Limits(
+                max_connections=Config.enable_banking_max_connections,
+                max_keepalive_connections=Config.enable_banking_max_keepalive_connections,
+                keepalive_expiry=Config.enable_banking_keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(
+                Config.enable_banking_timeout,
+                connect=Config.enable_banking_connect_timeout,
+            ),
+        )
+        self._flights = AsyncSingleFlight()
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self._http.aclose()
+
+    def _auth_headers(self) -> dict:
+        """Return the authorization header carrying the cached, shared JWT."""
+        return {"Authorization": f"Bearer {get_token_provider().get_token()}"}
+
+    async def _request(
+        self, method: str, path: str, aspsp: Optional[str] = None, **kwargs
+    ) -> httpx.Response:
+        """Send a request to the Enable Banking API and raise on HTTP errors.
+
+        Applies the same rate limiting, retry and circuit breaking policy as
+        `EnableBankingClient._request`, sleeping without blocking the event loop.
+        """
+        policy = get_upstream_policy()
+        attempt = 0
+        while True:
+            attempt += 1
+            await asyncio.sleep(policy.before_call(aspsp))
+            start = time.perf_counter()
+            try:
+                response = await self._http.request(
+                    method, path, headers=self._auth_headers(), **kwargs
+                )
+            except httpx.TransportError:
+                observe_upstream_call(method, path, aspsp, "error", time.perf_counter() - start)
+                delay = policy.after_call(aspsp, method, attempt, connection_error=True)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+
+            observe_upstream_call(
+                method, path, aspsp, str(response.status_code), time.perf_counter() - start
+            )
+            delay = policy.after_call(
+                aspsp,
+                method,
+                attempt,
+                status=response.status_code,
+                retry_after=response.headers.get("Retry-After"),
+            )
+            if delay is None:
+                response.raise_for_status()
+                return response
+            await asyncio.sleep(delay)
+
+    async def get_application_details(self) -> dict:
+        """Get details about the registered Enable Banking application.
+
+        Raises:
+            httpx.HTTPStatusError: If the API request fails
+        """
+        return (await self._request("GET", "/application")).json()
+
+    async def get_available_aspsps(self) -> list:
+        """Get list of available banks (ASPSPs).
+
+        Raises:
+            httpx.HTTPStatusError: If the API request fails
+        """
+        return (await self._request("GET", "/aspsps")).json()["aspsps"]
+
+    async def start_authorization(
+        self, aspsp_name: str, aspsp_country: str, redirect_url: str
+    ) -> dict:
+        """Start the bank authorization process for a specific bank.
+
+        Raises:
+            httpx.HTTPStatusError: If the API request fails
+        """
+        body = _authorization_body(aspsp_name, aspsp_country, redirect_url)
+        response = await self._request("POST", "/auth", aspsp=aspsp_key(body["aspsp"]), json=body)
+        return response.json()
+
+    async def create_session(self, auth_code: str) -> dict:
+        """Create a new banking session using the authorization code.
+
+        Raises:
+            httpx.HTTPStatusError: If the API request fails
+        """
+        return (await self._request("POST", "/sessions", json={"code": auth_code})).json()
+
+    async def get_session(self, session_id: str, aspsp: Optional[str] = None) -> dict:
+        """Get details of an existing banking session.
+
+        Raises:
+            httpx.HTTPStatusError: If the API request fails
+        """
+        session = _session_cache.get(session_id)
+        if session is None:
+            async def fetch() -> dict:
+                response = await self._request("GET", f"/sessions/{session_id}", aspsp=aspsp)
+                fetched = response.json()
+                _session_cache.set(session_id, fetched)
+                return fetched
+
+            session = await self._flights.do(("session", session_id), fetch)
+        return copy.deepcopy(session)
+
+    async def get_account_balances(self, account_uid: str, aspsp: Optional[str] = None) -> dict:
+        """Get balances for a specific bank account.
+
+        Raises:
+            httpx.HTTPStatusError: If the API request fails
+        """
+        async def fetch() -> dict:
+            response = await self._request(
+                "GET", f"/accounts/{account_uid}/balances", aspsp=aspsp
+            )
+            return response.json()
+
+        return await self._flights.do(("balances", account_uid), fetch)
+
+    async def _get_transactions_response(
+        self,
+        account_uid: str,
+        date_from: str,
+        continuation_key: Optional[str],
+        aspsp: Optional[str],
+    ) -> httpx.Response:
+        async def fetch() -> httpx.Response:
+            return await self._request(
+                "GET",
+                f"/accounts/{account_uid}/transactions",
+                aspsp=aspsp,
+                params=_transactions_query(date_from, continuation_key),
+            )
+
+        key = ("transactions", account_uid, date_from, continuation_key)
+        return await self._flights.do(key, fetch)
+
+    async def get_account_transactions(
+        self,
+        account_uid: str,
+        date_from: str,
+        continuation_key: Optional[str] = None,
+        aspsp: Optional[str] = None,
+    ) -> dict:
+        """Get transactions for a specific bank account.
+
+        Raises:
+            httpx.HTTPStatusError: If the API request fails
+        """
+        response = await self._get_transactions_response(
+            account_uid, date_from, continuation_key, aspsp
         )
-        response.raise_for_status()
         return response.json()
+
+    async def get_account_transactions_raw(
+        self,
+        account_uid: str,
+        date_from: str,
+        continuation_key: Optional[str] = None,
+        aspsp: Optional[str] = None,
+    ) -> bytes:
+        """Get transactions for a specific bank account as the JSON body received.
+
+        For callers passing the page through unchanged, which saves decoding
+        and re-encoding it.
+
+        Raises:
+            httpx.HTTPStatusError: If the API request fails
+        """
+        response = await self._get_transactions_response(
+            account_uid, date_from, continuation_key, aspsp
+        )
+        return response.content
+
+    async def iter_transaction_pages(
+        self,
+        account_uid: str,
+        date_from: str,
+        continuation_key: Optional[str] = None,
+        aspsp: Optional[str] = None,
+        prefetch: int = 1,
+    ) -> AsyncIterator[dict]:
+        """Follow continuation keys and yield each page of an account's transactions.
+
+        A background task fetches up to `prefetch` pages ahead of the consumer,
+        so the next page is in flight while the previous one is processed, and
+        memory stays bounded however long the history is. Closing the iterator
+        cancels the outstanding fetch.
+
+        Raises:
+            httpx.HTTPStatusError: If an API request fails
+        """
+        pages: asyncio.Queue = asyncio.Queue(maxsize=max(prefetch, 1))
+
+        async def produce() -> None:
+            key = continuation_key
+            try:
+                while True:
+                    page = await self.get_account_transactions(account_uid, date_from, key, aspsp)
+                    await pages.put(page)
+                    key = page.get("continuation_key")
+                    if not key:
+                        break
+            except Exception as e:
+                await pages.put(e)
+                return
+            await pages.put(None)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while (page := await pages.get()) is not None:
+                if isinstance(page, Exception):
+                    raise page
+                yield page
+        finally:
+            producer.cancel()
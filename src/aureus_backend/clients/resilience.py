@@ -0,0 +1,228 @@
+"""Rate limiting, retry and circuit breaking for Enable Banking API calls.
+
+The policy is shared by the sync and async clients: both ask it how long to
+wait before a call, and what to do with its outcome. All state is guarded by
+plain locks held for a few arithmetic operations, so it is safe to use from
+worker threads and from the event loop alike.
+"""
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+import random
+import threading
+import time
+from typing import Optional
+
+from ..core import Config
+
+# Statuses worth retrying: rate limited, or a transient upstream/gateway failure
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Methods that can be replayed without side effects
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class UpstreamUnavailableError(Exception):
+    """Raised without calling upstream while a bank's circuit breaker is open."""
+
+
+class TokenBucket:
+    """Token bucket rate limiter handing out reservations.
+
+    `reserve` always takes a token, possibly going into debt, and returns how
+    long the caller must wait before using it. Callers therefore sleep outside
+    the lock and are served in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return the seconds to wait before it is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(-self._tokens / self.rate, 0.0)
+
+
+class CircuitBreaker:
+    """Fails fast after repeated failures, probing again after `reset_timeout`.
+
+    closed -> open after `failure_threshold` consecutive failures; open ->
+    half-open once `reset_timeout` has elapsed, letting a single probe call
+    through; the probe's outcome closes or re-opens the circuit. A probe that
+    never reports back (e.g. cancelled) is replaced after another `reset_timeout`.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """Raise `UpstreamUnavailableError` if calls are currently not allowed."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            now = time.monotonic()
+            waiting = now - self._opened_at < self.reset_timeout
+            probing = (
+                self._probe_started is not None
+                and now - self._probe_started < self.reset_timeout
+            )
+            if waiting or probing:
+                raise UpstreamUnavailableError("Bank is temporarily unavailable")
+            self._probe_started = now
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_started = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probe_started is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probe_started = None
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a `Retry-After` header (delay in seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class UpstreamPolicy:
+    """Process-wide rate limits, retries and per-bank circuit breakers."""
+
+    def __init__(
+        self,
+        global_rate: float,
+        global_burst: float,
+        aspsp_rate: float,
+        aspsp_burst: float,
+        max_attempts: int,
+        backoff_base: float,
+        backoff_max: float,
+        breaker_threshold: int,
+        breaker_reset: float
+    ):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._global_bucket = TokenBucket(global_rate, global_burst)
+        self._aspsp_rate = aspsp_rate
+        self._aspsp_burst = aspsp_burst
+        self._breaker_threshold = breaker_threshold
+        self._breaker_reset = breaker_reset
+        self._buckets: dict[str, TokenBucket] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def _breaker(self, aspsp: str) -> CircuitBreaker:
+        with self._lock:
+            if aspsp not in self._breakers:
+                self._breakers[aspsp] = CircuitBreaker(
+                    self._breaker_threshold, self._breaker_reset
+                )
+            return self._breakers[aspsp]
+
+    def _bucket(self, aspsp: str) -> TokenBucket:
+        with self._lock:
+            if aspsp not in self._buckets:
+                self._buckets[aspsp] = TokenBucket(self._aspsp_rate, self._aspsp_burst)
+            return self._buckets[aspsp]
+
+    def before_call(self, aspsp: Optional[str]) -> float:
+        """Check the bank's circuit and return how long to wait for rate limits.
+
+        Raises:
+            UpstreamUnavailableError: If the bank's circuit breaker is open
+        """
+        if aspsp:
+            self._breaker(aspsp).before_call()
+        delay = self._global_bucket.reserve()
+        if aspsp:
+            delay = max(delay, self._bucket(aspsp).reserve())
+        return delay
+
+    def after_call(
+        self,
+        aspsp: Optional[str],
+        method: str,
+        attempt: int,
+        status: Optional[int] = None,
+        retry_after: Optional[str] = None,
+        connection_error: bool = False
+    ) -> Optional[float]:
+        """Record a call's outcome and decide whether to retry it.
+
+        Args:
+            aspsp: Bank the call was made for, if known
+            method: HTTP method of the call
+            attempt: 1-based attempt number
+            status: HTTP status code, when a response was received
+            retry_after: Value of the response's `Retry-After` header
+            connection_error: Whether the call failed before getting a response
+
+        Returns:
+            Seconds to wait before retrying, or None to give up (or on success)
+        """
+        failed = connection_error or (status is not None and status >= 500)
+        if aspsp and failed:
+            self._breaker(aspsp).record_failure()
+        elif aspsp:
+            self._breaker(aspsp).record_success()
+
+        if not connection_error and status not in RETRYABLE_STATUSES:
+            return None
+        if attempt >= self.max_attempts:
+            return None
+        # Only 429s are known not to have been processed; replay others if idempotent
+        if status != 429 and method.upper() not in IDEMPOTENT_METHODS:
+            return None
+
+        backoff = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        server_delay = parse_retry_after(retry_after)
+        if server_delay is None:
+            return backoff
+        # Don't hold the caller longer than `backoff_max` when told to come back later
+        if server_delay > self.backoff_max:
+            return None
+        return max(server_delay, backoff)
+
+
+@lru_cache(maxsize=1)
+def get_upstream_policy() -> UpstreamPolicy:
+    """Get the process-wide upstream policy."""
+    return UpstreamPolicy(
+        global_rate=Config.enable_banking_rate_limit,
+        global_burst=Config.enable_banking_rate_burst,
+        aspsp_rate=Config.enable_banking_aspsp_rate_limit,
+        aspsp_burst=Config.enable_banking_aspsp_rate_burst,
+        max_attempts=Config.enable_banking_max_attempts,
+        backoff_base=Config.enable_banking_backoff_base,
+        backoff_max=Config.enable_banking_backoff_max,
+        breaker_threshold=Config.enable_banking_breaker_threshold,
+        breaker_reset=Config.enable_banking_breaker_reset
+    )
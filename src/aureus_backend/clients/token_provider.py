@@ -0,0 +1,107 @@
+"""Process-wide provider of signed Enable Banking API tokens."""
+import asyncio
+from functools import lru_cache
+import logging
+import threading
+import time
+
+from cryptography.hazmat.primitives import serialization
+import jwt as pyjwt
+
+from ..core import Config
+
+logger = logging.getLogger(__name__)
+
+
+class EnableBankingTokenProvider:
+    """Signs and caches the JWT used to authenticate against Enable Banking.
+
+    The PEM private key is parsed once at construction and the signed token is
+    reused until it gets close to `exp`. `get_token` is safe to call from any
+    thread or task: the cached token is read without locking, and only a stale
+    token takes the lock to re-sign. `run_refresher` re-signs in the background
+    ahead of expiry so request paths never pay for the RSA signature.
+    """
+
+    def __init__(
+        self,
+        private_key_pem: str,
+        application_id: str,
+        lifetime: int = 3600,
+        refresh_margin: int = 300,
+    ):
+        """Initialize the provider.
+
+        Args:
+            private_key_pem: PEM-encoded RSA private key
+            application_id: Enable Banking application ID, sent as the `kid` header
+            lifetime: Validity of each signed token in seconds
+            refresh_margin: Re-sign this many seconds before the token expires
+        """
+        self._private_key = serialization.load_pem_private_key(
+            private_key_pem.encode(), password=None
+        )
+        self._application_id = application_id
+        self._lifetime = lifetime
+        self._refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        # (token, refresh_at) swapped as a single tuple so readers never see a torn pair
+        self._current: tuple[str, float] = ("", 0.0)
+
+    def _sign(self) -> tuple[str, float]:
+        """Sign a fresh token and return it with the time it should be refreshed at."""
+        iat = int(time.time())
+        jwt_body = {
+            "iss": "enablebanking.com",
+            "aud": "api.enablebanking.com",
+            "iat": iat,
+            "exp": iat + self._lifetime,
+        }
+        token = pyjwt.encode(
+            jwt_body,
+            self._private_key,
+            algorithm="RS256",
+            headers={"kid": self._application_id},
+        )
+        return token, iat + self._lifetime - self._refresh_margin
+
+    def refresh(self) -> str:
+        """Re-sign the token unconditionally and return it."""
+        with self._lock:
+            self._current = self._sign()
+            return self._current[0]
+
+    def get_token(self) -> str:
+        """Return a valid token, signing a new one only if the cached one is stale."""
+        token, refresh_at = self._current
+        if token and time.time() < refresh_at:
+            return token
+        with self._lock:
+            token, refresh_at = self._current
+            if not token or time.time() >= refresh_at:
+                self._current = self._sign()
+            return self._current[0]
+
+    async def run_refresher(self) -> None:
+        """Keep the token fresh until cancelled.
+
+        Signing runs in a worker thread so the event loop is not blocked.
+        """
+        while True:
+            await asyncio.sleep(max(self._current[1] - time.time(), 0))
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception:
+                logger.exception("Failed to refresh Enable Banking token")
+                await asyncio.sleep(5)
+
+
+@lru_cache(maxsize=1)
+def get_token_provider() -> EnableBankingTokenProvider:
+    """Get the process-wide token provider."""
+    return EnableBankingTokenProvider(
+        Config.enable_banking_private_key,
+        Config.enable_banking_application_id,
+        lifetime=Config.enable_banking_jwt_lifetime,
+        refresh_margin=Config.enable_banking_jwt_refresh_margin,
+    )
@@ -6,6 +6,25 @@ from dotenv import load_dotenv
 
 load_dotenv(override=True)
 
+class _lazy:
+    """Class attribute computed on first access, then stored on the class.
+
+    Keeps secrets from being read at import time, so a missing one only fails
+    the code that needs it.
+    """
+
+    def __init__(self, load):
+        self.load = load
+        self.__doc__ = load.__doc__
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        value = self.load(owner)
+        setattr(owner, self.name, value)
+        return value
+
 class Config:
     ENVIRONMENT = os.environ.get("ENVIRONMENT", "sandbox")
 
@@ -14,13 +33,186 @@ class Config:
     SECRETS_DIR: Path = BASE_DIR / ".secrets" / ENVIRONMENT
 
     # Find the .pem file and extract application_id from filename
-    enable_banking_private_key_file: Path = next(SECRETS_DIR.glob("*.pem"))
-    enable_banking_application_id: str = enable_banking_private_key_file.stem
-    enable_banking_private_key: str = enable_banking_private_key_file.read_text()
+    @_lazy
+    def enable_banking_private_key_file(cls) -> Path:
+        try:
+            return next(cls.SECRETS_DIR.glob("*.pem"))
+        except StopIteration:
+            raise RuntimeError(
+                f"No Enable Banking private key (.pem) found in {cls.SECRETS_DIR}"
+            ) from None
+
+    @_lazy
+    def enable_banking_application_id(cls) -> str:
+        return cls.enable_banking_private_key_file.stem
+
+    @_lazy
+    def enable_banking_private_key(cls) -> str:
+        return cls.enable_banking_private_key_file.read_text()
+
+    enable_banking_jwt_lifetime: int = int(os.environ.get("ENABLE_BANKING_JWT_LIFETIME", "3600"))
+    enable_banking_jwt_refresh_margin: int = int(
+        os.environ.get("ENABLE_BANKING_JWT_REFRESH_MARGIN", "300")
+    )
 
     # Supabase connection string
-    connection_string: str = (
-        f"postgresql://postgres.{os.environ.get('SUPABASE_PROJECT_REF')}:"
-        f"{urllib.parse.quote(os.environ.get('SUPABASE_DB_PASSWORD'))}@"
-        f"{os.environ.get('SUPABASE_REGION')}.pooler.supabase.com:6543/postgres"
+    @_lazy
+    def connection_string(cls) -> str:
+        password = os.environ.get("SUPABASE_DB_PASSWORD")
+        if not password:
+            raise RuntimeError("SUPABASE_DB_PASSWORD environment variable not set")
+        return (
+            f"postgresql://postgres.{os.environ.get('SUPABASE_PROJECT_REF')}:"
+            f"{urllib.parse.quote(password)}@"
+            f"{os.environ.get('SUPABASE_REGION')}.pooler.supabase.com:6543/postgres"
+        )
+
+    # Secret Supabase signs user access tokens with (HS256), and their audience
+    @_lazy
+    def jwt_secret(cls) -> str:
+        secret = os.environ.get("SUPABASE_JWT_SECRET")
+        if not secret:
+            raise RuntimeError("SUPABASE_JWT_SECRET environment variable not set")
+        return secret
+
+    jwt_audience: str = os.environ.get("SUPABASE_JWT_AUDIENCE", "authenticated")
+
+    # Same database through asyncpg, used by request handlers
+    @_lazy
+    def async_connection_string(cls) -> str:
+        return cls.connection_string.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    # Enable Banking API base URL (point at a local stand-in for benchmarks)
+    enable_banking_api_origin: str = os.environ.get(
+        "ENABLE_BANKING_API_ORIGIN", "https://api.enablebanking.com"
+    )
+
+    # Enable Banking upstream policy: rate limits (requests/s and burst), retries, circuit breaker
+    enable_banking_rate_limit: float = float(os.environ.get("ENABLE_BANKING_RATE_LIMIT", "20"))
+    enable_banking_rate_burst: float = float(os.environ.get("ENABLE_BANKING_RATE_BURST", "40"))
+    enable_banking_aspsp_rate_limit: float = float(
+        os.environ.get("ENABLE_BANKING_ASPSP_RATE_LIMIT", "5")
+    )
+    enable_banking_aspsp_rate_burst: float = float(
+        os.environ.get("ENABLE_BANKING_ASPSP_RATE_BURST", "10")
+    )
+    enable_banking_max_attempts: int = int(os.environ.get("ENABLE_BANKING_MAX_ATTEMPTS", "4"))
+    enable_banking_backoff_base: float = float(
+        os.environ.get("ENABLE_BANKING_BACKOFF_BASE", "0.5")
+    )
+    enable_banking_backoff_max: float = float(os.environ.get("ENABLE_BANKING_BACKOFF_MAX", "30"))
+    enable_banking_breaker_threshold: int = int(
+        os.environ.get("ENABLE_BANKING_BREAKER_THRESHOLD", "5")
+    )
+    enable_banking_breaker_reset: float = float(
+        os.environ.get("ENABLE_BANKING_BREAKER_RESET", "60")
+    )
+
+    # Session details cache (seconds and max entries)
+    enable_banking_session_cache_ttl: float = float(
+        os.environ.get("ENABLE_BANKING_SESSION_CACHE_TTL", "60")
+    )
+    enable_banking_session_cache_size: int = int(
+        os.environ.get("ENABLE_BANKING_SESSION_CACHE_SIZE", "10000")
+    )
+
+    # Verified bearer token cache (max entries, and max seconds an entry lives before its `exp`)
+    auth_token_cache_size: int = int(os.environ.get("AUTH_TOKEN_CACHE_SIZE", "10000"))
+    auth_token_cache_max_ttl: float = float(os.environ.get("AUTH_TOKEN_CACHE_MAX_TTL", "3600"))
+
+    # Connection status lookups: per-call deadline and max age of a served snapshot (seconds)
+    connection_status_timeout: float = float(os.environ.get("CONNECTION_STATUS_TIMEOUT", "3"))
+    connection_snapshot_max_age: float = float(
+        os.environ.get("CONNECTION_SNAPSHOT_MAX_AGE", "300")
     )
+
+    # Seconds between refreshes of the in-memory ASPSP (bank) catalog
+    aspsp_catalog_ttl: float = float(os.environ.get("ASPSP_CATALOG_TTL", "3600"))
+
+    # Response compression: minimum body size in bytes, gzip level (1-9), brotli quality (0-11)
+    compression_minimum_size: int = int(os.environ.get("COMPRESSION_MINIMUM_SIZE", "1024"))
+    compression_gzip_level: int = int(os.environ.get("COMPRESSION_GZIP_LEVEL", "6"))
+    compression_brotli_quality: int = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "4"))
+
+    # Portfolio balances: max age of served snapshots and per-call upstream deadline (seconds)
+    balances_max_age: float = float(os.environ.get("BALANCES_MAX_AGE", "300"))
+    balances_timeout: float = float(os.environ.get("BALANCES_TIMEOUT", "10"))
+
+    # Per-user net-worth ledgers kept in memory (seconds and max users)
+    net_worth_cache_ttl: float = float(os.environ.get("NET_WORTH_CACHE_TTL", "3600"))
+    net_worth_cache_size: int = int(os.environ.get("NET_WORTH_CACHE_SIZE", "1000"))
+
+    # Transactions are read from the ingested store while the user's last successful
+    # ingestion is at most this many seconds old, and from Enable Banking otherwise
+    transactions_store_max_age: float = float(
+        os.environ.get("TRANSACTIONS_STORE_MAX_AGE", str(25 * 3600))
+    )
+
+    # Transaction pages fetched ahead of the client when streaming (`?stream=true`)
+    transactions_stream_prefetch: int = int(os.environ.get("TRANSACTIONS_STREAM_PREFETCH", "2"))
+
+    # Enable Banking HTTP transport (connection pool shared across requests)
+    enable_banking_http2: bool = os.environ.get("ENABLE_BANKING_HTTP2", "true").lower() == "true"
+    enable_banking_max_connections: int = int(
+        os.environ.get("ENABLE_BANKING_MAX_CONNECTIONS", "100")
+    )
+    enable_banking_max_keepalive_connections: int = int(
+        os.environ.get("ENABLE_BANKING_MAX_KEEPALIVE_CONNECTIONS", "20")
+    )
+    enable_banking_keepalive_expiry: float = float(
+        os.environ.get("ENABLE_BANKING_KEEPALIVE_EXPIRY", "30")
+    )
+    enable_banking_timeout: float = float(os.environ.get("ENABLE_BANKING_TIMEOUT", "30"))
+    enable_banking_connect_timeout: float = float(
+        os.environ.get("ENABLE_BANKING_CONNECT_TIMEOUT", "5")
+    )
+
+    # Ingestion fan-out: accounts fetched in parallel per run, upstream calls in flight overall
+    ingestion_user_concurrency: int = int(os.environ.get("INGESTION_USER_CONCURRENCY", "4"))
+    ingestion_global_concurrency: int = int(os.environ.get("INGESTION_GLOBAL_CONCURRENCY", "16"))
+
+    # Incremental ingestion: initial/backfill window and re-fetch overlap before each watermark
+    ingestion_lookback_days: int = int(os.environ.get("INGESTION_LOOKBACK_DAYS", "90"))
+    ingestion_overlap_days: int = int(os.environ.get("INGESTION_OVERLAP_DAYS", "3"))
+
+    # dlt writer sizing: rows buffered in memory, and rows/bytes per intermediary file
+    ingestion_buffer_max_items: int = int(os.environ.get("INGESTION_BUFFER_MAX_ITEMS", "5000"))
+    ingestion_file_max_items: int = int(os.environ.get("INGESTION_FILE_MAX_ITEMS", "100000"))
+    ingestion_file_max_bytes: int = int(
+        os.environ.get("INGESTION_FILE_MAX_BYTES", str(64 * 1024 * 1024))
+    )
+
+    # Background ingestion workers (0 disables them in the API process)
+    ingestion_workers: int = int(os.environ.get("INGESTION_WORKERS", "2"))
+    ingestion_poll_interval: float = float(os.environ.get("INGESTION_POLL_INTERVAL", "2"))
+    ingestion_heartbeat_interval: float = float(
+        os.environ.get("INGESTION_HEARTBEAT_INTERVAL", "5")
+    )
+    ingestion_job_stale_after: float = float(os.environ.get("INGESTION_JOB_STALE_AFTER", "120"))
+    ingestion_job_max_attempts: int = int(os.environ.get("INGESTION_JOB_MAX_ATTEMPTS", "3"))
+    # Port serving /metrics from a standalone worker process (0 disables it)
+    ingestion_metrics_port: int = int(os.environ.get("INGESTION_METRICS_PORT", "0"))
+
+    # Periodic ingestion of all users: cadence, scan tick, slot jitter and users claimed per scan
+    ingestion_scheduler_enabled: bool = (
+        os.environ.get("INGESTION_SCHEDULER_ENABLED", "true").lower() == "true"
+    )
+    ingestion_schedule_interval: float = float(
+        os.environ.get("INGESTION_SCHEDULE_INTERVAL", str(24 * 3600))
+    )
+    ingestion_schedule_tick: float = float(os.environ.get("INGESTION_SCHEDULE_TICK", "60"))
+    ingestion_schedule_jitter: float = float(os.environ.get("INGESTION_SCHEDULE_JITTER", "300"))
+    ingestion_schedule_batch_size: int = int(
+        os.environ.get("INGESTION_SCHEDULE_BATCH_SIZE", "100")
+    )
+
+    # Seconds between event loop lag probes reported in /metrics
+    event_loop_lag_interval: float = float(os.environ.get("EVENT_LOOP_LAG_INTERVAL", "0.5"))
+
+    # Per-request profiling: requests with a valid `X-Profile` header signed with the
+    # secret, or a random share of them, are sampled every `profiling_interval` seconds
+    profiling_enabled: bool = os.environ.get("PROFILING_ENABLED", "false").lower() == "true"
+    profiling_secret: str = os.environ.get("PROFILING_SECRET", "")
+    profiling_sample_rate: float = float(os.environ.get("PROFILING_SAMPLE_RATE", "0"))
+    profiling_interval: float = float(os.environ.get("PROFILING_INTERVAL", "0.005"))
+    profiling_dir: str = os.environ.get("PROFILING_DIR", "/tmp/aureus-profiles")
@@ -1,13 +1,30 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import asyncio
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import logging
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
+from aureus_backend.clients import AsyncEnableBankingClient, get_token_provider
+from aureus_backend.core import Config
+from aureus_backend.services.aspsp_catalog import AspspCatalog
+from aureus_backend.services.ingestion.jobs import IngestionWorkerPool
+from aureus_backend.services.ingestion.scheduler import IngestionScheduler
+from aureus_backend.utils.compression import CompressionMiddleware
+from aureus_backend.utils.dependencies import dispose_engines
+from aureus_backend.utils.metrics import MetricsMiddleware, monitor_event_loop_lag
+from aureus_backend.utils.profiling import ProfilingMiddleware
 from aureus_backend.api.v1.auth.google import router as google_auth_router
 from aureus_backend.api.v1.auth.credentials import router as credentials_router
 from aureus_backend.api.v1.banking.banks import router as banking_banks_router
 from aureus_backend.api.v1.banking.connect import router as banking_connect_router
 from aureus_backend.api.v1.banking.accounts import router as banking_accounts_router
+from aureus_backend.api.v1.banking.balances import router as banking_balances_router
+from aureus_backend.api.v1.banking.net_worth import router as banking_net_worth_router
 from aureus_backend.api.v1.ingestion.banking import router as banking_ingestion_router
+from aureus_backend.api.v1.ingestion.jobs import router as ingestion_jobs_router
 
 # Configure logging
 logging.basicConfig(
@@ -15,11 +32,55 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+logger = logging.getLogger(__name__)
+
+async def run_token_refresher() -> None:
+    """Keep the Enable Banking token fresh, once its private key can be loaded.
+
+    The key is read off the event loop, and a missing key only fails the
+    banking routes instead of the whole app's startup.
+    """
+    try:
+        token_provider = await asyncio.to_thread(get_token_provider)
+    except Exception:
+        logger.exception("Enable Banking token provider unavailable")
+        return
+    await token_provider.run_refresher()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create process-wide resources on startup and release them on shutdown."""
+    app.state.enable_banking_client = AsyncEnableBankingClient()
+    app.state.aspsp_catalog = AspspCatalog(
+        app.state.enable_banking_client, ttl=Config.aspsp_catalog_ttl
+    )
+    background_tasks = [
+        asyncio.create_task(run_token_refresher()),
+        asyncio.create_task(app.state.aspsp_catalog.run_refresher()),
+        asyncio.create_task(monitor_event_loop_lag(Config.event_loop_lag_interval)),
+    ]
+    ingestion_workers = IngestionWorkerPool()
+    ingestion_workers.start()
+    ingestion_scheduler = IngestionScheduler()
+    if Config.ingestion_scheduler_enabled:
+        ingestion_scheduler.start()
+    try:
+        yield
+    finally:
+        await asyncio.to_thread(ingestion_scheduler.stop)
+        await asyncio.to_thread(ingestion_workers.stop)
+        for task in background_tasks:
+            task.cancel()
+        await app.state.enable_banking_client.aclose()
+        await dispose_engines()
+
 app = FastAPI(
     title="Aureus Backend",
     description="Backend API for Aureus wealth tracker",
     version="0.1.0",
-    debug=True  # Enable debug mode
+    debug=True,  # Enable debug mode
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -31,14 +92,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record request latency by route for /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Compress large responses with brotli or gzip, as negotiated by the client
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=Config.compression_minimum_size,
+    gzip_level=Config.compression_gzip_level,
+    brotli_quality=Config.compression_brotli_quality
+)
+
+# Profile signed or sampled requests; not installed at all unless enabled
+if Config.profiling_enabled:
+    app.add_middleware(ProfilingMiddleware)
+
 # Include routers
 app.include_router(google_auth_router, prefix="/api/v1/auth")
 app.include_router(credentials_router, prefix="/api/v1/auth")
 app.include_router(banking_banks_router, prefix="/api/v1")
 app.include_router(banking_connect_router, prefix="/api/v1")
 app.include_router(banking_accounts_router, prefix="/api/v1")
+app.include_router(banking_balances_router, prefix="/api/v1")
+app.include_router(banking_net_worth_router, prefix="/api/v1")
 app.include_router(banking_ingestion_router, prefix="/api/v1")
+app.include_router(ingestion_jobs_router, prefix="/api/v1")
 
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics in the text exposition format."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
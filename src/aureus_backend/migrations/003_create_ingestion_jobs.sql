@@ -0,0 +1,36 @@
+-- Create ingestion_jobs table backing the background ingestion queue
+create table if not exists ingestion_jobs (
+    id uuid primary key default gen_random_uuid(),
+    user_id uuid not null references users(id),
+    provider varchar not null,              -- 'enablebanking'
+    status varchar not null default 'queued', -- 'queued', 'running', 'succeeded', 'failed'
+    full_refresh boolean not null default false,
+    progress jsonb not null default '{}'::jsonb,
+    error text,
+    attempts integer not null default 0,
+    worker_id varchar,                      -- worker currently holding the job
+    heartbeat_at timestamp with time zone,  -- last sign of life from that worker
+    created_at timestamp with time zone default current_timestamp,
+    started_at timestamp with time zone,
+    finished_at timestamp with time zone
+);
+
+-- Workers poll for queued jobs (and running jobs with a stale heartbeat) oldest first
+create index if not exists idx_ingestion_jobs_pending
+    on ingestion_jobs(created_at)
+    where status in ('queued', 'running');
+
+-- Create index for listing a user's jobs
+create index if not exists idx_ingestion_jobs_user
+    on ingestion_jobs(user_id, created_at desc);
+
+-- Enable RLS: users can only see their own jobs
+alter table ingestion_jobs enable row level security;
+
+create policy "Users can view their own ingestion jobs"
+    on ingestion_jobs
+    for select
+    using (auth.uid() = user_id);
+
+-- Add a comment to the table
+comment on table ingestion_jobs is 'Background ingestion jobs with their progress and outcome';
@@ -0,0 +1,22 @@
+-- Create ingestion_schedule table driving periodic syncs across API nodes
+create table if not exists ingestion_schedule (
+    user_id uuid not null references users(id),
+    provider varchar not null,              -- 'enablebanking'
+    slot_offset integer not null,           -- seconds into each interval, derived from user_id
+    next_run_at timestamp with time zone not null,
+    lease_owner varchar,                    -- node that last claimed the user
+    leased_until timestamp with time zone,  -- other nodes skip the user until then
+    last_enqueued_at timestamp with time zone,
+    created_at timestamp with time zone default current_timestamp,
+    primary key (user_id, provider)
+);
+
+-- Create index for finding due users
+create index if not exists idx_ingestion_schedule_due
+    on ingestion_schedule(provider, next_run_at);
+
+-- Enable RLS: only the backend (service role) manages the schedule
+alter table ingestion_schedule enable row level security;
+
+-- Add a comment to the table
+comment on table ingestion_schedule is 'Per-user slots and leases for scheduled ingestion';
@@ -0,0 +1,4 @@
+-- Keep the last known upstream status of each connection next to its credential
+alter table api_credentials
+    add column if not exists status_snapshot jsonb,
+    add column if not exists status_checked_at timestamp with time zone;
@@ -0,0 +1,100 @@
+-- Upgrade raw_enablebanking.raw_transactions tables created before transactions
+-- were upserted on (user_id, account_uid, transaction_id). Those were appended to
+-- with an (entry_reference, user_id) key hint and no constraint, so they hold
+-- duplicates and lack the transaction_id column 006 indexes.
+--
+-- The legacy key made entry_reference not null, and transaction_id is the
+-- entry_reference whenever there is one, so rows are upgraded in place: history
+-- and the ingestion watermarks stay valid. Only the newest copy of each
+-- duplicated transaction is kept. Nested tables (list fields) lose the rows of
+-- removed copies and get the _dlt_root_id column dlt's merge needs; dlt can't
+-- add these not null columns itself to tables that already have rows.
+--
+-- Runs before 006 and does nothing on databases without the legacy table.
+do $$
+declare
+    nested record;
+    parent_table text;
+begin
+    if to_regclass('raw_enablebanking.raw_transactions') is null or exists (
+        select 1 from information_schema.columns
+        where table_schema = 'raw_enablebanking'
+            and table_name = 'raw_transactions'
+            and column_name = 'transaction_id'
+    ) then
+        return;
+    end if;
+
+    alter table raw_enablebanking.raw_transactions add column transaction_id varchar;
+    update raw_enablebanking.raw_transactions set transaction_id = entry_reference;
+
+    delete from raw_enablebanking.raw_transactions
+    where ctid in (
+        select ctid from (
+            select ctid, row_number() over (
+                partition by user_id, account_uid, transaction_id
+                order by _dlt_load_id desc, _dlt_id desc
+            ) as copy
+            from raw_enablebanking.raw_transactions
+        ) copies
+        where copy > 1
+    );
+
+    alter table raw_enablebanking.raw_transactions
+        alter column transaction_id set not null,
+        drop constraint if exists raw_transactions_pkey,
+        add primary key (user_id, account_uid, transaction_id);
+
+    -- Parents before their children: a nested table's name extends its parent's
+    for nested in
+        select table_name from information_schema.tables
+        where table_schema = 'raw_enablebanking'
+            and table_name like 'raw\_transactions\_\_%'
+        order by length(table_name)
+    loop
+        if not exists (
+            select 1 from information_schema.columns
+            where table_schema = 'raw_enablebanking'
+                and table_name = nested.table_name
+                and column_name = '_dlt_root_id'
+        ) then
+            execute format(
+                'alter table raw_enablebanking.%I add column _dlt_root_id varchar',
+                nested.table_name
+            );
+        end if;
+
+        select p.table_name into parent_table
+        from information_schema.tables p
+        where p.table_schema = 'raw_enablebanking'
+            and nested.table_name like p.table_name || '\_\_%'
+            and (p.table_name = 'raw_transactions' or p.table_name like 'raw\_transactions\_\_%')
+        order by length(p.table_name) desc
+        limit 1;
+
+        if parent_table = 'raw_transactions' then
+            execute format(
+                'update raw_enablebanking.%1$I c set _dlt_root_id = c._dlt_parent_id '
+                'where exists (select 1 from raw_enablebanking.raw_transactions p '
+                'where p._dlt_id = c._dlt_parent_id)',
+                nested.table_name
+            );
+        else
+            execute format(
+                'update raw_enablebanking.%1$I c set _dlt_root_id = p._dlt_root_id '
+                'from raw_enablebanking.%2$I p where p._dlt_id = c._dlt_parent_id',
+                nested.table_name, parent_table
+            );
+        end if;
+
+        -- Rows of removed duplicates (or of their removed ancestors) have no root
+        execute format(
+            'delete from raw_enablebanking.%I where _dlt_root_id is null', nested.table_name
+        );
+        execute format(
+            'alter table raw_enablebanking.%I alter column _dlt_root_id set not null',
+            nested.table_name
+        );
+    end loop;
+end
+$$;
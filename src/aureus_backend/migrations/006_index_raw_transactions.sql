@@ -0,0 +1,35 @@
+-- Index the transactions ingested by dlt for reads served from the database.
+-- dlt creates raw_enablebanking.raw_transactions on the first ingestion and adds
+-- any further columns itself; the columns reads depend on are created here so the
+-- indexes exist on a fresh database too.
+create schema if not exists raw_enablebanking;
+
+create table if not exists raw_enablebanking.raw_transactions (
+    user_id varchar not null,
+    account_uid varchar not null,
+    transaction_id varchar not null,
+    booking_date varchar,
+    value_date varchar,
+    status varchar,
+    credit_debit_indicator varchar,
+    transaction_amount__amount varchar,
+    transaction_amount__currency varchar,
+    ingested_at timestamp with time zone,
+    _dlt_load_id varchar not null,
+    _dlt_id varchar not null unique,
+    primary key (user_id, account_uid, transaction_id)
+);
+
+-- Keyset pagination of one account, newest first: (date, transaction_id)
+create index if not exists idx_raw_transactions_account_date
+    on raw_enablebanking.raw_transactions (
+        user_id,
+        account_uid,
+        (coalesce(booking_date, value_date)) desc,
+        transaction_id desc
+    );
+
+-- Freshness of a user's ingested data: their latest successful ingestion
+create index if not exists idx_ingestion_jobs_user_succeeded
+    on ingestion_jobs(user_id, provider, finished_at desc)
+    where status = 'succeeded';
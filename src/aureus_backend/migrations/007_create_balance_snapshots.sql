@@ -0,0 +1,28 @@
+-- Create balance_snapshots table keeping the history of fetched account balances
+create table if not exists balance_snapshots (
+    id bigserial primary key,
+    user_id uuid not null references users(id),
+    credential_id integer not null references api_credentials(id) on delete cascade,
+    account_uid varchar not null,
+    account_name varchar,
+    account_iban varchar,
+    bank_name varchar,
+    bank_country varchar,
+    balances jsonb not null,                -- upstream balance entries, as returned
+    fetched_at timestamp with time zone not null default current_timestamp
+);
+
+-- Latest snapshot per account, and an account's history, newest first
+create index if not exists idx_balance_snapshots_user_account
+    on balance_snapshots(user_id, account_uid, fetched_at desc);
+
+-- Enable RLS: users can only see their own balances
+alter table balance_snapshots enable row level security;
+
+create policy "Users can view their own balance snapshots"
+    on balance_snapshots
+    for select
+    using (auth.uid() = user_id);
+
+-- Add a comment to the table
+comment on table balance_snapshots is 'Timestamped history of account balances fetched from providers';
@@ -0,0 +1,4 @@
+-- Net-worth ledgers are updated with the transactions of loads newer than the
+-- last one applied: find them without scanning the user's whole history
+create index if not exists idx_raw_transactions_user_load
+    on raw_enablebanking.raw_transactions (user_id, _dlt_load_id);
@@ -0,0 +1,25 @@
+-- At most one queued or running ingestion job per user: every run of a user
+-- writes the same dlt pipeline (directory, state and watermarks), so two must
+-- never run at once. Jobs enqueued while one is active get the active one back.
+
+-- Resolve existing duplicates first: keep a running job over a queued one, and
+-- the oldest among jobs of the same status
+update ingestion_jobs j
+set status = 'failed',
+    error = 'Superseded by another active ingestion job',
+    finished_at = current_timestamp
+where j.status in ('queued', 'running')
+    and exists (
+        select 1 from ingestion_jobs k
+        where k.user_id = j.user_id
+            and k.id <> j.id
+            and k.status in ('queued', 'running')
+            and (
+                (k.status = 'running' and j.status = 'queued')
+                or (k.status = j.status and (k.created_at, k.id) < (j.created_at, j.id))
+            )
+    );
+
+create unique index if not exists idx_ingestion_jobs_user_active
+    on ingestion_jobs(user_id)
+    where status in ('queued', 'running');
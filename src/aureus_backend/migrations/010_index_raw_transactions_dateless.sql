@@ -0,0 +1,13 @@
+-- Keyset pagination of one account, newest first, on the transaction date as
+-- reads now compute it: transactions with neither a booking nor a value date get
+-- '' instead of NULL, so they sort last and a page ending on one can be continued
+create index if not exists idx_raw_transactions_account_keyset
+    on raw_enablebanking.raw_transactions (
+        user_id,
+        account_uid,
+        (coalesce(booking_date, value_date, '')) desc,
+        transaction_id desc
+    );
+
+-- Superseded: its expression no longer matches the reads' sort key
+drop index if exists raw_enablebanking.idx_raw_transactions_account_date;
@@ -0,0 +1,6 @@
+-- Keep the Enable Banking session each credential was authorized with. Session
+-- details, connection statuses and balances are looked up by it; provider_uid
+-- only names the bank. Credentials stored before have none and must be
+-- reconnected to be looked up again.
+alter table api_credentials
+    add column if not exists session_id varchar;
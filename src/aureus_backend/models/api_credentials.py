@@ -4,6 +4,7 @@ from typing import Optional
 from uuid import UUID
 
 from sqlalchemy import String, DateTime, Integer, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -16,9 +17,13 @@ class ApiCredential(Base):
     user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
     provider: Mapped[str] = mapped_column(String, nullable=False)
     provider_uid: Mapped[str] = mapped_column(String, nullable=False)
+    # Enable Banking session the credential was authorized with (None before migration 011)
+    session_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     access_token: Mapped[str] = mapped_column(String, nullable=False)
     refresh_token: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    status_snapshot: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    status_checked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -38,3 +43,13 @@ class ApiCredential(Base):
             f"provider={self.provider} "
             f"provider_uid={self.provider_uid}>"
         )
+
+def session_id_of(cred: ApiCredential) -> str:
+    """Enable Banking session of a credential, for looking its details up.
+
+    Raises:
+        LookupError: If the credential was stored without one
+    """
+    if cred.session_id is None:
+        raise LookupError("No session stored for this connection, reconnect the bank")
+    return cred.session_id
@@ -0,0 +1,39 @@
+"""SQLAlchemy model for the balance_snapshots table."""
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+class BalanceSnapshot(Base):
+    """Model representing the balances of one account at the time they were fetched."""
+    __tablename__ = "balance_snapshots"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
+    credential_id: Mapped[int] = mapped_column(
+        ForeignKey("api_credentials.id", ondelete="CASCADE"), nullable=False
+    )
+    account_uid: Mapped[str] = mapped_column(String, nullable=False)
+    account_name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    account_iban: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    bank_name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    bank_country: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    balances: Mapped[list] = mapped_column(JSONB, nullable=False)
+    fetched_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=datetime.utcnow
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<BalanceSnapshot id={self.id} "
+            f"user_id={self.user_id} "
+            f"account_uid={self.account_uid} "
+            f"fetched_at={self.fetched_at}>"
+        )
@@ -1,6 +1,11 @@
 """Base SQLAlchemy model for all database models."""
+from sqlalchemy import Column, Table, Uuid
 from sqlalchemy.orm import DeclarativeBase
 
 class Base(DeclarativeBase):
     """Base class for all SQLAlchemy models."""
-    pass 
\ No newline at end of file
+    pass
+
+# Target of the models' `users.id` foreign keys, created by migration 001. Only
+# its key is declared: the ORM needs it to resolve those keys when flushing.
+users = Table("users", Base.metadata, Column("id", Uuid, primary_key=True))
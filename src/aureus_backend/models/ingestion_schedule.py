@@ -0,0 +1,33 @@
+"""SQLAlchemy model for the ingestion_schedule table."""
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+class IngestionSchedule(Base):
+    """Model representing when a user's next scheduled ingestion is due."""
+    __tablename__ = "ingestion_schedule"
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    provider: Mapped[str] = mapped_column(String, primary_key=True)
+    slot_offset: Mapped[int] = mapped_column(Integer, nullable=False)
+    next_run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    lease_owner: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    leased_until: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    last_enqueued_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=datetime.utcnow
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<IngestionSchedule user_id={self.user_id} "
+            f"provider={self.provider} "
+            f"next_run_at={self.next_run_at}>"
+        )
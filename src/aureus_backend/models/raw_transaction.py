@@ -0,0 +1,169 @@
+"""Transactions ingested by dlt into `raw_enablebanking.raw_transactions`.
+
+The table belongs to the ingestion pipeline: dlt creates it and adds columns as
+it sees new fields, flattening nested objects into `parent__child` columns.
+List fields go to nested tables (`raw_transactions__remittance_information`),
+one row per element pointing at its parent row's `_dlt_id`. Only the columns
+reads filter and sort on are declared here.
+"""
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import column, func, literal_column, table
+
+RAW_TRANSACTIONS = table(
+    "raw_transactions",
+    column("user_id"),
+    column("account_uid"),
+    column("transaction_id"),
+    column("booking_date"),
+    column("value_date"),
+    column("credit_debit_indicator"),
+    column("transaction_amount__amount"),
+    column("_dlt_load_id"),
+    column("_dlt_id"),
+    schema="raw_enablebanking"
+)
+
+# Tables dlt creates for list fields are named after the parent table and path
+NESTED_TABLE_PREFIX = "raw_transactions__"
+
+# Booking date, or value date for transactions not booked yet (ISO `YYYY-MM-DD`
+# text). Transactions with neither get an empty string rather than NULL, so they
+# sort after every date in newest-first listings and keysets can compare them. A
+# literal rather than a parameter, so the expression matches the index on it
+TRANSACTION_DATE = func.coalesce(
+    RAW_TRANSACTIONS.c.booking_date, RAW_TRANSACTIONS.c.value_date, literal_column("''")
+)
+
+# Columns kept out of transactions read back from the tables: dlt's bookkeeping
+# and the context ingestion adds to each upstream transaction
+INTERNAL_COLUMNS = frozenset((
+    "_dlt_id",
+    "_dlt_load_id",
+    "_dlt_parent_id",
+    "_dlt_root_id",
+    "_dlt_list_idx",
+    "user_id",
+    "account_uid",
+    "account_name",
+    "account_iban",
+    "transaction_id",
+    "ingested_at",
+))
+
+
+@dataclass
+class TransactionFilters:
+    """Filters of a transaction listing; amounts are absolute, dates inclusive ISO dates."""
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    min_amount: Optional[Decimal] = None
+    max_amount: Optional[Decimal] = None
+    # "CRDT" (money in) or "DBIT" (money out)
+    direction: Optional[str] = None
+
+    def matches(self, transaction: dict) -> bool:
+        """Whether an upstream-shaped transaction passes the filters."""
+        booked = transaction.get("booking_date") or transaction.get("value_date") or ""
+        if self.date_from and booked < self.date_from:
+            return False
+        if self.date_to and booked > self.date_to:
+            return False
+        if self.direction and transaction.get("credit_debit_indicator") != self.direction:
+            return False
+        if self.min_amount is not None or self.max_amount is not None:
+            try:
+                amount = Decimal(transaction["transaction_amount"]["amount"])
+            except (KeyError, TypeError, InvalidOperation):
+                return False
+            if self.min_amount is not None and amount < self.min_amount:
+                return False
+            if self.max_amount is not None and amount > self.max_amount:
+                return False
+        return True
+
+
+def nest_columns(row: dict) -> dict:
+    """Turn a flattened table row back into the upstream transaction shape.
+
+    `transaction_amount__amount` becomes `{"transaction_amount": {"amount": ...}}`.
+    Fields that were null or empty upstream have no column (or no value) and are
+    left out. List fields are added from their nested tables by `attach_nested`.
+    """
+    transaction: dict = {}
+    for name, value in row.items():
+        if name in INTERNAL_COLUMNS or value is None:
+            continue
+        *parents, leaf = name.split("__")
+        target = transaction
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[leaf] = value
+    return transaction
+
+
+@dataclass(frozen=True)
+class NestedTable:
+    """Table holding the elements of a list field, `path` within each `parent` row."""
+    name: str
+    parent: str
+    path: tuple[str, ...]
+    # Lists of plain values keep them in a `value` column; lists of objects are flattened
+    scalar: bool
+
+
+def nested_tables(columns: dict[str, set[str]]) -> list[NestedTable]:
+    """Describe the nested tables of `raw_transactions`, parents before children.
+
+    Args:
+        columns: Column names of each table whose name starts with
+            `NESTED_TABLE_PREFIX`
+    """
+    tables = []
+    for name in sorted(columns, key=len):
+        parent = max(
+            (t.name for t in tables if name.startswith(t.name + "__")),
+            key=len,
+            default="raw_transactions"
+        )
+        tables.append(NestedTable(
+            name=name,
+            parent=parent,
+            path=tuple(name[len(parent) + 2:].split("__")),
+            scalar=columns[name] - INTERNAL_COLUMNS == {"value"}
+        ))
+    return tables
+
+
+def attach_nested(
+    parents: dict[str, dict],
+    table: NestedTable,
+    rows: Iterable[tuple[str, str, dict[str, Any]]]
+) -> dict[str, dict]:
+    """Add rows of a nested table to their parents' lists, in list order.
+
+    Args:
+        parents: Parent elements (transactions or elements of an enclosing
+            list) by their `_dlt_id`
+        table: The nested table
+        rows: `(_dlt_parent_id, _dlt_id, row)` in `_dlt_list_idx` order
+
+    Returns:
+        The added object elements by their `_dlt_id`, for tables nested in `table`
+    """
+    elements = {}
+    for parent_id, element_id, row in rows:
+        parent = parents.get(parent_id)
+        if parent is None:
+            continue
+        *path, leaf = table.path
+        for key in path:
+            parent = parent.setdefault(key, {})
+        if table.scalar:
+            element = row["value"]
+        else:
+            element = elements[element_id] = nest_columns(row)
+        parent.setdefault(leaf, []).append(element)
+    return elements
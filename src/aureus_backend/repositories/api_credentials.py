@@ -3,12 +3,97 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select, and_
+from sqlalchemy import Delete, Insert, Select, and_, delete, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ..models.api_credentials import ApiCredential
 from ..utils.crypto import enc, dec
 
+def _get_stmt(user_id: UUID, provider: str, provider_uid: str) -> Select:
+    return select(ApiCredential).where(
+        and_(
+            ApiCredential.user_id == user_id,
+            ApiCredential.provider == provider,
+            ApiCredential.provider_uid == provider_uid
+        )
+    )
+
+def _list_stmt(user_id: UUID, provider: Optional[str]) -> Select:
+    conditions = [ApiCredential.user_id == user_id]
+    if provider:
+        conditions.append(ApiCredential.provider == provider)
+    return select(ApiCredential).where(and_(*conditions))
+
+def _credential_row(
+    user_id: UUID,
+    provider: str,
+    provider_uid: str,
+    access_token: str,
+    refresh_token: Optional[str],
+    expires_at: datetime,
+    session_id: Optional[str] = None
+) -> dict:
+    """Column values for a credential, with its tokens encrypted."""
+    return {
+        "user_id": user_id,
+        "provider": provider,
+        "provider_uid": provider_uid,
+        "session_id": session_id,
+        "access_token": enc(access_token),
+        "refresh_token": enc(refresh_token) if refresh_token else None,
+        "expires_at": expires_at
+    }
+
+def _upsert_stmt(rows: list[dict]) -> Insert:
+    """Insert credentials, replacing the tokens of existing ones, in a single round trip.
+
+    Rows are de-duplicated on the unique key (the last one wins), as Postgres
+    refuses to update the same row twice in one statement. A row without a
+    session ID keeps the one stored.
+    """
+    unique_rows = {
+        (row["user_id"], row["provider"], row["provider_uid"]): row for row in rows
+    }
+    stmt = insert(ApiCredential).values(list(unique_rows.values()))
+    return (
+        stmt.on_conflict_do_update(
+            constraint="api_credentials_unique",
+            set_={
+                "session_id": func.coalesce(stmt.excluded.session_id, ApiCredential.session_id),
+                "access_token": stmt.excluded.access_token,
+                "refresh_token": stmt.excluded.refresh_token,
+                "expires_at": stmt.excluded.expires_at,
+                "updated_at": func.now()
+            }
+        )
+        .returning(ApiCredential)
+        # Refresh instances already loaded in the session with the stored values
+        .execution_options(populate_existing=True)
+    )
+
+def _get_many_stmt(keys: list[tuple[UUID, str, str]]) -> Select:
+    return select(ApiCredential).where(
+        tuple_(
+            ApiCredential.user_id,
+            ApiCredential.provider,
+            ApiCredential.provider_uid
+        ).in_(keys)
+    )
+
+def _delete_stmt(credential_ids: list[int], user_id: Optional[UUID]) -> Delete:
+    stmt = delete(ApiCredential).where(ApiCredential.id.in_(credential_ids))
+    if user_id is not None:
+        stmt = stmt.where(ApiCredential.user_id == user_id)
+    return stmt
+
+def _snapshot_rows(snapshots: dict[int, dict], checked_at: datetime) -> list[dict]:
+    return [
+        {"id": credential_id, "status_snapshot": snapshot, "status_checked_at": checked_at}
+        for credential_id, snapshot in snapshots.items()
+    ]
+
 class ApiCredentialsRepository:
     def __init__(self, session: Session):
         self.session = session
@@ -20,44 +105,28 @@ class ApiCredentialsRepository:
         provider_uid: str,
         access_token: str,
         refresh_token: Optional[str],
-        expires_at: datetime
+        expires_at: datetime,
+        session_id: Optional[str] = None
     ) -> ApiCredential:
         """Create or update API credentials."""
-        # Encrypt tokens
-        encrypted_access = enc(access_token)
-        encrypted_refresh = enc(refresh_token) if refresh_token else None
-        
-        # Try to find existing credentials
-        stmt = select(ApiCredential).where(
-            and_(
-                ApiCredential.user_id == user_id,
-                ApiCredential.provider == provider,
-                ApiCredential.provider_uid == provider_uid
-            )
+        row = _credential_row(
+            user_id, provider, provider_uid, access_token, refresh_token, expires_at, session_id
         )
-        existing = self.session.execute(stmt).scalar_one_or_none()
-        
-        if existing:
-            # Update existing record
-            existing.access_token = encrypted_access
-            existing.refresh_token = encrypted_refresh
-            existing.expires_at = expires_at
-            existing.updated_at = datetime.utcnow()
-            self.session.flush()
-            return existing
-            
-        # Create new record
-        cred = ApiCredential(
-            user_id=user_id,
-            provider=provider,
-            provider_uid=provider_uid,
-            access_token=encrypted_access,
-            refresh_token=encrypted_refresh,
-            expires_at=expires_at
-        )
-        self.session.add(cred)
-        self.session.flush()
-        return cred
+        return self.session.execute(_upsert_stmt([row])).scalar_one()
+
+    def upsert_many(self, credentials: list[dict]) -> list[ApiCredential]:
+        """Create or update several API credentials in one statement.
+
+        Args:
+            credentials: Dicts with the arguments of `create`
+
+        Returns:
+            The stored credentials
+        """
+        if not credentials:
+            return []
+        rows = [_credential_row(**cred) for cred in credentials]
+        return list(self.session.execute(_upsert_stmt(rows)).scalars().all())
 
     def get(
         self,
@@ -66,44 +135,140 @@ class ApiCredentialsRepository:
         provider_uid: str
     ) -> Optional[ApiCredential]:
         """Get API credentials by user_id, provider and provider_uid."""
-        stmt = select(ApiCredential).where(
-            and_(
-                ApiCredential.user_id == user_id,
-                ApiCredential.provider == provider,
-                ApiCredential.provider_uid == provider_uid
-            )
-        )
+        stmt = _get_stmt(user_id, provider, provider_uid)
         return self.session.execute(stmt).scalar_one_or_none()
 
+    def get_many(self, keys: list[tuple[UUID, str, str]]) -> list[ApiCredential]:
+        """Get API credentials by (user_id, provider, provider_uid), skipping missing ones."""
+        if not keys:
+            return []
+        return list(self.session.execute(_get_many_stmt(keys)).scalars().all())
+
     def list_by_user_provider(
         self,
         user_id: UUID,
         provider: Optional[str] = None
     ) -> list[ApiCredential]:
         """List all API credentials for a user, optionally filtered by provider."""
-        conditions = [ApiCredential.user_id == user_id]
-        if provider:
-            conditions.append(ApiCredential.provider == provider)
-            
-        stmt = select(ApiCredential).where(and_(*conditions))
+        stmt = _list_stmt(user_id, provider)
         return list(self.session.execute(stmt).scalars().all())
 
     def delete(self, credential_id: int, user_id: UUID) -> bool:
         """Delete API credentials by ID, ensuring it belongs to the specified user."""
-        stmt = select(ApiCredential).where(
-            and_(
-                ApiCredential.id == credential_id,
-                ApiCredential.user_id == user_id
-            )
+        return self.delete_many([credential_id], user_id) > 0
+
+    def delete_many(self, credential_ids: list[int], user_id: Optional[UUID] = None) -> int:
+        """Delete API credentials by ID, restricted to `user_id`'s when given.
+
+        Returns:
+            Number of credentials deleted
+        """
+        if not credential_ids:
+            return 0
+        return self.session.execute(_delete_stmt(credential_ids, user_id)).rowcount
+
+    def save_status_snapshots(self, snapshots: dict[int, dict], checked_at: datetime) -> None:
+        """Store the last known connection status for several credentials, keyed by ID."""
+        if not snapshots:
+            return
+        self.session.execute(update(ApiCredential), _snapshot_rows(snapshots, checked_at))
+
+    def decrypt_tokens(self, cred: ApiCredential) -> tuple[str, Optional[str]]:
+        """Decrypt access and refresh tokens from an ApiCredential instance."""
+        return dec(cred.access_token), dec(cred.refresh_token)
+
+class AsyncApiCredentialsRepository:
+    """Same as `ApiCredentialsRepository`, on an `AsyncSession` for request handlers."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(
+        self,
+        user_id: UUID,
+        provider: str,
+        provider_uid: str,
+        access_token: str,
+        refresh_token: Optional[str],
+        expires_at: datetime,
+        session_id: Optional[str] = None
+    ) -> ApiCredential:
+        """Create or update API credentials."""
+        row = _credential_row(
+            user_id, provider, provider_uid, access_token, refresh_token, expires_at, session_id
         )
-        cred = self.session.execute(stmt).scalar_one_or_none()
-        
-        if not cred:
-            return False
-            
-        self.session.delete(cred)
-        self.session.flush()
-        return True
+        result = await self.session.execute(_upsert_stmt([row]))
+        return result.scalar_one()
+
+    async def upsert_many(self, credentials: list[dict]) -> list[ApiCredential]:
+        """Create or update several API credentials in one statement.
+
+        Args:
+            credentials: Dicts with the arguments of `create`
+
+        Returns:
+            The stored credentials
+        """
+        if not credentials:
+            return []
+        rows = [_credential_row(**cred) for cred in credentials]
+        result = await self.session.execute(_upsert_stmt(rows))
+        return list(result.scalars().all())
+
+    async def get(
+        self,
+        user_id: UUID,
+        provider: str,
+        provider_uid: str
+    ) -> Optional[ApiCredential]:
+        """Get API credentials by user_id, provider and provider_uid."""
+        result = await self.session.execute(_get_stmt(user_id, provider, provider_uid))
+        return result.scalar_one_or_none()
+
+    async def get_many(self, keys: list[tuple[UUID, str, str]]) -> list[ApiCredential]:
+        """Get API credentials by (user_id, provider, provider_uid), skipping missing ones."""
+        if not keys:
+            return []
+        result = await self.session.execute(_get_many_stmt(keys))
+        return list(result.scalars().all())
+
+    async def list_by_user_provider(
+        self,
+        user_id: UUID,
+        provider: Optional[str] = None
+    ) -> list[ApiCredential]:
+        """List all API credentials for a user, optionally filtered by provider."""
+        result = await self.session.execute(_list_stmt(user_id, provider))
+        return list(result.scalars().all())
+
+    async def delete(self, credential_id: int, user_id: UUID) -> bool:
+        """Delete API credentials by ID, ensuring it belongs to the specified user."""
+        return await self.delete_many([credential_id], user_id) > 0
+
+    async def delete_many(
+        self,
+        credential_ids: list[int],
+        user_id: Optional[UUID] = None
+    ) -> int:
+        """Delete API credentials by ID, restricted to `user_id`'s when given.
+
+        Returns:
+            Number of credentials deleted
+        """
+        if not credential_ids:
+            return 0
+        result = await self.session.execute(_delete_stmt(credential_ids, user_id))
+        return result.rowcount
+
+    async def save_status_snapshots(
+        self,
+        snapshots: dict[int, dict],
+        checked_at: datetime
+    ) -> None:
+        """Store the last known connection status for several credentials, keyed by ID."""
+        if not snapshots:
+            return
+        await self.session.execute(update(ApiCredential), _snapshot_rows(snapshots, checked_at))
 
     def decrypt_tokens(self, cred: ApiCredential) -> tuple[str, Optional[str]]:
         """Decrypt access and refresh tokens from an ApiCredential instance."""
@@ -0,0 +1,38 @@
+"""Repository for the history of fetched account balances."""
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.balance_snapshot import BalanceSnapshot
+
+class AsyncBalanceSnapshotsRepository:
+    """Stores and reads timestamped snapshots of account balances."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def latest_by_user(self, user_id: UUID) -> list[BalanceSnapshot]:
+        """The most recent snapshot of each of the user's accounts."""
+        stmt = (
+            select(BalanceSnapshot)
+            .where(BalanceSnapshot.user_id == user_id)
+            .order_by(BalanceSnapshot.account_uid, BalanceSnapshot.fetched_at.desc())
+            .distinct(BalanceSnapshot.account_uid)
+        )
+        return list((await self.session.execute(stmt)).scalars().all())
+
+    async def add_many(
+        self,
+        user_id: UUID,
+        snapshots: list[dict],
+        fetched_at: datetime
+    ) -> None:
+        """Record balances fetched at `fetched_at`, one dict of column values per account."""
+        if not snapshots:
+            return
+        await self.session.execute(
+            insert(BalanceSnapshot),
+            [{**snapshot, "user_id": user_id, "fetched_at": fetched_at} for snapshot in snapshots]
+        )
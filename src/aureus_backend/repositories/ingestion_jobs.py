@@ -0,0 +1,221 @@
+"""Repository for managing background ingestion jobs in the database."""
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import Insert, Select, and_, exists, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+
+from ..models.ingestion_job import IngestionJob
+
+# A user has at most one job in these statuses (unique index
+# idx_ingestion_jobs_user_active): runs of the same user share one dlt pipeline
+ACTIVE_STATUSES = ("queued", "running")
+
+def _enqueue_stmt(user_id: UUID, provider: str, full_refresh: bool) -> Insert:
+    """Insert a queued job unless the user already has an active one."""
+    return (
+        insert(IngestionJob)
+        .values(
+            user_id=user_id,
+            provider=provider,
+            status="queued",
+            full_refresh=full_refresh,
+            progress={}
+        )
+        .on_conflict_do_nothing(
+            index_elements=[IngestionJob.user_id],
+            index_where=IngestionJob.status.in_(ACTIVE_STATUSES)
+        )
+        .returning(IngestionJob)
+    )
+
+def _active_stmt(user_id: UUID) -> Select:
+    return select(IngestionJob).where(
+        and_(
+            IngestionJob.user_id == user_id,
+            IngestionJob.status.in_(ACTIVE_STATUSES)
+        )
+    )
+
+def _owned_stmt(job_id: UUID, user_id: UUID) -> Select:
+    return select(IngestionJob).where(
+        and_(
+            IngestionJob.id == job_id,
+            IngestionJob.user_id == user_id
+        )
+    )
+
+class IngestionJobsRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def enqueue(
+        self,
+        user_id: UUID,
+        provider: str,
+        full_refresh: bool = False
+    ) -> tuple[IngestionJob, bool]:
+        """Create a queued ingestion job, unless the user already has an active one.
+
+        Returns:
+            The new job, or the user's queued or running job, and whether it
+            was created
+        """
+        while True:
+            job = self.session.scalars(_enqueue_stmt(user_id, provider, full_refresh)).first()
+            if job is not None:
+                return job, True
+            # The conflicting job may have finished since: insert again then
+            job = self.session.execute(_active_stmt(user_id)).scalar_one_or_none()
+            if job is not None:
+                return job, False
+
+    def get(self, job_id: UUID, user_id: UUID) -> Optional[IngestionJob]:
+        """Get a job by ID, ensuring it belongs to the specified user."""
+        return self.session.execute(_owned_stmt(job_id, user_id)).scalar_one_or_none()
+
+    def list_active_users(self, user_ids: list[UUID], provider: str) -> set[UUID]:
+        """Return which of `user_ids` already have a queued or running job for `provider`."""
+        if not user_ids:
+            return set()
+        stmt = select(IngestionJob.user_id).where(
+            and_(
+                IngestionJob.user_id.in_(user_ids),
+                IngestionJob.provider == provider,
+                IngestionJob.status.in_(ACTIVE_STATUSES)
+            )
+        )
+        return set(self.session.execute(stmt).scalars().all())
+
+    def claim_next(
+        self,
+        worker_id: str,
+        stale_after: timedelta,
+        max_attempts: int
+    ) -> Optional[IngestionJob]:
+        """Claim the oldest runnable job for a worker.
+
+        Runnable jobs are queued ones and running ones whose worker stopped
+        heartbeating (e.g. after a restart), unless another job of the same
+        user is still running with a fresh heartbeat. A stale job that already
+        used `max_attempts` attempts (e.g. one that keeps crashing its worker)
+        is failed instead of being claimed again. `FOR UPDATE SKIP LOCKED`
+        lets concurrent workers claim different jobs without blocking each other.
+        """
+        now = datetime.now(timezone.utc)
+        stale = and_(
+            IngestionJob.status == "running",
+            IngestionJob.heartbeat_at < now - stale_after
+        )
+        self.session.execute(
+            update(IngestionJob)
+            .where(and_(stale, IngestionJob.attempts >= max_attempts))
+            .values(
+                status="failed",
+                error=f"Abandoned after {max_attempts} attempts",
+                finished_at=now
+            )
+        )
+
+        busy = aliased(IngestionJob)
+        stmt = (
+            select(IngestionJob)
+            .where(
+                or_(IngestionJob.status == "queued", stale),
+                ~exists().where(
+                    busy.user_id == IngestionJob.user_id,
+                    busy.id != IngestionJob.id,
+                    busy.status == "running",
+                    busy.heartbeat_at >= now - stale_after
+                )
+            )
+            .order_by(IngestionJob.created_at)
+            .limit(1)
+            .with_for_update(of=IngestionJob, skip_locked=True)
+        )
+        job = self.session.execute(stmt).scalar_one_or_none()
+        if not job:
+            return None
+
+        job.status = "running"
+        job.worker_id = worker_id
+        job.attempts += 1
+        job.heartbeat_at = now
+        job.started_at = job.started_at or now
+        self.session.flush()
+        return job
+
+    def heartbeat(self, job_id: UUID, worker_id: str, progress: dict) -> None:
+        """Record progress and refresh the heartbeat of a job held by `worker_id`."""
+        self.session.execute(
+            update(IngestionJob)
+            .where(and_(IngestionJob.id == job_id, IngestionJob.worker_id == worker_id))
+            .values(progress=progress, heartbeat_at=datetime.now(timezone.utc))
+        )
+
+    def finish(
+        self,
+        job_id: UUID,
+        worker_id: str,
+        progress: dict,
+        error: Optional[str] = None
+    ) -> None:
+        """Mark a job held by `worker_id` as succeeded, or failed when `error` is set."""
+        self.session.execute(
+            update(IngestionJob)
+            .where(and_(IngestionJob.id == job_id, IngestionJob.worker_id == worker_id))
+            .values(
+                status="failed" if error else "succeeded",
+                progress=progress,
+                error=error,
+                finished_at=datetime.now(timezone.utc)
+            )
+        )
+
+class AsyncIngestionJobsRepository:
+    """Request-handler side of `IngestionJobsRepository`, on an `AsyncSession`."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def enqueue(
+        self,
+        user_id: UUID,
+        provider: str,
+        full_refresh: bool = False
+    ) -> tuple[IngestionJob, bool]:
+        """Create a queued ingestion job, unless the user already has an active one.
+
+        Returns:
+            The new job, or the user's queued or running job, and whether it
+            was created
+        """
+        while True:
+            result = await self.session.scalars(_enqueue_stmt(user_id, provider, full_refresh))
+            job = result.first()
+            if job is not None:
+                return job, True
+            # The conflicting job may have finished since: insert again then
+            result = await self.session.execute(_active_stmt(user_id))
+            job = result.scalar_one_or_none()
+            if job is not None:
+                return job, False
+
+    async def get(self, job_id: UUID, user_id: UUID) -> Optional[IngestionJob]:
+        """Get a job by ID, ensuring it belongs to the specified user."""
+        result = await self.session.execute(_owned_stmt(job_id, user_id))
+        return result.scalar_one_or_none()
+
+    async def last_succeeded_at(self, user_id: UUID, provider: str) -> Optional[datetime]:
+        """When the user's latest successful ingestion for `provider` finished, if ever."""
+        stmt = select(func.max(IngestionJob.finished_at)).where(
+            and_(
+                IngestionJob.user_id == user_id,
+                IngestionJob.provider == provider,
+                IngestionJob.status == "succeeded"
+            )
+        )
+        return await self.session.scalar(stmt)
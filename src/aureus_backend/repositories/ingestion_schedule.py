@@ -0,0 +1,117 @@
+"""Repository for the periodic ingestion schedule."""
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import and_, exists, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..models.api_credentials import ApiCredential
+from ..models.ingestion_schedule import IngestionSchedule
+
+class IngestionScheduleRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def _has_active_credentials(self, provider: str, now: datetime):
+        return exists().where(
+            and_(
+                ApiCredential.user_id == IngestionSchedule.user_id,
+                ApiCredential.provider == provider,
+                ApiCredential.expires_at > now
+            )
+        )
+
+    def list_unscheduled_users(self, provider: str, now: datetime) -> list[UUID]:
+        """List users with non-expired credentials for `provider` and no schedule yet."""
+        scheduled = exists().where(
+            and_(
+                IngestionSchedule.user_id == ApiCredential.user_id,
+                IngestionSchedule.provider == provider
+            )
+        )
+        stmt = (
+            select(ApiCredential.user_id)
+            .where(
+                and_(
+                    ApiCredential.provider == provider,
+                    ApiCredential.expires_at > now,
+                    ~scheduled
+                )
+            )
+            .distinct()
+        )
+        return list(self.session.execute(stmt).scalars().all())
+
+    def add(self, provider: str, slots: dict[UUID, tuple[int, datetime]]) -> None:
+        """Schedule users, given their slot offset and first run time.
+
+        Users already scheduled (e.g. by another node) are left untouched.
+        """
+        if not slots:
+            return
+        stmt = insert(IngestionSchedule).values([
+            {
+                "user_id": user_id,
+                "provider": provider,
+                "slot_offset": slot_offset,
+                "next_run_at": next_run_at
+            }
+            for user_id, (slot_offset, next_run_at) in slots.items()
+        ])
+        self.session.execute(stmt.on_conflict_do_nothing())
+
+    def claim_due(
+        self,
+        provider: str,
+        owner: str,
+        now: datetime,
+        interval: timedelta,
+        lease: timedelta,
+        limit: int
+    ) -> list[UUID]:
+        """Lease up to `limit` due users to `owner` and move them to their next slot.
+
+        A user is due when its `next_run_at` has passed, its lease has expired
+        and it still has non-expired credentials. Rows are picked with
+        `FOR UPDATE SKIP LOCKED`, so concurrent nodes claim disjoint users.
+        `next_run_at` advances by whole intervals, keeping each user on its slot.
+        """
+        due = (
+            select(IngestionSchedule.user_id)
+            .where(
+                and_(
+                    IngestionSchedule.provider == provider,
+                    IngestionSchedule.next_run_at <= now,
+                    or_(
+                        IngestionSchedule.leased_until.is_(None),
+                        IngestionSchedule.leased_until < now
+                    ),
+                    self._has_active_credentials(provider, now)
+                )
+            )
+            .order_by(IngestionSchedule.next_run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        interval_seconds = interval.total_seconds()
+        elapsed = func.extract("epoch", now - IngestionSchedule.next_run_at)
+        intervals_behind = func.floor(elapsed / interval_seconds) + 1
+        stmt = (
+            update(IngestionSchedule)
+            .where(
+                and_(
+                    IngestionSchedule.provider == provider,
+                    IngestionSchedule.user_id.in_(due)
+                )
+            )
+            .values(
+                next_run_at=IngestionSchedule.next_run_at
+                + func.make_interval(0, 0, 0, 0, 0, 0, intervals_behind * interval_seconds),
+                lease_owner=owner,
+                leased_until=now + lease,
+                last_enqueued_at=now
+            )
+            .returning(IngestionSchedule.user_id)
+        )
+        return list(self.session.execute(stmt).scalars().all())
@@ -0,0 +1,188 @@
+"""Repository reading the transactions ingested into `raw_enablebanking`."""
+from typing import Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import (
+    Float,
+    Numeric,
+    Row,
+    Select,
+    case,
+    cast,
+    column,
+    exists,
+    func,
+    literal_column,
+    select,
+    table,
+    tuple_,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..clients.cache import TTLCache
+from ..models.raw_transaction import (
+    NESTED_TABLE_PREFIX,
+    RAW_TRANSACTIONS,
+    TRANSACTION_DATE,
+    NestedTable,
+    TransactionFilters,
+    attach_nested,
+    nest_columns,
+    nested_tables,
+)
+
+# Whole row as JSON, so columns dlt adds later are returned without being declared
+_ROW_JSON = literal_column("to_jsonb(raw_transactions)")
+
+# Nested tables appear when dlt first sees a list field: re-read them now and then
+_nested_tables = TTLCache(ttl=300, max_size=1)
+
+_COLUMNS = table(
+    "columns",
+    column("table_schema"),
+    column("table_name"),
+    column("column_name"),
+    schema="information_schema"
+)
+
+# Position of a row in an account's listing order: (date, transaction_id)
+Keyset = tuple[str, str]
+
+def _list_stmt(
+    user_id: UUID,
+    account_uid: str,
+    filters: TransactionFilters,
+    after: Optional[Keyset],
+    limit: int
+) -> Select:
+    t = RAW_TRANSACTIONS
+    stmt = select(TRANSACTION_DATE, t.c.transaction_id, t.c._dlt_id, _ROW_JSON).where(
+        t.c.user_id == str(user_id),
+        t.c.account_uid == account_uid
+    )
+    if filters.date_from:
+        stmt = stmt.where(TRANSACTION_DATE >= filters.date_from)
+    if filters.date_to:
+        stmt = stmt.where(TRANSACTION_DATE <= filters.date_to)
+    if filters.direction:
+        stmt = stmt.where(t.c.credit_debit_indicator == filters.direction)
+    amount = cast(t.c.transaction_amount__amount, Numeric)
+    if filters.min_amount is not None:
+        stmt = stmt.where(amount >= filters.min_amount)
+    if filters.max_amount is not None:
+        stmt = stmt.where(amount <= filters.max_amount)
+    if after is not None:
+        # Row comparison in index column order, so each page is an index range scan
+        stmt = stmt.where(tuple_(TRANSACTION_DATE, t.c.transaction_id) < after)
+    return stmt.order_by(TRANSACTION_DATE.desc(), t.c.transaction_id.desc()).limit(limit)
+
+def _nested_tables_stmt() -> Select:
+    c = _COLUMNS
+    return select(c.c.table_name, c.c.column_name).where(
+        c.c.table_schema == RAW_TRANSACTIONS.schema,
+        c.c.table_name.startswith(NESTED_TABLE_PREFIX, autoescape=True)
+    )
+
+def _nested_rows_stmt(nested: NestedTable, parent_ids: list[str]) -> Select:
+    t = table(
+        nested.name,
+        column("_dlt_parent_id"),
+        column("_dlt_id"),
+        column("_dlt_list_idx"),
+        schema=RAW_TRANSACTIONS.schema
+    )
+    return (
+        select(t.c._dlt_parent_id, t.c._dlt_id, func.to_jsonb(t.table_valued()))
+        .where(t.c._dlt_parent_id.in_(parent_ids))
+        .order_by(t.c._dlt_parent_id, t.c._dlt_list_idx)
+    )
+
+class AsyncTransactionsRepository:
+    """Keyset-paginated reads of a user's ingested transactions, newest first."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def has_account(self, user_id: UUID, account_uid: str) -> bool:
+        """Whether any transaction of the account has been ingested for the user."""
+        t = RAW_TRANSACTIONS
+        stmt = select(
+            exists().where(t.c.user_id == str(user_id), t.c.account_uid == account_uid)
+        )
+        return bool(await self.session.scalar(stmt))
+
+    async def list(
+        self,
+        user_id: UUID,
+        account_uid: str,
+        filters: TransactionFilters,
+        after: Optional[Keyset] = None,
+        limit: int = 100
+    ) -> tuple[list[dict], Optional[Keyset]]:
+        """List an account's transactions matching the filters, in upstream shape.
+
+        Args:
+            user_id: Owner of the transactions
+            account_uid: Account to list
+            filters: Date, amount and direction filters
+            after: Keyset of the last row of the previous page
+            limit: Maximum number of transactions to return
+
+        Returns:
+            The transactions and the keyset to pass as `after` for the next
+            page, or None on the last page
+        """
+        result = await self.session.execute(
+            _list_stmt(user_id, account_uid, filters, after, limit + 1)
+        )
+        rows = result.all()
+        transactions = {row[2]: nest_columns(row[3]) for row in rows[:limit]}
+        await self._attach_lists(transactions)
+        if len(rows) <= limit:
+            return list(transactions.values()), None
+        last = rows[limit - 1]
+        return list(transactions.values()), (last[0], last[1])
+
+    async def _attach_lists(self, transactions: dict[str, dict]) -> None:
+        """Add list fields to transactions (by `_dlt_id`) from the nested tables."""
+        if not transactions:
+            return
+        tables = _nested_tables.get("tables")
+        if tables is None:
+            columns: dict[str, set[str]] = {}
+            for name, column_name in await self.session.execute(_nested_tables_stmt()):
+                columns.setdefault(name, set()).add(column_name)
+            tables = nested_tables(columns)
+            _nested_tables.set("tables", tables)
+
+        elements = {"raw_transactions": transactions}
+        for nested in tables:
+            parents = elements.get(nested.parent)
+            if not parents:
+                continue
+            result = await self.session.execute(_nested_rows_stmt(nested, list(parents)))
+            elements[nested.name] = attach_nested(parents, nested, result.all())
+
+    async def ledger_changes(
+        self,
+        user_id: UUID,
+        after_load_id: Optional[str] = None
+    ) -> Sequence[Row]:
+        """Transactions loaded by ingestion runs after `after_load_id` (all when None).
+
+        Rows are `(key, account_uid, booking_date, signed amount, _dlt_load_id)`:
+        `key` is a 64-bit hash identifying the transaction across loads, the
+        booking date is None for transactions not booked, and debits are negative.
+        """
+        t = RAW_TRANSACTIONS
+        amount = cast(t.c.transaction_amount__amount, Float)
+        stmt = select(
+            func.hashtextextended(func.concat(t.c.account_uid, "/", t.c.transaction_id), 0),
+            t.c.account_uid,
+            t.c.booking_date,
+            case((t.c.credit_debit_indicator == "DBIT", -amount), else_=amount),
+            t.c._dlt_load_id
+        ).where(t.c.user_id == str(user_id))
+        if after_load_id:
+            stmt = stmt.where(t.c._dlt_load_id > after_load_id)
+        return list((await self.session.execute(stmt)).all())
@@ -0,0 +1,142 @@
+"""In-memory, indexed catalog of the ASPSPs (banks) offered by Enable Banking."""
+import asyncio
+from bisect import bisect_left
+from dataclasses import dataclass, field
+import difflib
+import hashlib
+import json
+import logging
+import re
+import time
+from typing import Optional
+import unicodedata
+
+from aureus_backend.clients.enable_banking import AsyncEnableBankingClient
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_SPLIT = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text: str) -> list[str]:
+    """Split text into lowercase, accent-free alphanumeric tokens."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return [token for token in _TOKEN_SPLIT.split(stripped.casefold()) if token]
+
+
+@dataclass
+class CatalogSnapshot:
+    """Immutable view of the ASPSP list with its search indexes."""
+    banks: list[dict]
+    version: str
+    loaded_at: float
+    by_country: dict[str, list[int]] = field(default_factory=dict)
+    # Sorted (token, bank index) pairs; a prefix lookup is a bisect range scan
+    name_tokens: list[tuple[str, int]] = field(default_factory=list)
+    vocabulary: list[str] = field(default_factory=list)
+
+    @classmethod
+    def build(cls, banks: list[dict]) -> "CatalogSnapshot":
+        """Build a snapshot and its indexes from the raw `/aspsps` payload."""
+        banks = sorted(banks, key=lambda bank: (bank.get("name") or "").casefold())
+        payload = json.dumps(banks, sort_keys=True, separators=(",", ":")).encode()
+        snapshot = cls(
+            banks=banks,
+            version=hashlib.sha256(payload).hexdigest()[:16],
+            loaded_at=time.monotonic(),
+        )
+        for index, bank in enumerate(banks):
+            country = (bank.get("country") or "").upper()
+            snapshot.by_country.setdefault(country, []).append(index)
+            for token in set(normalize(bank.get("name") or "")):
+                snapshot.name_tokens.append((token, index))
+        snapshot.name_tokens.sort()
+        snapshot.vocabulary = sorted({token for token, _ in snapshot.name_tokens})
+        return snapshot
+
+    def _prefix_matches(self, prefix: str) -> set[int]:
+        """Indexes of banks having a name token starting with `prefix`."""
+        matches = set()
+        position = bisect_left(self.name_tokens, (prefix, -1))
+        while position < len(self.name_tokens):
+            token, index = self.name_tokens[position]
+            if not token.startswith(prefix):
+                break
+            matches.add(index)
+            position += 1
+        return matches
+
+    def _token_matches(self, token: str) -> set[int]:
+        """Prefix matches for a query token, falling back to close spellings."""
+        matches = self._prefix_matches(token)
+        if matches or len(token) < 3:
+            return matches
+        for candidate in difflib.get_close_matches(token, self.vocabulary, n=5, cutoff=0.75):
+            matches |= self._prefix_matches(candidate)
+        return matches
+
+    def search(self, country: Optional[str] = None, q: Optional[str] = None) -> list[dict]:
+        """Return banks matching the country and every token of the query, by name."""
+        candidates: Optional[set[int]] = None
+        if country:
+            candidates = set(self.by_country.get(country.upper(), ()))
+        for token in normalize(q or ""):
+            matches = self._token_matches(token)
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+        if candidates is None:
+            return self.banks
+        return [self.banks[index] for index in sorted(candidates)]
+
+
+class AspspCatalog:
+    """Caches the Enable Banking ASPSP list in memory and refreshes it in the background.
+
+    Requests are always served from the current snapshot; only the very first
+    lookup waits for the upstream call. A stale snapshot keeps being served while
+    a refresh is in flight or if the upstream call fails.
+    """
+
+    def __init__(self, client: AsyncEnableBankingClient, ttl: float = 3600):
+        """Initialize the catalog.
+
+        Args:
+            client: Shared async Enable Banking client
+            ttl: Seconds after which the snapshot is refreshed
+        """
+        self.client = client
+        self.ttl = ttl
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._lock = asyncio.Lock()
+
+    async def _load(self) -> CatalogSnapshot:
+        banks = await self.client.get_available_aspsps()
+        self._snapshot = CatalogSnapshot.build(banks)
+        logger.info("Loaded %d ASPSPs (version %s)", len(banks), self._snapshot.version)
+        return self._snapshot
+
+    async def refresh(self) -> CatalogSnapshot:
+        """Fetch the ASPSP list upstream and swap in a freshly indexed snapshot."""
+        async with self._lock:
+            return await self._load()
+
+    async def get(self) -> CatalogSnapshot:
+        """Return the current snapshot, loading it on first use."""
+        if self._snapshot is None:
+            async with self._lock:
+                if self._snapshot is None:
+                    await self._load()
+        return self._snapshot
+
+    async def run_refresher(self) -> None:
+        """Refresh the snapshot every `ttl` seconds until cancelled."""
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Failed to refresh ASPSP catalog")
+                await asyncio.sleep(min(self.ttl, 60))
+                continue
+            await asyncio.sleep(self.ttl)
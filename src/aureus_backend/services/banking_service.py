@@ -1,21 +1,22 @@
 from datetime import datetime, timezone, timedelta
-from typing import Optional
+from typing import AsyncIterator, Optional
 
-from aureus_backend.clients.enable_banking import EnableBankingClient
+from aureus_backend.clients.enable_banking import AsyncEnableBankingClient
+from aureus_backend.core import Config
 
 
 class BankingService:
-    def __init__(self):
-        self.client = EnableBankingClient()
+    def __init__(self, client: AsyncEnableBankingClient):
+        self.client = client
         self._app_details = None
-    
+
     async def get_auth_url(self, bank_name: str, bank_country: str) -> dict:
         """Get the authorization URL for a specific bank."""
         if not self._app_details:
-            self._app_details = self.client.get_application_details()
-            
+            self._app_details = await self.client.get_application_details()
+
         redirect_url = self._app_details["redirect_urls"][0]
-        auth_data = self.client.start_authorization(
+        auth_data = await self.client.start_authorization(
             aspsp_name=bank_name,
             aspsp_country=bank_country,
             redirect_url=redirect_url
@@ -24,33 +25,62 @@ class BankingService:
             "auth_url": auth_data["url"],
             "state": auth_data.get("state")
         }
-    
+
     async def create_session(self, auth_code: str) -> dict:
         """Create a new banking session using the authorization code."""
-        return self.client.create_session(auth_code)
-    
+        return await self.client.create_session(auth_code)
+
     async def get_session_details(self, session_id: str) -> dict:
         """Get details for a specific session."""
-        return self.client.get_session(session_id)
-    
+        return await self.client.get_session(session_id)
+
     async def get_account_balances(self, account_uid: str) -> dict:
         """Get balances for a specific account."""
-        return self.client.get_account_balances(account_uid)
-    
+        return await self.client.get_account_balances(account_uid)
+
     async def get_account_transactions(
-        self, 
-        account_uid: str, 
+        self,
+        account_uid: str,
         days_back: int = 90,
         continuation_key: Optional[str] = None
     ) -> dict:
         """Get transactions for a specific account."""
         date_from = (datetime.now(timezone.utc) - timedelta(days=days_back)).date().isoformat()
-        return self.client.get_account_transactions(
+        return await self.client.get_account_transactions(
+            account_uid=account_uid,
+            date_from=date_from,
+            continuation_key=continuation_key
+        )
+
+    async def get_account_transactions_raw(
+        self,
+        account_uid: str,
+        days_back: int = 90,
+        continuation_key: Optional[str] = None
+    ) -> bytes:
+        """Get transactions for a specific account as the upstream JSON body."""
+        date_from = (datetime.now(timezone.utc) - timedelta(days=days_back)).date().isoformat()
+        return await self.client.get_account_transactions_raw(
             account_uid=account_uid,
             date_from=date_from,
             continuation_key=continuation_key
         )
-    
+
+    def iter_account_transaction_pages(
+        self,
+        account_uid: str,
+        days_back: int = 90,
+        continuation_key: Optional[str] = None
+    ) -> AsyncIterator[dict]:
+        """Iterate over all pages of transactions for a specific account."""
+        date_from = (datetime.now(timezone.utc) - timedelta(days=days_back)).date().isoformat()
+        return self.client.iter_transaction_pages(
+            account_uid=account_uid,
+            date_from=date_from,
+            continuation_key=continuation_key,
+            prefetch=Config.transactions_stream_prefetch
+        )
+
     async def get_available_banks(self) -> list:
         """Get list of available banks."""
-        return self.client.get_available_aspsps()
+        return await self.client.get_available_aspsps()
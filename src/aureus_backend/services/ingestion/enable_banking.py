@@ -1,86 +1,409 @@
-import dlt
-from datetime import datetime, timedelta
-from typing import Generator, Any
-from aureus_backend.clients import EnableBankingClient
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+from typing import Generator, Any, Iterable, Optional
+from aureus_backend.clients import EnableBankingClient, UpstreamUnavailableError, aspsp_key
 from aureus_backend.core import Config
+from aureus_backend.models.raw_transaction import NESTED_TABLE_PREFIX
+from aureus_backend.services.ingestion.progress import IngestionProgress
+from aureus_backend.utils.metrics import INGESTION_ROWS, observe_dlt_trace
 
-@dlt.resource(
-    write_disposition="append",
-    name="raw_transactions",
-    primary_key=["entry_reference", "user_id"]
+logger = logging.getLogger(__name__)
+
+# Process-wide cap on upstream calls in flight across all concurrent ingestion runs
+_global_fetch_slots = threading.BoundedSemaphore(Config.ingestion_global_concurrency)
+
+# Marks the end of one account's stream in the page queue, as `(_ACCOUNT_DONE, account_uid)`
+_ACCOUNT_DONE = object()
+
+# Upstream fields that identify a transaction lacking an `entry_reference`; volatile
+# fields such as `status` are left out so a pending transaction keeps its identity
+_IDENTITY_FIELDS = (
+    "transaction_amount",
+    "credit_debit_indicator",
+    "value_date",
+    "transaction_date",
+    "remittance_information",
+    "creditor",
+    "debtor",
+    "creditor_account",
+    "debtor_account",
+    "reference_number",
 )
+
+
+def _fetch(fn, *args, **kwargs):
+    """Call the Enable Banking API while holding one of the global fetch slots."""
+    with _global_fetch_slots:
+        return fn(*args, **kwargs)
+
+
+def _configure_dlt() -> None:
+    """Apply the configured dlt buffer and file rotation sizes and index creation.
+
+    Values already present in the environment (dlt's own configuration
+    mechanism) take precedence.
+    """
+    os.environ.setdefault("DATA_WRITER__BUFFER_MAX_ITEMS", str(Config.ingestion_buffer_max_items))
+    os.environ.setdefault("DATA_WRITER__FILE_MAX_ITEMS", str(Config.ingestion_file_max_items))
+    os.environ.setdefault("DATA_WRITER__FILE_MAX_BYTES", str(Config.ingestion_file_max_bytes))
+    # Materialize the primary key hint as a constraint backing the upsert
+    os.environ.setdefault("DESTINATION__POSTGRES__CREATE_INDEXES", "true")
+
+
+def transaction_id(transaction: dict[str, Any], occurrences: Optional[Counter] = None) -> str:
+    """Stable identity of an upstream transaction within its account.
+
+    The bank's `entry_reference` is used when present; otherwise a SHA-256 of
+    the transaction's identifying fields.
+
+    Two transactions can have all their identifying fields equal (e.g. two
+    identical card payments at the same shop on the same day). Each row must
+    still get its own identity: the upsert merges on it and fails on duplicates
+    within a load. `occurrences` counts the hashes already seen in the
+    account's fetched window; the n-th transaction with a seen hash gets
+    `sha256:<hex>:<n>`. Equal transactions are interchangeable and share their
+    value date, so a window fetches all or none of them and the numbering is
+    stable across runs.
+    """
+    if transaction.get("entry_reference"):
+        return transaction["entry_reference"]
+    identity = {field: transaction.get(field) for field in _IDENTITY_FIELDS}
+    payload = json.dumps(identity, sort_keys=True, separators=(",", ":"), default=str)
+    digest = "sha256:" + hashlib.sha256(payload.encode()).hexdigest()
+    if occurrences is None:
+        return digest
+    occurrences[digest] += 1
+    # The first occurrence keeps the bare hash, so rows loaded before stay matched
+    n = occurrences[digest]
+    return digest if n == 1 else f"{digest}:{n}"
+
+
+def fetch_sessions(
+    client: EnableBankingClient,
+    session_ids: Iterable[str],
+    max_workers: Optional[int] = None
+) -> list[dict]:
+    """Fetch the details of several sessions concurrently.
+
+    Args:
+        client: Initialized Enable Banking client
+        session_ids: IDs of the sessions to fetch
+        max_workers: Per-call concurrency (defaults to the per-user limit)
+
+    Returns:
+        Session details, in the same order as `session_ids`
+    """
+    with ThreadPoolExecutor(max_workers or Config.ingestion_user_concurrency) as executor:
+        return list(executor.map(lambda sid: _fetch(client.get_session, sid), session_ids))
+
+
+def iter_account_transactions(
+    client: EnableBankingClient,
+    account: dict,
+    user_id: str,
+    date_from: str,
+    aspsp: Optional[str] = None,
+    stop: Optional[threading.Event] = None
+) -> Generator[list[dict[str, Any]], None, None]:
+    """Yield each page of transactions for one account, enriched with user context.
+
+    Args:
+        client: Initialized Enable Banking client
+        account: Account entry from the session details
+        user_id: The user ID to associate transactions with
+        date_from: Start date for transactions in ISO format (YYYY-MM-DD)
+        aspsp: Bank identifier used for per-bank rate limits and circuit breaking
+        stop: Optional event that, once set, ends the iteration before the next
+            page is fetched
+    """
+    account_uid = account["uid"]
+    continuation_key = None
+    occurrences: Counter = Counter()
+    while True:
+        if stop is not None and stop.is_set():
+            return
+        response = _fetch(
+            client.get_account_transactions,
+            account_uid=account_uid,
+            date_from=date_from,
+            continuation_key=continuation_key,
+            aspsp=aspsp
+        )
+
+        ingested_at = datetime.utcnow().isoformat()
+        for transaction in response["transactions"]:
+            transaction["transaction_id"] = transaction_id(transaction, occurrences)
+            transaction["user_id"] = user_id
+            transaction["account_uid"] = account_uid
+            transaction["account_name"] = account.get("name")
+            transaction["account_iban"] = account.get("iban")
+            transaction["ingested_at"] = ingested_at
+        yield response["transactions"]
+
+        continuation_key = response.get("continuation_key")
+        if not continuation_key:
+            return
+
+
+def iter_transaction_pages(
+    client: EnableBankingClient,
+    user_id: str,
+    sessions: Iterable[dict],
+    date_from: dict[str, str],
+    max_workers: Optional[int] = None,
+    progress: Optional[IngestionProgress] = None
+) -> Generator[list[dict[str, Any]], None, None]:
+    """Fetch the transactions of all accounts concurrently, yielding pages as they arrive.
+
+    `date_from` maps each account UID to the ISO date its fetch starts at.
+    Completed banks, accounts and pages are counted on `progress` when given.
+    Accounts of a bank whose circuit breaker is open are skipped and reported
+    as errors instead of failing the whole run.
+
+    Accounts are fetched with at most `max_workers` in flight for this user (and
+    at most `Config.ingestion_global_concurrency` upstream calls process-wide).
+    Pages from different accounts are interleaved in no particular order. A small
+    bounded queue sits between fetchers and the consumer, so memory use does not
+    grow with history length.
+    """
+    sessions = list(sessions)
+    accounts = [account for session in sessions for account in session["accounts"]]
+    progress = progress or IngestionProgress()
+    progress.add(accounts_total=len(accounts))
+    progress.add(banks_done=sum(1 for session in sessions if not session["accounts"]))
+    if not accounts:
+        return
+
+    # Accounts still in flight per bank, to know when a bank is done
+    bank_of = {}
+    accounts_left = []
+    for bank, session in enumerate(sessions):
+        accounts_left.append(len(session["accounts"]))
+        for account in session["accounts"]:
+            bank_of[account["uid"]] = bank
+    aspsps = [aspsp_key(session["aspsp"]) for session in sessions]
+
+    workers = max_workers or Config.ingestion_user_concurrency
+    pages: queue.Queue = queue.Queue(maxsize=workers * 2)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(account: dict) -> None:
+        if stop.is_set():
+            # The consumer is gone: don't start fetching accounts still queued
+            return
+        try:
+            pages_iter = iter_account_transactions(
+                client,
+                account,
+                user_id,
+                date_from[account["uid"]],
+                aspsp=aspsps[bank_of[account["uid"]]],
+                stop=stop
+            )
+            for page in pages_iter:
+                if not put(page):
+                    return
+        except UpstreamUnavailableError as e:
+            progress.error(f"Skipped account {account['uid']}: {e}")
+        except Exception as e:
+            put(e)
+        finally:
+            put((_ACCOUNT_DONE, account["uid"]))
+
+    executor = ThreadPoolExecutor(workers)
+    try:
+        for account in accounts:
+            executor.submit(produce, account)
+        remaining = len(accounts)
+        while remaining:
+            item = pages.get()
+            if isinstance(item, tuple) and item[0] is _ACCOUNT_DONE:
+                remaining -= 1
+                bank = bank_of[item[1]]
+                accounts_left[bank] -= 1
+                progress.add(accounts_done=1, banks_done=int(accounts_left[bank] == 0))
+            elif isinstance(item, Exception):
+                progress.error(str(item))
+                raise item
+            else:
+                progress.add(pages_done=1, rows_fetched=len(item))
+                yield item
+    finally:
+        # On error or early close, fetchers stop before their next page and
+        # accounts not started yet are dropped; only calls in flight are awaited
+        stop.set()
+        executor.shutdown(cancel_futures=True)
+
+
 def enable_banking_transactions(
     client: EnableBankingClient,
     user_id: str,
-    lookback_days: int = 90
-) -> Generator[dict[str, Any], None, None]:
+    sessions: list[dict],
+    lookback_days: int = Config.ingestion_lookback_days,
+    overlap_days: int = Config.ingestion_overlap_days,
+    full_refresh: bool = False,
+    progress: Optional[IngestionProgress] = None
+) -> 'dlt.sources.DltResource':
     """Resource that yields Enable Banking transactions with user context.
-    
+
+    Every account of every session is streamed through this single resource,
+    so a whole ingestion run is one extract/normalize/load cycle.
+
+    Fetching is incremental: the latest booking (or value) date seen for each
+    account is kept as a watermark in the resource state, and the next run
+    starts `overlap_days` before it. The state is only committed when the load
+    succeeds, so a failed run is retried from the previous watermark.
+
+    Rows are upserted on (user_id, account_uid, transaction_id), so the overlap
+    window and re-runs update existing transactions instead of duplicating them.
+
     Args:
         client: Initialized Enable Banking client
         user_id: The user ID to associate transactions with
-        lookback_days: How many days of history to fetch
+        sessions: Authorized session details whose accounts should be ingested
+        lookback_days: How many days of history to fetch for accounts without a
+            watermark (or for every account on a full refresh)
+        overlap_days: How many days before the watermark to start fetching from
+        full_refresh: Ignore watermarks and re-fetch the whole lookback window
+        progress: Optional progress tracker updated as pages are fetched
     """
-    # Get all accounts for the user's session
-    session = client.get_session(Config.get_user_session_id(user_id))
-    
-    date_from = (datetime.now() - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
-    
-    for account in session["accounts"]:
-        account_uid = account["uid"]
-        
-        # Paginate through all transactions
-        continuation_key = None
-        while True:
-            response = client.get_account_transactions(
-                account_uid=account_uid,
-                date_from=date_from,
-                continuation_key=continuation_key
-            )
-            
-            # Enrich each transaction with user and account context
-            for transaction in response["transactions"]:
-                transaction["user_id"] = user_id
-                transaction["account_uid"] = account_uid
-                transaction["account_name"] = account.get("name")
-                transaction["account_iban"] = account.get("iban")
-                transaction["ingested_at"] = datetime.utcnow().isoformat()
-                
-                yield transaction
-            
-            # Handle pagination
-            continuation_key = response.get("continuation_key")
-            if not continuation_key:
-                break
-
-def run_enable_banking_pipeline(user_id: str) -> 'dlt.pipeline.LoadInfo':
+    import dlt
+
+    @dlt.resource(
+        write_disposition={"disposition": "merge", "strategy": "upsert"},
+        name="raw_transactions",
+        primary_key=["user_id", "account_uid", "transaction_id"]
+    )
+    def raw_transactions() -> Generator[list[dict[str, Any]], None, None]:
+        watermarks: dict[str, str] = dlt.current.resource_state().setdefault("watermarks", {})
+
+        today = datetime.now(timezone.utc).date()
+        default_from = today - timedelta(days=lookback_days)
+        date_from = {}
+        for session in sessions:
+            for account in session["accounts"]:
+                start = default_from
+                watermark = watermarks.get(account["uid"])
+                if watermark and not full_refresh:
+                    start = date.fromisoformat(watermark) - timedelta(days=overlap_days)
+                date_from[account["uid"]] = start.isoformat()
+
+        for page in iter_transaction_pages(
+            client, user_id, sessions, date_from, progress=progress
+        ):
+            for transaction in page:
+                booked = transaction.get("booking_date") or transaction.get("value_date")
+                account_uid = transaction["account_uid"]
+                if booked and booked > watermarks.get(account_uid, ""):
+                    watermarks[account_uid] = booked
+            yield page
+
+    return raw_transactions()
+
+
+def run_enable_banking_pipeline(
+    user_id: str,
+    sessions: list[dict],
+    client: Optional[EnableBankingClient] = None,
+    full_refresh: bool = False,
+    progress: Optional[IngestionProgress] = None
+) -> 'dlt.pipeline.LoadInfo':
     """Run the Enable Banking pipeline for a specific user.
-    
+
     Args:
         user_id: The user to run the pipeline for
-        
+        sessions: Authorized session details whose accounts should be ingested
+        client: Optional Enable Banking client (a new one is created otherwise)
+        full_refresh: Re-fetch the whole lookback window instead of resuming
+            from each account's watermark
+        progress: Optional progress tracker, updated with rows loaded at the end
+
     Returns:
         LoadInfo containing pipeline run statistics
     """
+    import dlt
+
+    _configure_dlt()
+
     # Initialize pipeline with Supabase destination
     pipeline = dlt.pipeline(
-        pipeline_name=f"enable_banking_{user_id}",
-        destination='postgres',
-        dataset_name="raw_enable_banking",
-        credentials={
-            "connection_string": Config.connection_string
-        }
+        pipeline_name=f"enablebanking_{user_id}",
+        destination=dlt.destinations.postgres(credentials=Config.connection_string),
+        dataset_name="raw_enablebanking"
     )
 
-    # Initialize client with user's credentials
-    client = EnableBankingClient()
-
     # Load data
-    info = pipeline.run(
-        enable_banking_transactions(
-            client=client,
-            user_id=user_id
+    try:
+        info = pipeline.run(
+            enable_banking_transactions(
+                client=client or EnableBankingClient(),
+                user_id=user_id,
+                sessions=sessions,
+                full_refresh=full_refresh,
+                progress=progress
+            )
         )
-    )
-    
+    finally:
+        observe_dlt_trace(pipeline.last_trace)
+
+    index_nested_tables(pipeline)
+
+    rows_loaded = loaded_row_count(info)
+    INGESTION_ROWS.observe(rows_loaded)
+    if progress:
+        progress.set(rows_loaded=rows_loaded)
+
     return info
+
+
+def index_nested_tables(pipeline: 'dlt.Pipeline') -> None:
+    """Index the parent key of the tables dlt creates for list fields.
+
+    Store reads fetch the list elements of a page of transactions by
+    `_dlt_parent_id`, which dlt doesn't index. Those tables appear when a list
+    field is first seen, so this runs after every load; existing indexes make
+    it a no-op.
+    """
+    nested = [
+        name for name in pipeline.default_schema.data_table_names()
+        if name.startswith(NESTED_TABLE_PREFIX)
+    ]
+    if not nested:
+        return
+    try:
+        with pipeline.sql_client() as client:
+            for name in nested:
+                # Postgres truncates identifiers to 63 bytes: keep index names unique
+                digest = hashlib.sha256(name.encode()).hexdigest()[:8]
+                index = client.escape_column_name(f"{name[:44]}_{digest}_parent")
+                client.execute_sql(
+                    f"create index if not exists {index} "
+                    f"on {client.make_qualified_table_name(name)} (_dlt_parent_id)"
+                )
+    except Exception:
+        # Reads still work, only slower: don't fail a run whose data is loaded
+        logger.exception("Failed to index nested transaction tables")
+
+
+def loaded_row_count(info: 'dlt.pipeline.LoadInfo', table_name: str = "raw_transactions") -> int:
+    """Number of rows normalized into `table_name` by the run that produced `info`."""
+    normalize_info = info.pipeline.last_trace.last_normalize_info
+    if normalize_info is None:
+        return 0
+    return normalize_info.row_counts.get(table_name, 0)
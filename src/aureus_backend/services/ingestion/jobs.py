@@ -0,0 +1,192 @@
+"""Background execution of ingestion jobs persisted in Postgres.
+
+Jobs are enqueued by the API and executed by an `IngestionWorkerPool`, either
+inside the API process (started from the app lifespan) or in a dedicated
+process with `python -m aureus_backend.services.ingestion.jobs`.
+"""
+from datetime import timedelta
+import logging
+import os
+import socket
+import threading
+import time
+
+from prometheus_client import start_http_server
+
+from aureus_backend.clients import EnableBankingClient
+from aureus_backend.core import Config
+from aureus_backend.models.ingestion_job import IngestionJob
+from aureus_backend.repositories.api_credentials import ApiCredentialsRepository
+from aureus_backend.repositories.ingestion_jobs import IngestionJobsRepository
+from aureus_backend.services.ingestion.progress import IngestionProgress
+from aureus_backend.utils.dependencies import get_session_factory
+from aureus_backend.utils.metrics import INGESTION_JOB_DURATION, INGESTION_JOBS
+
+logger = logging.getLogger(__name__)
+
+
+def run_ingestion_job(job: IngestionJob, progress: IngestionProgress) -> None:
+    """Ingest Enable Banking data for all banks connected by the job's user.
+
+    Raises:
+        LookupError: If the user has no Enable Banking credentials
+    """
+    from aureus_backend.services.ingestion.enable_banking import (
+        fetch_sessions,
+        run_enable_banking_pipeline,
+    )
+
+    with get_session_factory()() as db_session:
+        credentials = ApiCredentialsRepository(db_session).list_by_user_provider(
+            job.user_id, "enablebanking"
+        )
+    if not credentials:
+        raise LookupError("No Enable Banking credentials found")
+
+    session_ids = []
+    for cred in credentials:
+        if cred.session_id is None:
+            progress.error(f"Skipped bank {cred.provider_uid}: no session stored, reconnect it")
+        else:
+            session_ids.append(cred.session_id)
+
+    client = EnableBankingClient()
+    sessions = [
+        session
+        for session in fetch_sessions(client, session_ids)
+        if session["status"] == "AUTHORIZED"
+    ]
+    progress.set(banks_total=len(sessions))
+
+    run_enable_banking_pipeline(
+        str(job.user_id),
+        sessions,
+        client=client,
+        full_refresh=job.full_refresh,
+        progress=progress
+    )
+
+
+class IngestionWorkerPool:
+    """Pool of worker threads executing queued ingestion jobs.
+
+    Each worker claims the oldest runnable job, runs it while a heartbeat
+    persists its progress every `heartbeat_interval` seconds, and records the
+    outcome. Jobs whose worker stops heartbeating for `stale_after` seconds
+    (crash, restart, deploy) are claimed again by another worker, up to
+    `max_attempts` attempts in total.
+    """
+
+    def __init__(
+        self,
+        workers: int = Config.ingestion_workers,
+        poll_interval: float = Config.ingestion_poll_interval,
+        heartbeat_interval: float = Config.ingestion_heartbeat_interval,
+        stale_after: float = Config.ingestion_job_stale_after,
+        max_attempts: int = Config.ingestion_job_max_attempts
+    ):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = timedelta(seconds=stale_after)
+        self.max_attempts = max_attempts
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._node_id = f"{socket.gethostname()}:{os.getpid()}"
+
+    def start(self) -> None:
+        """Start the worker threads."""
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._work,
+                args=(f"{self._node_id}:{index}",),
+                name=f"ingestion-worker-{index}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 10) -> None:
+        """Ask workers to stop after their current job and wait for them."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+    def _claim(self, worker_id: str):
+        with get_session_factory().begin() as db_session:
+            job = IngestionJobsRepository(db_session).claim_next(
+                worker_id, self.stale_after, self.max_attempts
+            )
+            if job:
+                db_session.expunge(job)
+            return job
+
+    def _work(self, worker_id: str) -> None:
+        while not self._stop.is_set():
+            try:
+                job = self._claim(worker_id)
+            except Exception:
+                logger.exception("Failed to claim an ingestion job")
+                job = None
+            if job is None:
+                self._stop.wait(self.poll_interval)
+                continue
+            self._execute(job, worker_id)
+
+    def _execute(self, job: IngestionJob, worker_id: str) -> None:
+        logger.info("Worker %s running ingestion job %s", worker_id, job.id)
+        progress = IngestionProgress()
+        done = threading.Event()
+
+        def heartbeat() -> None:
+            while not done.wait(self.heartbeat_interval):
+                try:
+                    with get_session_factory().begin() as db_session:
+                        IngestionJobsRepository(db_session).heartbeat(
+                            job.id, worker_id, progress.as_dict()
+                        )
+                except Exception:
+                    logger.exception("Failed to record heartbeat for job %s", job.id)
+
+        heartbeat_thread = threading.Thread(target=heartbeat, daemon=True)
+        heartbeat_thread.start()
+        error = None
+        start = time.perf_counter()
+        try:
+            run_ingestion_job(job, progress)
+        except Exception as e:
+            logger.exception("Ingestion job %s failed", job.id)
+            error = str(e) or type(e).__name__
+        finally:
+            done.set()
+            heartbeat_thread.join()
+
+        status = "failed" if error else "succeeded"
+        INGESTION_JOBS.labels(status).inc()
+        INGESTION_JOB_DURATION.labels(status).observe(time.perf_counter() - start)
+
+        with get_session_factory().begin() as db_session:
+            IngestionJobsRepository(db_session).finish(
+                job.id, worker_id, progress.as_dict(), error=error
+            )
+
+
+def main() -> None:
+    """Run a standalone worker process until interrupted."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    if Config.ingestion_metrics_port:
+        start_http_server(Config.ingestion_metrics_port)
+    pool = IngestionWorkerPool(workers=max(Config.ingestion_workers, 1))
+    pool.start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
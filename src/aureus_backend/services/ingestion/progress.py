@@ -0,0 +1,46 @@
+"""Progress tracking for ingestion runs."""
+import threading
+
+
+class IngestionProgress:
+    """Thread-safe counters describing how far an ingestion run got.
+
+    Ingestion code bumps the counters as banks, accounts and pages complete;
+    the job worker periodically persists `as_dict()` so it can be polled.
+    """
+
+    FIELDS = (
+        "banks_total",
+        "banks_done",
+        "accounts_total",
+        "accounts_done",
+        "pages_done",
+        "rows_fetched",
+        "rows_loaded",
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(self.FIELDS, 0)
+        self._errors: list[str] = []
+
+    def add(self, **increments: int) -> None:
+        """Increment one or more counters."""
+        with self._lock:
+            for name, value in increments.items():
+                self._counters[name] += value
+
+    def set(self, **values: int) -> None:
+        """Overwrite one or more counters."""
+        with self._lock:
+            self._counters.update(values)
+
+    def error(self, message: str) -> None:
+        """Record an error message."""
+        with self._lock:
+            self._errors.append(message)
+
+    def as_dict(self) -> dict:
+        """Snapshot of the counters and errors, suitable for JSON storage."""
+        with self._lock:
+            return {**self._counters, "errors": list(self._errors)}
@@ -0,0 +1,122 @@
+"""Periodic ingestion of every user with connected banks.
+
+Each user gets a fixed slot within the sync interval, derived from a hash of
+their ID plus random jitter, so syncs are spread evenly instead of bursting
+at the top of the hour. Every API node runs a scheduler; due users are leased
+in Postgres before their job is enqueued, so a user is never enqueued twice.
+"""
+from datetime import datetime, timedelta, timezone
+import logging
+import os
+import random
+import socket
+import threading
+import zlib
+from uuid import UUID
+
+from aureus_backend.core import Config
+from aureus_backend.repositories.ingestion_jobs import IngestionJobsRepository
+from aureus_backend.repositories.ingestion_schedule import IngestionScheduleRepository
+from aureus_backend.utils.dependencies import get_session_factory
+
+logger = logging.getLogger(__name__)
+
+PROVIDER = "enablebanking"
+
+
+class IngestionScheduler:
+    """Enqueues incremental ingestion jobs for all users on a fixed cadence."""
+
+    def __init__(
+        self,
+        interval: float = Config.ingestion_schedule_interval,
+        tick: float = Config.ingestion_schedule_tick,
+        jitter: float = Config.ingestion_schedule_jitter,
+        batch_size: int = Config.ingestion_schedule_batch_size
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            interval: Seconds between two syncs of the same user
+            tick: Seconds between two scans for due users
+            jitter: Maximum random delay added to each user's slot
+            batch_size: Maximum users claimed per scan and node
+        """
+        self.interval = timedelta(seconds=interval)
+        self.tick = tick
+        self.jitter = jitter
+        self.batch_size = batch_size
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._thread = None
+
+    def slot_offset(self, user_id: UUID) -> int:
+        """Seconds into each interval at which the user is synced."""
+        interval = int(self.interval.total_seconds())
+        shard = zlib.crc32(user_id.bytes) % interval
+        return int(shard + random.uniform(0, self.jitter)) % interval
+
+    def first_run_at(self, slot_offset: int, now: datetime) -> datetime:
+        """First time strictly after `now` that falls on the given slot."""
+        interval = int(self.interval.total_seconds())
+        epoch = int(now.timestamp())
+        start = epoch - (epoch - slot_offset) % interval + interval
+        return datetime.fromtimestamp(start, tz=timezone.utc)
+
+    def run_once(self) -> list[UUID]:
+        """Schedule new users and enqueue jobs for the due ones.
+
+        Returns:
+            IDs of the users a job was enqueued for
+        """
+        now = datetime.now(timezone.utc)
+        with get_session_factory().begin() as db_session:
+            schedule = IngestionScheduleRepository(db_session)
+            slots = {}
+            for user_id in schedule.list_unscheduled_users(PROVIDER, now):
+                offset = self.slot_offset(user_id)
+                slots[user_id] = (offset, self.first_run_at(offset, now))
+            schedule.add(PROVIDER, slots)
+
+        with get_session_factory().begin() as db_session:
+            due = IngestionScheduleRepository(db_session).claim_due(
+                PROVIDER,
+                self.owner,
+                now,
+                interval=self.interval,
+                lease=timedelta(seconds=Config.ingestion_job_stale_after),
+                limit=self.batch_size
+            )
+            jobs = IngestionJobsRepository(db_session)
+            # Skip users whose previous (or a manually requested) sync is still pending
+            active = jobs.list_active_users(due, PROVIDER)
+            enqueued = []
+            for user_id in due:
+                # enqueue also loses gracefully to a job requested meanwhile
+                if user_id not in active and jobs.enqueue(user_id=user_id, provider=PROVIDER)[1]:
+                    enqueued.append(user_id)
+
+        if enqueued:
+            logger.info("Scheduled ingestion for %d users", len(enqueued))
+        return enqueued
+
+    def start(self) -> None:
+        """Start scanning for due users in a background thread."""
+        self._thread = threading.Thread(target=self._run, name="ingestion-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10) -> None:
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        # Stagger nodes so their scans don't line up
+        self._stop.wait(random.uniform(0, self.tick))
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Ingestion scheduler run failed")
+            self._stop.wait(self.tick)
@@ -0,0 +1,282 @@
+"""Daily balance and net-worth time series, computed with NumPy.
+
+Each account's balance is known at one point in time: its latest balance
+snapshot (the anchor). Booked transactions are summed per account and day into
+a dense (accounts x days) matrix; its cumulative sum along the days gives every
+day's balance relative to the anchor day in one vectorized pass:
+
+    balance(day) = anchor_amount + cumsum(day) - cumsum(anchor_day)
+
+The matrix (the `Ledger`) is cached per user and updated incrementally: only
+transactions loaded by ingestion runs newer than the ledger's last `_dlt_load_id`
+are fetched, and rows that were re-loaded replace their previous contribution.
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal, InvalidOperation
+from typing import Optional, Sequence
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from aureus_backend.clients.cache import TTLCache
+from aureus_backend.core import Config
+from aureus_backend.models.balance_snapshot import BalanceSnapshot
+from aureus_backend.repositories.balance_snapshots import AsyncBalanceSnapshotsRepository
+from aureus_backend.repositories.transactions import AsyncTransactionsRepository
+from aureus_backend.utils.metrics import register_cache
+
+# Balance types used as anchors, most preferred first: booked balances match the
+# booked transactions applied around them
+_BALANCE_PREFERENCE = ("CLBD", "ITBD", "OPBD", "XPCD", "CLAV", "ITAV")
+
+# Ledgers by user ID; entries only need to outlive a dashboard session
+_ledgers = TTLCache(ttl=Config.net_worth_cache_ttl, max_size=Config.net_worth_cache_size)
+register_cache("net_worth_ledgers", _ledgers)
+
+
+def _days(values) -> np.ndarray:
+    """ISO dates (or None) as days since 1970-01-01; NaT becomes the int64 minimum."""
+    return np.array(values, dtype="datetime64[D]").astype(np.int64)
+
+
+_NAT = np.datetime64("NaT", "D").astype(np.int64)
+
+
+@dataclass(frozen=True)
+class Ledger:
+    """Booked transaction amounts of a user's accounts, summed per account and day.
+
+    `keys` (sorted) identify the transactions applied, with their account row,
+    day and signed amount alongside, so a re-loaded transaction can take its
+    previous contribution back.
+    """
+    load_id: str
+    accounts: tuple[str, ...]
+    first_day: int
+    buckets: np.ndarray
+    keys: np.ndarray
+    key_rows: np.ndarray
+    key_days: np.ndarray
+    key_amounts: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "Ledger":
+        return cls(
+            load_id="",
+            accounts=(),
+            first_day=0,
+            buckets=np.zeros((0, 0)),
+            keys=np.zeros(0, dtype=np.int64),
+            key_rows=np.zeros(0, dtype=np.int64),
+            key_days=np.zeros(0, dtype=np.int64),
+            key_amounts=np.zeros(0),
+        )
+
+    def apply(
+        self,
+        keys: np.ndarray,
+        account_uids: Sequence[str],
+        days: np.ndarray,
+        amounts: np.ndarray,
+        load_id: str
+    ) -> "Ledger":
+        """Return a new ledger with transactions (new or re-loaded) applied.
+
+        Args:
+            keys: int64 identity of each transaction within the user's data
+            account_uids: Account of each transaction
+            days: Booking day of each transaction (days since epoch), or NaT
+                for one no longer booked, which is only removed
+            amounts: Signed amount of each transaction (debits negative)
+            load_id: Highest `_dlt_load_id` among the transactions
+        """
+        if len(keys) == 0:
+            return self
+
+        # Account rows: existing accounts keep theirs, new ones are appended
+        uids, inverse = np.unique(np.asarray(account_uids, dtype=str), return_inverse=True)
+        accounts = list(self.accounts)
+        index = {uid: row for row, uid in enumerate(accounts)}
+        for uid in uids:
+            if uid not in index:
+                index[uid] = len(accounts)
+                accounts.append(str(uid))
+        rows = np.array([index[uid] for uid in uids], dtype=np.int64)[inverse]
+
+        # Previous contributions of transactions loaded again
+        positions = np.searchsorted(self.keys, keys)
+        in_range = positions < len(self.keys)
+        replaced = np.zeros(len(keys), dtype=bool)
+        replaced[in_range] = self.keys[positions[in_range]] == keys[in_range]
+        old = positions[replaced]
+
+        # The day range only grows: re-booked transactions may leave days at its
+        # ends empty, but the existing matrix must still fit in the new one
+        booked = days != _NAT
+        first_day = self.first_day
+        last_day = self.first_day + (self.buckets.shape[1] if self.buckets.size else 0) - 1
+        if booked.any():
+            new_first, new_last = int(days[booked].min()), int(days[booked].max())
+            if self.buckets.size:
+                first_day, last_day = min(first_day, new_first), max(last_day, new_last)
+            else:
+                first_day, last_day = new_first, new_last
+        n_days = last_day - first_day + 1
+
+        # Grow the matrix to the new accounts and day range, then move the old
+        # contributions out and the new ones in with flat-index bincounts
+        buckets = np.zeros((len(accounts), n_days))
+        if self.buckets.size:
+            offset = self.first_day - first_day
+            buckets[:self.buckets.shape[0], offset:offset + self.buckets.shape[1]] = self.buckets
+        flat_size = buckets.size
+        if flat_size:
+            delta = np.bincount(
+                rows[booked] * n_days + (days[booked] - first_day),
+                weights=amounts[booked],
+                minlength=flat_size
+            )
+            delta -= np.bincount(
+                self.key_rows[old] * n_days + (self.key_days[old] - first_day),
+                weights=self.key_amounts[old],
+                minlength=flat_size
+            )
+            buckets += delta.reshape(buckets.shape)
+
+        # Keep the per-transaction arrays sorted by key
+        kept = np.ones(len(self.keys), dtype=bool)
+        kept[old] = False
+        merged_keys = np.concatenate((self.keys[kept], keys[booked]))
+        order = np.argsort(merged_keys, kind="stable")
+        return Ledger(
+            load_id=max(self.load_id, load_id),
+            accounts=tuple(accounts),
+            first_day=first_day,
+            buckets=buckets,
+            keys=merged_keys[order],
+            key_rows=np.concatenate((self.key_rows[kept], rows[booked]))[order],
+            key_days=np.concatenate((self.key_days[kept], days[booked]))[order],
+            key_amounts=np.concatenate((self.key_amounts[kept], amounts[booked]))[order],
+        )
+
+
+@dataclass(frozen=True)
+class Anchor:
+    """Known balance of an account at the end of `day` (days since epoch)."""
+    account_uid: str
+    day: int
+    amount: float
+    currency: str
+
+
+def anchor_from_snapshot(snapshot: BalanceSnapshot) -> Optional[Anchor]:
+    """Pick the balance of a snapshot to anchor the account's series on."""
+    entries = {entry.get("balance_type"): entry for entry in snapshot.balances or []}
+    balance_type = next((t for t in _BALANCE_PREFERENCE if t in entries), None)
+    entry = entries[balance_type] if balance_type else next(iter(entries.values()), None)
+    if entry is None:
+        return None
+    try:
+        amount = Decimal(entry["balance_amount"]["amount"])
+    except (KeyError, TypeError, InvalidOperation):
+        return None
+    reference = entry.get("reference_date")
+    day = date.fromisoformat(reference) if reference else snapshot.fetched_at.date()
+    if balance_type == "OPBD":
+        # An opening balance is the previous day's closing balance
+        day -= timedelta(days=1)
+    return Anchor(
+        account_uid=snapshot.account_uid,
+        day=(day - date(1970, 1, 1)).days,
+        amount=float(amount),
+        currency=entry["balance_amount"].get("currency", ""),
+    )
+
+
+def balance_series(ledger: Ledger, anchors: list[Anchor], days: np.ndarray) -> np.ndarray:
+    """Daily end-of-day balances, one row per anchor and one column per day.
+
+    Accounts without transactions in the ledger keep their anchor amount.
+    """
+    n_days = ledger.buckets.shape[1] if ledger.buckets.size else 0
+    # Cumulative sums with a leading zero column, so days before the ledger map to 0
+    cumulative = np.zeros((len(ledger.accounts) + 1, n_days + 1))
+    if n_days:
+        np.cumsum(ledger.buckets, axis=1, out=cumulative[:-1, 1:])
+    # Accounts missing from the ledger use the last, all-zero row
+    rows = {uid: row for row, uid in enumerate(ledger.accounts)}
+    anchor_rows = np.array([rows.get(a.account_uid, -1) for a in anchors], dtype=np.int64)
+    anchor_days = np.array([a.day for a in anchors], dtype=np.int64)
+    anchor_amounts = np.array([a.amount for a in anchors])
+
+    def columns(day_values: np.ndarray) -> np.ndarray:
+        return np.clip(day_values - ledger.first_day + 1, 0, n_days)
+
+    at_anchor = cumulative[anchor_rows, columns(anchor_days)]
+    at_days = cumulative[anchor_rows[:, None], columns(days)[None, :]]
+    return anchor_amounts[:, None] + at_days - at_anchor[:, None]
+
+
+class NetWorthService:
+    """Builds balance and net-worth series from ingested transactions and balance snapshots."""
+
+    def __init__(self, session: AsyncSession):
+        self.transactions = AsyncTransactionsRepository(session)
+        self.snapshots = AsyncBalanceSnapshotsRepository(session)
+
+    async def ledger(self, user_id: UUID) -> Ledger:
+        """The user's cached ledger, brought up to date with newly loaded transactions."""
+        ledger = _ledgers.get(user_id) or Ledger.empty()
+        rows = await self.transactions.ledger_changes(user_id, after_load_id=ledger.load_id)
+        if rows:
+            keys, account_uids, booking_dates, amounts, load_ids = zip(*rows)
+            ledger = ledger.apply(
+                np.array(keys, dtype=np.int64),
+                account_uids,
+                _days(booking_dates),
+                np.array(amounts, dtype=np.float64),
+                max(load_ids),
+            )
+        _ledgers.set(user_id, ledger)
+        return ledger
+
+    async def series(self, user_id: UUID, start: date, end: date) -> dict:
+        """Daily balances per account and net worth per currency from `start` to `end`.
+
+        Returns:
+            `dates`, `net_worth` (currency -> daily totals), `accounts` (one
+            series per account with a balance snapshot) and `unanchored` (UIDs
+            of ingested accounts without one, left out of the totals)
+        """
+        ledger = await self.ledger(user_id)
+        anchors = [
+            anchor for anchor in map(
+                anchor_from_snapshot, await self.snapshots.latest_by_user(user_id)
+            )
+            if anchor is not None
+        ]
+        days = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+        balances = balance_series(ledger, anchors, days.astype(np.int64))
+
+        currencies = np.array([anchor.currency for anchor in anchors], dtype=object)
+        net_worth = {
+            currency: balances[currencies == currency].sum(axis=0).round(2)
+            for currency in sorted(set(currencies))
+        }
+        anchored = {anchor.account_uid for anchor in anchors}
+        return {
+            "dates": np.datetime_as_string(days).tolist(),
+            "net_worth": net_worth,
+            "accounts": [
+                {
+                    "account_uid": anchor.account_uid,
+                    "currency": anchor.currency,
+                    "anchored_on": str(np.datetime64(anchor.day, "D")),
+                    "balances": row.round(2)
+                }
+                for anchor, row in zip(anchors, balances)
+            ],
+            "unanchored": [uid for uid in ledger.accounts if uid not in anchored]
+        }
@@ -0,0 +1,149 @@
+"""Response compression negotiated from `Accept-Encoding` (brotli, then gzip).
+
+Brotli is used when the optional `brotli` package is installed and the client
+accepts it. Bodies below the minimum size, responses that already carry a
+`Content-Encoding` and non-compressible media types are sent unchanged.
+Streamed responses are compressed incrementally and flushed after each chunk,
+so clients still see data as soon as it is written.
+"""
+import zlib
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # Optional dependency: fall back to gzip only
+    brotli = None
+
+_COMPRESSIBLE_TYPES = (
+    b"application/json",
+    b"application/x-ndjson",
+    b"application/problem+json",
+    b"application/javascript",
+    b"application/xml",
+    b"text/",
+)
+
+
+def _accepted_encodings(scope) -> dict[str, float]:
+    """Encodings accepted by the client, with their q-values."""
+    header = b",".join(value for name, value in scope["headers"] if name == b"accept-encoding")
+    accepted = {}
+    for item in header.decode("latin-1").split(","):
+        coding, _, params = item.strip().partition(";")
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.lower()] = quality
+    return accepted
+
+
+def choose_encoding(scope) -> Optional[str]:
+    """`br` or `gzip` for this request, or None to send the response as is."""
+    accepted = _accepted_encodings(scope)
+    for coding in ("br", "gzip"):
+        if coding == "br" and brotli is None:
+            continue
+        if accepted.get(coding, accepted.get("*", 0)) > 0:
+            return coding
+    return None
+
+
+class _Compressor:
+    """Incremental gzip or brotli encoder with an explicit flush."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self._brotli is not None:
+            chunk = self._brotli.process(data)
+            return chunk + (self._brotli.finish() if final else self._brotli.flush())
+        chunk = self._zlib.compress(data)
+        return chunk + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing response bodies of at least `minimum_size` bytes."""
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[dict] = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = dict(message.get("headers", []))
+                content_type = headers.get(b"content-type", b"")
+                passthrough = (
+                    b"content-encoding" in headers
+                    or not content_type.startswith(_COMPRESSIBLE_TYPES)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    # Held back until the first body chunk shows whether to compress
+                    start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                compressed = compressor.compress(body, final=not more_body)
+                vary = [b"Accept-Encoding"]
+                headers = []
+                for name, value in start_message.get("headers", []):
+                    if name == b"vary":
+                        vary.insert(0, value)
+                    elif name != b"content-length":
+                        headers.append((name, value))
+                headers.append((b"content-encoding", encoding.encode()))
+                headers.append((b"vary", b", ".join(vary)))
+                if not more_body:
+                    headers.append((b"content-length", str(len(compressed)).encode()))
+                await send({**start_message, "headers": headers})
+            else:
+                compressed = compressor.compress(body, final=not more_body)
+            await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
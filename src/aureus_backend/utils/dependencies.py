@@ -1,65 +1,168 @@
 """FastAPI dependency utilities."""
-from typing import Generator
-from uuid import UUID
+from functools import lru_cache
+import hashlib
+import time
+from typing import AsyncGenerator
+from uuid import UUID, uuid4
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
 import jwt
 
+from ..clients import AsyncEnableBankingClient
+from ..clients.cache import TTLCache
 from ..core.config import Config
+from ..services.aspsp_catalog import AspspCatalog
+from ..services.banking_service import BankingService
+from .metrics import TimedAsyncQueuePool, TimedQueuePool, instrument_pool, register_cache
+from .profiling import instrument_engine
 
-# Create database engine with Supabase-specific settings
-engine = create_engine(
-    Config.connection_string,
-    echo=Config.ENVIRONMENT == "development",
-    pool_size=5,
-    max_overflow=10,
-    connect_args={
-        "sslmode": "require"  # Required for Supabase
-    },
-    # Disable prepared statements as they are not supported in transaction mode
-    execution_options={
-        "prepared_statement_cache_size": 0
-    }
-)
+# Engines are created on first use, so importing the app stays cheap and a
+# missing database secret only fails the code paths that touch the database.
 
-# Create session factory
-SessionLocal = sessionmaker(
-    engine,
-    expire_on_commit=False
-)
+@lru_cache(maxsize=1)
+def get_engine() -> Engine:
+    """Get the sync database engine with Supabase-specific settings."""
+    engine = create_engine(
+        Config.connection_string,
+        echo=Config.ENVIRONMENT == "development",
+        poolclass=TimedQueuePool,
+        pool_size=5,
+        max_overflow=10,
+        connect_args={
+            "sslmode": "require"  # Required for Supabase
+        },
+        # Disable prepared statements as they are not supported in transaction mode
+        execution_options={
+            "prepared_statement_cache_size": 0
+        }
+    )
+    instrument_pool(engine, TimedQueuePool.engine_label)
+    if Config.profiling_enabled:
+        instrument_engine(engine)
+    return engine
+
+@lru_cache(maxsize=1)
+def get_session_factory() -> sessionmaker[Session]:
+    """Get the sync session factory, used by background workers."""
+    return sessionmaker(
+        get_engine(),
+        expire_on_commit=False
+    )
+
+@lru_cache(maxsize=1)
+def get_async_engine() -> AsyncEngine:
+    """Get the async engine for request handlers, so DB calls don't hold threadpool slots.
+
+    The pooler runs in transaction mode: prepared statements may land on another
+    backend, so asyncpg's statement cache is off and statement names are unique.
+    """
+    engine = create_async_engine(
+        Config.async_connection_string,
+        echo=Config.ENVIRONMENT == "development",
+        poolclass=TimedAsyncQueuePool,
+        pool_size=5,
+        max_overflow=10,
+        connect_args={
+            "ssl": "require",  # Required for Supabase
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__"
+        }
+    )
+    instrument_pool(engine.sync_engine, TimedAsyncQueuePool.engine_label)
+    if Config.profiling_enabled:
+        instrument_engine(engine.sync_engine)
+    return engine
+
+@lru_cache(maxsize=1)
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Get the async session factory."""
+    return async_sessionmaker(
+        get_async_engine(),
+        expire_on_commit=False
+    )
+
+async def dispose_engines() -> None:
+    """Close the pooled connections of the engines created so far."""
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+    if get_engine.cache_info().currsize:
+        get_engine().dispose()
 
 # JWT auth scheme
 auth_scheme = HTTPBearer()
 
-def get_db_session() -> Generator[Session, None, None]:
-    """Get a database session for the request."""
-    session = SessionLocal()
-    try:
-        yield session
-        session.commit()
-    except Exception:
-        session.rollback()
-        raise
-    finally:
-        session.close()
-
-def get_current_user(
+# User IDs of already verified bearer tokens, keyed by the token's SHA-256 digest
+verified_tokens = TTLCache(
+    ttl=Config.auth_token_cache_max_ttl,
+    max_size=Config.auth_token_cache_size
+)
+register_cache("auth_tokens", verified_tokens)
+
+async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """Get an async database session for the request."""
+    async with get_async_session_factory()() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+def get_enable_banking_client(request: Request) -> AsyncEnableBankingClient:
+    """Get the process-wide async Enable Banking client created in the app lifespan."""
+    return request.app.state.enable_banking_client
+
+def get_banking_service(
+    client: AsyncEnableBankingClient = Depends(get_enable_banking_client)
+) -> BankingService:
+    """Get a banking service bound to the shared async Enable Banking client."""
+    return BankingService(client)
+
+def get_aspsp_catalog(request: Request) -> AspspCatalog:
+    """Get the process-wide ASPSP catalog created in the app lifespan."""
+    return request.app.state.aspsp_catalog
+
+async def get_current_user(
     auth: HTTPAuthorizationCredentials = Depends(auth_scheme)
 ) -> UUID:
-    """Get the current authenticated user's ID from the JWT token."""
+    """Get the current authenticated user's ID from the JWT token.
+
+    Verified tokens are cached until their `exp`, so repeated requests with
+    the same token skip signature verification.
+    """
+    digest = hashlib.sha256(auth.credentials.encode()).digest()
+    user_id = verified_tokens.get(digest)
+    if user_id is not None:
+        return user_id
+
     try:
         payload = jwt.decode(
             auth.credentials,
             Config.jwt_secret,
-            algorithms=["HS256"]
+            algorithms=["HS256"],
+            audience=Config.jwt_audience
         )
-        return UUID(payload["sub"])
+        user_id = UUID(payload["sub"])
     except (jwt.InvalidTokenError, KeyError, ValueError) as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication token",
             headers={"WWW-Authenticate": "Bearer"}
         ) from e
+
+    # Tokens without an expiry are not cached, as they would never be re-checked
+    if "exp" in payload:
+        ttl = min(payload["exp"] - time.time(), verified_tokens.ttl)
+        if ttl > 0:
+            verified_tokens.set(digest, user_id, ttl=ttl)
+    return user_id
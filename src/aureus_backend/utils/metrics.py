@@ -0,0 +1,216 @@
+"""Prometheus metrics for the API, upstream calls, the database and ingestion.
+
+Metrics live in the default `prometheus_client` registry and are exposed by
+the API at `/metrics`; standalone ingestion workers can serve them with
+`start_http_server`.
+"""
+import asyncio
+import re
+import time
+from typing import Any, Optional
+
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY
+from prometheus_client.core import CounterMetricFamily
+from sqlalchemy import Engine, event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from .profiling import record_timing
+
+# Latency buckets (seconds) shared by request-level histograms
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "API request latency by route",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+
+UPSTREAM_REQUEST_DURATION = Histogram(
+    "enable_banking_request_duration_seconds",
+    "Enable Banking API call latency per attempt, by endpoint, bank and status",
+    ["method", "endpoint", "aspsp", "status"],
+    buckets=LATENCY_BUCKETS
+)
+
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total",
+    "Connections checked out of the pool",
+    ["engine"]
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+DB_POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "Connections currently checked out of the pool",
+    ["engine"]
+)
+
+DLT_STEP_DURATION = Histogram(
+    "ingestion_dlt_step_duration_seconds",
+    "Duration of dlt pipeline steps per ingestion run",
+    ["step"],
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 900.0)
+)
+INGESTION_ROWS = Histogram(
+    "ingestion_rows_loaded",
+    "Rows loaded per ingestion run",
+    buckets=(0, 10, 100, 500, 1_000, 5_000, 10_000, 50_000, 100_000)
+)
+INGESTION_JOBS = Counter(
+    "ingestion_jobs_total",
+    "Finished ingestion jobs by outcome",
+    ["status"]
+)
+INGESTION_JOB_DURATION = Histogram(
+    "ingestion_job_duration_seconds",
+    "Wall time of ingestion jobs",
+    ["status"],
+    buckets=(1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 900.0, 1800.0, 3600.0)
+)
+
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay of the event loop in running a scheduled callback",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+)
+
+# IDs in upstream paths, replaced so endpoints have a bounded number of label values
+_PATH_IDS = re.compile(r"^/(sessions|accounts)/[^/]+")
+
+
+def upstream_endpoint(path: str) -> str:
+    """Endpoint template of an upstream path, e.g. `/accounts/{id}/balances`."""
+    return _PATH_IDS.sub(r"/\1/{id}", path)
+
+
+def observe_upstream_call(
+    method: str,
+    path: str,
+    aspsp: Optional[str],
+    status: str,
+    duration: float
+) -> None:
+    """Record one attempt of an Enable Banking API call."""
+    endpoint = upstream_endpoint(path)
+    UPSTREAM_REQUEST_DURATION.labels(method, endpoint, aspsp or "", status).observe(duration)
+    record_timing("upstream", f"{method} {endpoint} {status}", duration)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording the latency of each request by route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the scope; unmatched paths
+            # share one label so random URLs don't create new series
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"], getattr(route, "path", "unmatched"), status
+            ).observe(time.perf_counter() - start)
+
+
+class _TimedPoolMixin:
+    """Pool recording how long callers wait for a connection."""
+
+    engine_label = ""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.labels(self.engine_label).observe(time.perf_counter() - start)
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    engine_label = "sync"
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    engine_label = "async"
+
+
+def instrument_pool(engine: Engine, label: str) -> None:
+    """Count connection checkouts and connections in use of an engine's pool.
+
+    Listeners go on the engine rather than the pool classes: SQLAlchemy can't
+    attach class-level pool listeners to async-adapted pools.
+    """
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.labels(label).inc()
+        DB_POOL_IN_USE.labels(label).inc()
+
+    def on_checkin(dbapi_connection, connection_record):
+        DB_POOL_IN_USE.labels(label).dec()
+
+    event.listen(engine, "checkout", on_checkout)
+    event.listen(engine, "checkin", on_checkin)
+
+
+def observe_dlt_trace(trace) -> None:
+    """Record the duration of each step (extract, normalize, load) of a dlt run."""
+    if trace is None:
+        return
+    for step in trace.steps:
+        if step.step in ("extract", "normalize", "load") and step.finished_at:
+            duration = (step.finished_at - step.started_at).total_seconds()
+            DLT_STEP_DURATION.labels(step.step).observe(duration)
+
+
+async def monitor_event_loop_lag(interval: float) -> None:
+    """Measure how late the event loop wakes up from a sleep, until cancelled."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(loop.time() - start - interval, 0.0))
+
+
+class _CacheCollector:
+    """Exposes the hit and miss counters of registered caches."""
+
+    def __init__(self):
+        self.caches: dict[str, Any] = {}
+
+    def collect(self):
+        hits = CounterMetricFamily("cache_hits", "Cache lookups served", labels=["cache"])
+        misses = CounterMetricFamily("cache_misses", "Cache lookups missed", labels=["cache"])
+        for name, cache in self.caches.items():
+            hits.add_metric([name], cache.hits)
+            misses.add_metric([name], cache.misses)
+        yield hits
+        yield misses
+
+
+_cache_collector = _CacheCollector()
+REGISTRY.register(_cache_collector)
+
+
+def register_cache(name: str, cache) -> None:
+    """Expose a `TTLCache`'s hit and miss counters as `cache_hits_total{cache=name}`."""
+    _cache_collector.caches[name] = cache
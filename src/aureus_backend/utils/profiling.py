@@ -0,0 +1,302 @@
+"""Opt-in profiling of individual API requests.
+
+A request is profiled when `Config.profiling_enabled` is set and either it
+carries a valid signed `X-Profile` header, or it is picked at random at
+`Config.profiling_sample_rate`. Requests that are not picked only pay for a
+header lookup; with profiling disabled the middleware is not installed at all.
+
+Profiles are collected by a statistical sampler thread. Samples from the event
+loop are kept while it runs one of the request's tasks; samples from worker
+threads are kept while they run work submitted from the request's context
+(sync routes and dependencies in the threadpool). Upstream calls and database
+queries made on behalf of the request are timed through a context variable.
+
+The profile is written to `Config.profiling_dir` as JSON (summary and timings)
+and folded stacks (for flamegraph.pl or speedscope), or, when the signed
+request also sends `X-Profile-Inline: 1`, returned instead of the response.
+
+Sign a request with:
+    python -m aureus_backend.utils.profiling GET /api/v1/banking/connect/connections
+"""
+import asyncio
+from collections import Counter
+import contextvars
+from dataclasses import dataclass, field
+import hashlib
+import hmac
+import json
+from pathlib import Path
+import random
+import sys
+import threading
+import time
+from typing import Optional
+import uuid
+
+from sqlalchemy import Engine, event
+
+from ..core.config import Config
+
+# Seconds a signed `X-Profile` header stays valid
+SIGNATURE_TTL = 300
+
+# Stack frames kept per sample, innermost last
+MAX_STACK_DEPTH = 128
+
+
+@dataclass
+class RequestProfile:
+    """Samples and timings collected for one request."""
+
+    method: str
+    path: str
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    started_at: float = field(default_factory=time.time)
+    samples: Counter = field(default_factory=Counter)
+    timings: list[tuple[str, str, float]] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, kind: str, label: str, duration: float) -> None:
+        with self._lock:
+            self.timings.append((kind, label, duration))
+
+    def breakdown(self) -> dict:
+        """Call count and total time per timing kind, and per label within each kind."""
+        with self._lock:
+            timings = list(self.timings)
+        kinds: dict[str, dict] = {}
+        for kind, label, duration in timings:
+            entry = kinds.setdefault(kind, {"calls": 0, "total_ms": 0.0, "by_label": {}})
+            entry["calls"] += 1
+            entry["total_ms"] += duration * 1000
+            by_label = entry["by_label"].setdefault(label, {"calls": 0, "total_ms": 0.0})
+            by_label["calls"] += 1
+            by_label["total_ms"] += duration * 1000
+        return kinds
+
+    def folded_stacks(self) -> str:
+        """Samples in the folded format: `frame;frame;...;frame count` per line."""
+        return "\n".join(
+            f"{';'.join(stack)} {count}" for stack, count in self.samples.most_common()
+        )
+
+    def top_functions(self, limit: int = 30) -> list[dict]:
+        """Functions with the most samples on top of the stack (self time)."""
+        own = Counter()
+        total = Counter()
+        for stack, count in self.samples.items():
+            own[stack[-1]] += count
+            for frame in set(stack):
+                total[frame] += count
+        return [
+            {"function": frame, "self_samples": count, "total_samples": total[frame]}
+            for frame, count in own.most_common(limit)
+        ]
+
+
+_current_profile: contextvars.ContextVar[Optional[RequestProfile]] = contextvars.ContextVar(
+    "current_profile", default=None
+)
+
+
+def record_timing(kind: str, label: str, duration: float) -> None:
+    """Attribute an upstream call or query duration to the request being profiled, if any."""
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.record(kind, label, duration)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time the queries of profiled requests (pass `sync_engine` for async engines)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_profile.get() is not None:
+            conn.info.setdefault("profiling_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_profile.get() is not None and conn.info.get("profiling_query_start"):
+            start = conn.info["profiling_query_start"].pop()
+            record_timing("db", " ".join(statement.split())[:120], time.perf_counter() - start)
+
+
+def sign(secret: str, method: str, path: str, timestamp: int) -> str:
+    """Value of the `X-Profile` header for a request."""
+    message = f"{timestamp}:{method.upper()}:{path}".encode()
+    digest = hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+    return f"{timestamp}.{digest}"
+
+
+def verify(secret: str, method: str, path: str, header: str) -> bool:
+    """Check an `X-Profile` header against the request and its age."""
+    if not secret:
+        return False
+    timestamp, _, _ = header.partition(".")
+    try:
+        issued_at = int(timestamp)
+    except ValueError:
+        return False
+    if abs(time.time() - issued_at) > SIGNATURE_TTL:
+        return False
+    return hmac.compare_digest(sign(secret, method, path, issued_at), header)
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def _stack(frame) -> tuple[str, ...]:
+    frames = []
+    while frame is not None and len(frames) < MAX_STACK_DEPTH:
+        frames.append(_frame_name(frame))
+        frame = frame.f_back
+    return tuple(reversed(frames))
+
+
+def _runs_in_context(frame, profile: RequestProfile) -> bool:
+    """Whether a worker thread's stack runs work submitted from the profiled context.
+
+    FastAPI runs sync routes and dependencies on anyio worker threads, which
+    call `context.run(...)` from a frame keeping the copied context in a local
+    named `context`.
+    """
+    while frame is not None:
+        if "context" in frame.f_code.co_varnames:
+            context = frame.f_locals.get("context")
+            if isinstance(context, contextvars.Context):
+                return context.get(_current_profile) is profile
+        frame = frame.f_back
+    return False
+
+
+class _Sampler(threading.Thread):
+    """Samples the stacks running on behalf of one request every `interval` seconds."""
+
+    def __init__(self, profile: RequestProfile, loop: asyncio.AbstractEventLoop, interval: float):
+        super().__init__(name=f"profiler-{profile.id}", daemon=True)
+        self.profile = profile
+        self.loop = loop
+        self.loop_thread_id = threading.get_ident()
+        self.interval = interval
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        while not self._done.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == self.ident:
+                    continue
+                if thread_id == self.loop_thread_id:
+                    task = asyncio.current_task(self.loop)
+                    if task is None or task.get_context().get(_current_profile) is not self.profile:
+                        continue
+                elif not _runs_in_context(frame, self.profile):
+                    continue
+                self.profile.samples[_stack(frame)] += 1
+
+    def stop(self) -> None:
+        self._done.set()
+        self.join()
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling signed or randomly sampled requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def _trigger(self, scope) -> Optional[bool]:
+        """None to skip the request, else whether to return the profile inline."""
+        header = next(
+            (value for name, value in scope["headers"] if name == b"x-profile"), None
+        )
+        if header is not None and verify(
+            Config.profiling_secret, scope["method"], scope["path"], header.decode("latin-1")
+        ):
+            return any(
+                name == b"x-profile-inline" and value == b"1" for name, value in scope["headers"]
+            )
+        if Config.profiling_sample_rate and random.random() < Config.profiling_sample_rate:
+            return False
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        inline = self._trigger(scope)
+        if inline is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(method=scope["method"], path=scope["path"])
+        status = 500
+
+        async def send_profiled(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if inline:
+                    return
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), (b"x-profile-id", profile.id.encode())]
+                }
+            elif inline:
+                return
+            await send(message)
+
+        token = _current_profile.set(profile)
+        sampler = _Sampler(profile, asyncio.get_running_loop(), Config.profiling_interval)
+        sampler.start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_profiled)
+        finally:
+            duration = time.perf_counter() - start
+            sampler.stop()
+            _current_profile.reset(token)
+
+        report = {
+            "id": profile.id,
+            "method": profile.method,
+            "path": profile.path,
+            "query": scope["query_string"].decode("latin-1"),
+            "status": status,
+            "started_at": profile.started_at,
+            "duration_ms": round(duration * 1000, 2),
+            "sample_interval_ms": Config.profiling_interval * 1000,
+            "samples": sum(profile.samples.values()),
+            "timings": profile.breakdown(),
+            "top_functions": profile.top_functions()
+        }
+        if inline:
+            body = json.dumps({**report, "folded": profile.folded_stacks()}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")]
+            })
+            await send({"type": "http.response.body", "body": body})
+        else:
+            await asyncio.to_thread(_write_profile, profile, report)
+
+
+def _write_profile(profile: RequestProfile, report: dict) -> None:
+    directory = Path(Config.profiling_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = f"{time.strftime('%Y%m%dT%H%M%S')}-{profile.method}-{profile.id}"
+    (directory / f"{stem}.json").write_text(json.dumps(report, indent=2))
+    (directory / f"{stem}.folded").write_text(profile.folded_stacks())
+
+
+def main() -> None:
+    """Print `X-Profile` header value for a request, signed with `PROFILING_SECRET`."""
+    if len(sys.argv) != 3 or not Config.profiling_secret:
+        sys.exit("usage: PROFILING_SECRET=... python -m aureus_backend.utils.profiling METHOD PATH")
+    print(sign(Config.profiling_secret, sys.argv[1], sys.argv[2], int(time.time())))
+
+
+if __name__ == "__main__":
+    main()
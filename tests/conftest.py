@@ -0,0 +1,51 @@
+import os
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+# Secret the auth tests sign tokens with; set before Config first reads it
+os.environ.setdefault("SUPABASE_JWT_SECRET", "test-jwt-secret")
+
+
+@pytest.fixture
+def pg_schema():
+    """Name of a throwaway schema in the `TEST_DATABASE_URL` database.
+
+    Tests using it are skipped when the variable is not set.
+    """
+    if not os.environ.get("TEST_DATABASE_URL"):
+        pytest.skip("TEST_DATABASE_URL not set")
+    return f"test_{uuid4().hex[:12]}"
+
+
+@pytest.fixture
+def pg_engine(pg_schema):
+    """Engine whose search path is `pg_schema`, dropped with its contents afterwards."""
+    engine = create_engine(
+        os.environ["TEST_DATABASE_URL"],
+        connect_args={"options": f"-csearch_path={pg_schema}"}
+    )
+    with engine.begin() as connection:
+        connection.exec_driver_sql(f"create schema {pg_schema}")
+    try:
+        yield engine
+    finally:
+        with engine.begin() as connection:
+            connection.exec_driver_sql(f"drop schema {pg_schema} cascade")
+        engine.dispose()
+
+
+@pytest.fixture
+def pg_async_engine(pg_engine, pg_schema):
+    """Factory of asyncpg engines on `pg_schema`.
+
+    Create and dispose each engine within the event loop that uses it.
+    """
+    def create() -> AsyncEngine:
+        return create_async_engine(
+            pg_engine.url.set(drivername="postgresql+asyncpg"),
+            connect_args={"server_settings": {"search_path": pg_schema}}
+        )
+    return create
@@ -0,0 +1,52 @@
+import asyncio
+import hashlib
+import time
+from uuid import uuid4
+
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+import jwt
+import pytest
+
+from aureus_backend.core import Config
+from aureus_backend.utils.dependencies import get_current_user, verified_tokens
+
+
+def _token(secret: str = "test-jwt-secret", **claims) -> str:
+    payload = {"sub": str(uuid4()), "aud": "authenticated", "exp": time.time() + 600}
+    payload.update(claims)
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
+def _authenticate(token: str):
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    return asyncio.run(get_current_user(credentials))
+
+
+def test_jwt_secret_is_read_from_the_environment():
+    assert Config.jwt_secret == "test-jwt-secret"
+
+
+def test_valid_token_is_decoded_and_cached():
+    user_id = uuid4()
+    token = _token(sub=str(user_id))
+    assert _authenticate(token) == user_id
+    assert verified_tokens.get(hashlib.sha256(token.encode()).digest()) == user_id
+    # Served from the cache on the next request
+    assert _authenticate(token) == user_id
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        _token(secret="another-secret"),
+        _token(exp=time.time() - 60),
+        _token(aud="anon-key"),
+        _token(sub="not-a-uuid"),
+    ],
+    ids=["bad-signature", "expired", "wrong-audience", "bad-subject"]
+)
+def test_invalid_tokens_are_rejected(token):
+    with pytest.raises(HTTPException) as error:
+        _authenticate(token)
+    assert error.value.status_code == 401
@@ -0,0 +1,110 @@
+import asyncio
+from pathlib import Path
+from uuid import UUID, uuid4
+
+from cryptography.fernet import Fernet
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from aureus_backend.api.v1.banking.connect import handle_callback, list_connections
+from aureus_backend.utils.crypto import get_fernet
+
+MIGRATIONS = Path(__file__).parents[1] / "src" / "aureus_backend" / "migrations"
+SESSION = {
+    "status": "AUTHORIZED",
+    "aspsp": {"name": "Nordea", "country": "FI"},
+    "accounts": [{"uid": "acc1"}, {"uid": "acc2"}],
+    "access": {"valid_until": "2030-01-01T00:00:00Z"},
+    "authorized": "2024-03-01T00:00:00Z",
+}
+
+
+class _FakeClient:
+    """Enable Banking client knowing one session, recording the lookups made."""
+
+    def __init__(self):
+        self.lookups = []
+
+    async def create_session(self, code: str) -> dict:
+        return {"session_id": f"session-{code}", "access_token": "token"}
+
+    async def get_session(self, session_id: str, aspsp=None) -> dict:
+        self.lookups.append((session_id, aspsp))
+        if session_id != "session-code1":
+            raise LookupError(f"Unknown session {session_id}")
+        return SESSION
+
+
+@pytest.fixture
+def engine(pg_engine, monkeypatch):
+    monkeypatch.setenv("AUREUS_MASTER_KEY", Fernet.generate_key().decode())
+    get_fernet.cache_clear()
+    with pg_engine.begin() as connection:
+        for name in (
+            "001_create_api_credentials",
+            "005_add_credential_status_snapshot",
+            "011_add_credential_session_id",
+        ):
+            connection.connection.cursor().execute((MIGRATIONS / f"{name}.sql").read_text())
+    yield pg_engine
+    get_fernet.cache_clear()
+
+
+def _user(engine) -> UUID:
+    user_id = uuid4()
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "insert into users (id, email) values (%s, %s)", (str(user_id), f"{user_id}@test")
+        )
+    return user_id
+
+
+def _connections(pg_async_engine, user_id: UUID, client: _FakeClient) -> list[dict]:
+    async def list_all() -> dict:
+        async_engine = pg_async_engine()
+        try:
+            async with AsyncSession(async_engine) as session, session.begin():
+                return await list_connections(user_id=user_id, db_session=session, client=client)
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(list_all())["connections"]
+
+
+def test_connections_are_looked_up_by_their_session(engine, pg_async_engine):
+    user_id = _user(engine)
+    client = _FakeClient()
+
+    async def connect():
+        async_engine = pg_async_engine()
+        try:
+            async with AsyncSession(async_engine) as session, session.begin():
+                await handle_callback("code1", user_id=user_id, db_session=session, client=client)
+        finally:
+            await async_engine.dispose()
+
+    asyncio.run(connect())
+    (connection,) = _connections(pg_async_engine, user_id, client)
+
+    # The authorized session is looked up; the bank ID only keys the circuit breaker
+    assert client.lookups[-1] == ("session-code1", "nordea_fi")
+    assert connection["provider_uid"] == "nordea_fi"
+    assert (connection["status"], connection["account_count"]) == ("AUTHORIZED", 2)
+    assert not connection["stale"]
+
+
+def test_connections_stored_without_a_session_ask_for_a_reconnect(engine, pg_async_engine):
+    user_id = _user(engine)
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "insert into api_credentials (user_id, provider, provider_uid, access_token, "
+            "expires_at) values (%s, 'enablebanking', 'nordea_fi', 'token', now())",
+            (str(user_id),)
+        )
+    client = _FakeClient()
+
+    (connection,) = _connections(pg_async_engine, user_id, client)
+
+    assert client.lookups == []
+    assert connection["stale"] and connection["status"] == "UNKNOWN"
+    assert "reconnect the bank" in connection["error"]
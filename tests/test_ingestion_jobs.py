@@ -0,0 +1,182 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from aureus_backend.models.base import Base, users
+from aureus_backend.models.ingestion_job import IngestionJob
+from aureus_backend.repositories.ingestion_jobs import (
+    AsyncIngestionJobsRepository,
+    IngestionJobsRepository,
+)
+
+PROVIDER = "enablebanking"
+STALE_AFTER = timedelta(minutes=5)
+MIGRATIONS = Path(__file__).parents[1] / "src" / "aureus_backend" / "migrations"
+
+
+@pytest.fixture
+def engine(pg_engine):
+    Base.metadata.create_all(pg_engine, tables=[users, IngestionJob.__table__])
+    with pg_engine.begin() as connection:
+        # The one-active-job-per-user index the enqueue upsert relies on
+        sql = (MIGRATIONS / "009_unique_active_ingestion_job.sql").read_text()
+        connection.connection.cursor().execute(sql)
+    return pg_engine
+
+
+def _user(engine) -> UUID:
+    user_id = uuid4()
+    with engine.begin() as connection:
+        connection.execute(insert(users).values(id=user_id))
+    return user_id
+
+
+def _job(engine, job_id: UUID) -> IngestionJob:
+    with Session(engine, expire_on_commit=False) as session:
+        return session.get(IngestionJob, job_id)
+
+
+def _set(engine, job_id: UUID, **values) -> None:
+    with engine.begin() as connection:
+        connection.execute(update(IngestionJob).where(IngestionJob.id == job_id).values(**values))
+
+
+def _finish_before_next_select(session: Session, engine, job_id: UUID) -> None:
+    """Let the job finish, from another connection, right before `session`'s next select."""
+    finished = []
+
+    @event.listens_for(session, "do_orm_execute")
+    def finish(state):
+        if state.is_select and not finished:
+            finished.append(job_id)
+            _set(engine, job_id, status="succeeded")
+
+
+def test_enqueue_returns_the_active_job(engine):
+    user_id = _user(engine)
+    with Session(engine, expire_on_commit=False) as session, session.begin():
+        job, created = IngestionJobsRepository(session).enqueue(user_id, PROVIDER)
+    assert created
+
+    with Session(engine, expire_on_commit=False) as session, session.begin():
+        active, created = IngestionJobsRepository(session).enqueue(
+            user_id, PROVIDER, full_refresh=True
+        )
+    assert (active.id, created) == (job.id, False)
+
+    _set(engine, job.id, status="succeeded")
+    with Session(engine, expire_on_commit=False) as session, session.begin():
+        after, created = IngestionJobsRepository(session).enqueue(user_id, PROVIDER)
+    assert created and after.id != job.id
+
+
+def test_enqueue_inserts_again_when_the_active_job_finishes_meanwhile(engine):
+    user_id = _user(engine)
+    with Session(engine, expire_on_commit=False) as session, session.begin():
+        job, _ = IngestionJobsRepository(session).enqueue(user_id, PROVIDER)
+
+    with Session(engine, expire_on_commit=False) as session, session.begin():
+        _finish_before_next_select(session, engine, job.id)
+        retried, created = IngestionJobsRepository(session).enqueue(user_id, PROVIDER)
+    assert created and retried.id != job.id
+
+
+def test_async_enqueue_inserts_again_when_the_active_job_finishes_meanwhile(engine, pg_async_engine):
+    user_id = _user(engine)
+    with Session(engine, expire_on_commit=False) as session, session.begin():
+        job, _ = IngestionJobsRepository(session).enqueue(user_id, PROVIDER)
+
+    async def enqueue():
+        async_engine = pg_async_engine()
+        try:
+            async with AsyncSession(async_engine, expire_on_commit=False) as session, session.begin():
+                _finish_before_next_select(session.sync_session, engine, job.id)
+                return await AsyncIngestionJobsRepository(session).enqueue(user_id, PROVIDER)
+        finally:
+            await async_engine.dispose()
+
+    retried, created = asyncio.run(enqueue())
+    assert created and retried.id != job.id
+
+
+def test_claim_next_claims_the_oldest_job_and_skips_locked_ones(engine):
+    with Session(engine, expire_on_commit=False) as session, session.begin():
+        jobs = IngestionJobsRepository(session)
+        first, _ = jobs.enqueue(_user(engine), PROVIDER)
+        second, _ = jobs.enqueue(_user(engine), PROVIDER)
+    _set(engine, first.id, created_at=datetime.now(timezone.utc) - timedelta(minutes=1))
+
+    # The first claim stays locked until its transaction ends
+    with Session(engine, expire_on_commit=False) as held, held.begin():
+        claimed = IngestionJobsRepository(held).claim_next("w1", STALE_AFTER, max_attempts=3)
+        assert claimed.id == first.id
+        with Session(engine, expire_on_commit=False) as other, other.begin():
+            repository = IngestionJobsRepository(other)
+            assert repository.claim_next("w2", STALE_AFTER, max_attempts=3).id == second.id
+        with Session(engine, expire_on_commit=False) as other, other.begin():
+            assert IngestionJobsRepository(other).claim_next("w3", STALE_AFTER, 3) is None
+
+    job = _job(engine, first.id)
+    assert (job.status, job.worker_id, job.attempts) == ("running", "w1", 1)
+    assert job.heartbeat_at is not None and job.started_at is not None
+
+
+def test_claim_next_reclaims_stale_jobs_until_out_of_attempts(engine):
+    with Session(engine, expire_on_commit=False) as session, session.begin():
+        job, _ = IngestionJobsRepository(session).enqueue(_user(engine), PROVIDER)
+    stale = datetime.now(timezone.utc) - 2 * STALE_AFTER
+
+    # A running job with a fresh heartbeat is left to its worker
+    _set(engine, job.id, status="running", worker_id="w1", attempts=1,
+         heartbeat_at=datetime.now(timezone.utc))
+    with Session(engine, expire_on_commit=False) as session, session.begin():
+        assert IngestionJobsRepository(session).claim_next("w2", STALE_AFTER, 3) is None
+
+    # Once its worker stops heartbeating, another worker takes it over
+    _set(engine, job.id, heartbeat_at=stale)
+    with Session(engine, expire_on_commit=False) as session, session.begin():
+        reclaimed = IngestionJobsRepository(session).claim_next("w2", STALE_AFTER, 3)
+        assert (reclaimed.id, reclaimed.worker_id, reclaimed.attempts) == (job.id, "w2", 2)
+
+    # After the last attempt it fails instead
+    _set(engine, job.id, attempts=3, heartbeat_at=stale)
+    with Session(engine, expire_on_commit=False) as session, session.begin():
+        assert IngestionJobsRepository(session).claim_next("w3", STALE_AFTER, 3) is None
+    failed = _job(engine, job.id)
+    assert failed.status == "failed"
+    assert failed.error == "Abandoned after 3 attempts"
+    assert failed.finished_at is not None
+
+
+def test_heartbeat_and_finish_only_apply_to_the_holding_worker(engine):
+    with Session(engine, expire_on_commit=False) as session, session.begin():
+        jobs = IngestionJobsRepository(session)
+        jobs.enqueue(_user(engine), PROVIDER)
+        job = jobs.claim_next("w1", STALE_AFTER, max_attempts=3)
+    claimed_heartbeat = job.heartbeat_at
+
+    with Session(engine, expire_on_commit=False) as session, session.begin():
+        jobs = IngestionJobsRepository(session)
+        jobs.heartbeat(job.id, "w2", {"pages_done": 9})
+        jobs.finish(job.id, "w2", {"pages_done": 9}, error="not mine")
+    assert _job(engine, job.id).progress == {}
+    assert _job(engine, job.id).status == "running"
+
+    with Session(engine, expire_on_commit=False) as session, session.begin():
+        IngestionJobsRepository(session).heartbeat(job.id, "w1", {"pages_done": 1})
+    beat = _job(engine, job.id)
+    assert beat.progress == {"pages_done": 1}
+    assert beat.heartbeat_at > claimed_heartbeat
+
+    with Session(engine, expire_on_commit=False) as session, session.begin():
+        IngestionJobsRepository(session).finish(job.id, "w1", {"pages_done": 2})
+    finished = _job(engine, job.id)
+    assert (finished.status, finished.progress, finished.error) == ("succeeded", {"pages_done": 2}, None)
+    with Session(engine, expire_on_commit=False) as session:
+        assert session.scalar(select(IngestionJob.finished_at).where(IngestionJob.id == job.id))
@@ -0,0 +1,17 @@
+import subprocess
+import sys
+
+# Modules on the startup path of the API and the ingestion workers
+MODULES = (
+    "aureus_backend.services.ingestion.enable_banking",
+    "aureus_backend.services.ingestion.jobs",
+    "aureus_backend.api.v1.banking.net_worth",
+)
+
+
+def test_heavy_libraries_are_imported_on_first_use():
+    code = f"import sys, {', '.join(MODULES)}; print(sorted({{'dlt', 'numpy'}} & set(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
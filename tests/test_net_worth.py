@@ -0,0 +1,38 @@
+import numpy as np
+
+from aureus_backend.services.net_worth import Anchor, Ledger, balance_series
+
+
+def _apply(ledger: Ledger, rows: list[tuple[int, str, int, float]], load_id: str) -> Ledger:
+    keys, accounts, days, amounts = zip(*rows)
+    return ledger.apply(
+        np.array(keys, dtype=np.int64),
+        accounts,
+        np.array(days, dtype=np.int64),
+        np.array(amounts),
+        load_id
+    )
+
+
+def _daily_totals(ledger: Ledger, account: str) -> dict[int, float]:
+    row = ledger.buckets[ledger.accounts.index(account)]
+    return {ledger.first_day + day: amount for day, amount in enumerate(row) if amount}
+
+
+def test_rebooking_the_earliest_transaction_keeps_later_deltas_applicable():
+    ledger = _apply(Ledger.empty(), [(1, "a", 100, -5.0), (2, "a", 110, 20.0)], "1")
+    # The earliest transaction is re-loaded with a later booking date...
+    ledger = _apply(ledger, [(1, "a", 105, -5.0)], "2")
+    # ...and the next delta must still apply on top of the ledger
+    ledger = _apply(ledger, [(3, "a", 120, 1.5)], "3")
+    # Growing the range backwards still works afterwards
+    ledger = _apply(ledger, [(4, "b", 90, 3.0)], "4")
+
+    assert ledger.load_id == "4"
+    assert _daily_totals(ledger, "a") == {105: -5.0, 110: 20.0, 120: 1.5}
+    assert _daily_totals(ledger, "b") == {90: 3.0}
+
+    series = balance_series(
+        ledger, [Anchor("a", 120, 100.0, "EUR")], np.array([99, 105, 110, 120])
+    )
+    assert series.tolist() == [[83.5, 78.5, 98.5, 100.0]]
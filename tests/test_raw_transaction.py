@@ -0,0 +1,97 @@
+from aureus_backend.models.raw_transaction import attach_nested, nest_columns, nested_tables
+
+# Upstream transaction as Enable Banking returns it
+UPSTREAM = {
+    "entry_reference": "E1",
+    "transaction_amount": {"currency": "EUR", "amount": "4.50"},
+    "credit_debit_indicator": "DBIT",
+    "status": "BOOK",
+    "booking_date": "2024-03-01",
+    "value_date": "2024-03-01",
+    "note": None,
+    "remittance_information": ["COFFEE", "HELSINKI"],
+    "creditor": {
+        "name": "Coffee Shop",
+        "postal_address": {"country": "FI", "address_line": ["Street 1", "00100"]},
+    },
+    "debtor_account_additional_identification": [
+        {"identification": "X1", "scheme_name": "S", "issuers": ["A", "B"]},
+        {"identification": "X2", "scheme_name": "S"},
+    ],
+}
+
+# The same transaction as dlt stores it: the flattened parent row (with the
+# context ingestion adds) and one table per list field, `(parent, id, row)`
+STORED_ROW = {
+    "entry_reference": "E1",
+    "transaction_amount__currency": "EUR",
+    "transaction_amount__amount": "4.50",
+    "credit_debit_indicator": "DBIT",
+    "status": "BOOK",
+    "booking_date": "2024-03-01",
+    "value_date": "2024-03-01",
+    "creditor__name": "Coffee Shop",
+    "creditor__postal_address__country": "FI",
+    "transaction_id": "E1",
+    "user_id": "u",
+    "account_uid": "acc1",
+    "ingested_at": "2024-03-02T00:00:00",
+    "_dlt_load_id": "1709337600.0",
+    "_dlt_id": "t1",
+}
+DLT_COLUMNS = {"_dlt_parent_id", "_dlt_list_idx", "_dlt_id", "_dlt_root_id"}
+STORED_LISTS = {
+    "raw_transactions__remittance_information": [
+        ("t1", "r1", {"value": "COFFEE"}),
+        ("t1", "r2", {"value": "HELSINKI"}),
+    ],
+    "raw_transactions__creditor__postal_address__address_line": [
+        ("t1", "a1", {"value": "Street 1"}),
+        ("t1", "a2", {"value": "00100"}),
+    ],
+    "raw_transactions__debtor_account_additional_identification": [
+        ("t1", "d1", {"identification": "X1", "scheme_name": "S", "_dlt_id": "d1"}),
+        ("t1", "d2", {"identification": "X2", "scheme_name": "S", "_dlt_id": "d2"}),
+    ],
+    "raw_transactions__debtor_account_additional_identification__issuers": [
+        ("d1", "i1", {"value": "A"}),
+        ("d1", "i2", {"value": "B"}),
+    ],
+}
+STORED_COLUMNS = {
+    "raw_transactions__remittance_information": {"value"} | DLT_COLUMNS,
+    "raw_transactions__creditor__postal_address__address_line": {"value"} | DLT_COLUMNS,
+    "raw_transactions__debtor_account_additional_identification":
+        {"identification", "scheme_name"} | DLT_COLUMNS,
+    "raw_transactions__debtor_account_additional_identification__issuers":
+        {"value"} | DLT_COLUMNS,
+}
+
+
+def _store_page() -> list[dict]:
+    """What the transactions repository returns for the stored rows."""
+    transactions = {STORED_ROW["_dlt_id"]: nest_columns(STORED_ROW)}
+    elements = {"raw_transactions": transactions}
+    for table in nested_tables(STORED_COLUMNS):
+        parents = elements.get(table.parent)
+        if parents:
+            elements[table.name] = attach_nested(parents, table, STORED_LISTS[table.name])
+    return list(transactions.values())
+
+
+def test_nested_tables_are_ordered_parents_first():
+    tables = {table.name: table for table in nested_tables(STORED_COLUMNS)}
+    issuers = tables["raw_transactions__debtor_account_additional_identification__issuers"]
+    assert issuers.parent == "raw_transactions__debtor_account_additional_identification"
+    assert issuers.path == ("issuers",)
+    assert issuers.scalar
+    address = tables["raw_transactions__creditor__postal_address__address_line"]
+    assert address.parent == "raw_transactions"
+    assert address.path == ("creditor", "postal_address", "address_line")
+    assert not tables["raw_transactions__debtor_account_additional_identification"].scalar
+
+
+def test_store_page_matches_upstream_page():
+    # Null fields have no column in the store, so they are the only difference
+    upstream_page = [{key: value for key, value in UPSTREAM.items() if value is not None}]
+    assert _store_page() == upstream_page
@@ -0,0 +1,210 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from aureus_backend.clients import resilience
+from aureus_backend.clients.resilience import (
+    CircuitBreaker,
+    TokenBucket,
+    UpstreamPolicy,
+    UpstreamUnavailableError,
+    parse_retry_after,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Monotonic clock of the resilience module, advanced by hand."""
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(resilience, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def _policy(**overrides) -> UpstreamPolicy:
+    settings = dict(
+        global_rate=1000,
+        global_burst=1000,
+        aspsp_rate=1000,
+        aspsp_burst=1000,
+        max_attempts=3,
+        backoff_base=0.01,
+        backoff_max=10,
+        breaker_threshold=3,
+        breaker_reset=30
+    )
+    settings.update(overrides)
+    return UpstreamPolicy(**settings)
+
+
+def _open_breaker(clock) -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure()
+    return breaker
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        breaker.record_failure()
+    # A success resets the count, so failures must be consecutive
+    breaker.record_success()
+    for _ in range(2):
+        breaker.record_failure()
+    breaker.before_call()
+
+    breaker.record_failure()
+    with pytest.raises(UpstreamUnavailableError):
+        breaker.before_call()
+    clock.value += 29
+    with pytest.raises(UpstreamUnavailableError):
+        breaker.before_call()
+
+
+def test_half_open_breaker_lets_one_probe_through_and_closes_on_success(clock):
+    breaker = _open_breaker(clock)
+    clock.value += 30
+
+    breaker.before_call()
+    # Only the probe goes through while it is in flight
+    with pytest.raises(UpstreamUnavailableError):
+        breaker.before_call()
+
+    breaker.record_success()
+    breaker.before_call()
+    breaker.before_call()
+    # Closed again with a fresh count: a single failure doesn't re-open it
+    breaker.record_failure()
+    breaker.before_call()
+
+
+def test_failed_probe_reopens_the_breaker(clock):
+    breaker = _open_breaker(clock)
+    clock.value += 30
+    breaker.before_call()
+
+    breaker.record_failure()
+    with pytest.raises(UpstreamUnavailableError):
+        breaker.before_call()
+    # For another full reset timeout
+    clock.value += 29
+    with pytest.raises(UpstreamUnavailableError):
+        breaker.before_call()
+    clock.value += 1
+    breaker.before_call()
+
+
+def test_probe_that_never_reports_back_is_replaced(clock):
+    breaker = _open_breaker(clock)
+    clock.value += 30
+    breaker.before_call()  # e.g. cancelled before recording its outcome
+
+    clock.value += 29
+    with pytest.raises(UpstreamUnavailableError):
+        breaker.before_call()
+    clock.value += 1
+    breaker.before_call()
+
+
+def test_policy_breaks_per_bank_on_server_errors_only(clock):
+    policy = _policy()
+    for attempt in (1, 2, 3):
+        policy.before_call("nordea_fi")
+        policy.after_call("nordea_fi", "GET", attempt, status=503)
+    with pytest.raises(UpstreamUnavailableError):
+        policy.before_call("nordea_fi")
+    # Other banks are unaffected, and rate limiting alone doesn't open a circuit
+    for attempt in (1, 2, 3):
+        policy.after_call("op_fi", "GET", attempt, status=429)
+    assert policy.before_call("op_fi") == 0.0
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("120", 120.0), ("0.5", 0.5), ("-3", 0.0), ("", None), (None, None), ("soon", None)]
+)
+def test_retry_after_in_seconds(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_retry_after_as_http_date():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 28 <= parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 30
+    past = datetime.now(timezone.utc) - timedelta(minutes=5)
+    assert parse_retry_after(format_datetime(past, usegmt=True)) == 0.0
+
+
+def test_retry_decisions_honor_retry_after():
+    policy = _policy(backoff_max=10)
+    # At least as long as the server asked, even if the backoff is shorter
+    assert policy.after_call("nordea_fi", "GET", 1, status=429, retry_after="2") >= 2
+    http_date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=5), usegmt=True)
+    assert 3 <= policy.after_call("nordea_fi", "GET", 1, status=429, retry_after=http_date) <= 10
+    # Longer than backoff_max: give up instead of holding the caller
+    assert policy.after_call("nordea_fi", "GET", 1, status=429, retry_after="60") is None
+    # Out of attempts
+    assert policy.after_call("nordea_fi", "GET", 3, status=429, retry_after="1") is None
+
+
+def test_retry_decisions_only_replay_unprocessed_or_idempotent_calls():
+    policy = _policy()
+    assert policy.after_call(None, "POST", 1, status=503) is None
+    assert policy.after_call(None, "POST", 1, status=429) is not None
+    assert policy.after_call(None, "GET", 1, connection_error=True) is not None
+    assert policy.after_call(None, "POST", 1, connection_error=True) is None
+    assert policy.after_call(None, "GET", 1, status=404) is None
+    assert policy.after_call(None, "GET", 1, status=200) is None
+
+
+def test_token_bucket_refills_up_to_its_capacity(clock):
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, pytest.approx(0.1)]
+    clock.value += 10
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, pytest.approx(0.1)]
+
+
+def test_token_bucket_gives_concurrent_callers_distinct_slots(clock):
+    bucket = TokenBucket(rate=10, capacity=5)
+    callers = 40
+    barrier = threading.Barrier(callers)
+    delays = []
+    lock = threading.Lock()
+
+    def reserve():
+        barrier.wait()
+        delay = bucket.reserve()
+        with lock:
+            delays.append(delay)
+
+    threads = [threading.Thread(target=reserve) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # The burst goes through at once, then one caller every 1/rate seconds
+    expected = [0.0] * 5 + [n / 10 for n in range(1, callers - 4)]
+    assert sorted(delays) == pytest.approx(expected)
+
+
+def test_rate_limit_holds_across_concurrent_async_callers():
+    policy = _policy(global_rate=100, global_burst=2)
+    calls = 12
+
+    async def call():
+        await asyncio.sleep(policy.before_call(None))
+        return time.monotonic()
+
+    async def run():
+        start = time.monotonic()
+        finished = await asyncio.gather(*(call() for _ in range(calls)))
+        return max(finished) - start
+
+    # 2 calls from the burst, the other 10 at 100 per second
+    assert asyncio.run(run()) >= 0.1 - 0.01
@@ -0,0 +1,70 @@
+from aureus_backend.services.ingestion.enable_banking import (
+    iter_account_transactions,
+    transaction_id,
+)
+
+
+def _card_payment(**overrides) -> dict:
+    transaction = {
+        "transaction_amount": {"currency": "EUR", "amount": "4.50"},
+        "credit_debit_indicator": "DBIT",
+        "status": "BOOK",
+        "booking_date": "2024-03-01",
+        "value_date": "2024-03-01",
+        "remittance_information": ["COFFEE SHOP HELSINKI"],
+        "creditor": {"name": "Coffee Shop"},
+    }
+    transaction.update(overrides)
+    return transaction
+
+
+class _PagedClient:
+    """Serves fresh copies of fixed transaction pages, chained by continuation keys."""
+
+    def __init__(self, pages: list[list[dict]]):
+        self.pages = pages
+
+    def get_account_transactions(self, account_uid, date_from, continuation_key=None, aspsp=None):
+        index = int(continuation_key or 0)
+        next_key = str(index + 1) if index + 1 < len(self.pages) else None
+        return {
+            "transactions": [dict(t) for t in self.pages[index]],
+            "continuation_key": next_key,
+        }
+
+
+def _fetched_ids(client: _PagedClient) -> list[str]:
+    pages = iter_account_transactions(client, {"uid": "acc1"}, "user", "2024-01-01")
+    return [t["transaction_id"] for page in pages for t in page]
+
+
+def test_entry_reference_is_the_identity():
+    assert transaction_id(_card_payment(entry_reference="ref-1")) == "ref-1"
+
+
+def test_identity_ignores_volatile_fields():
+    pending = _card_payment(status="PDNG", booking_date=None)
+    booked = _card_payment()
+    assert transaction_id(pending) == transaction_id(booked)
+
+
+def test_identity_differs_on_identifying_fields():
+    assert transaction_id(_card_payment()) != transaction_id(
+        _card_payment(transaction_amount={"currency": "EUR", "amount": "4.60"})
+    )
+
+
+def test_identical_transactions_without_entry_reference_get_distinct_stable_ids():
+    # Two identical coffees on the same day, the second one on the next page
+    client = _PagedClient([
+        [_card_payment(), _card_payment(creditor={"name": "Bakery"})],
+        [_card_payment()],
+    ])
+    ids = _fetched_ids(client)
+
+    digest = transaction_id(_card_payment())
+    assert ids[0] == digest
+    assert ids[2] == f"{digest}:2"
+    # Unique within the load, as the upsert requires, and the same on a re-fetch
+    assert len(set(ids)) == len(ids)
+    assert _fetched_ids(client) == ids
@@ -0,0 +1,60 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+from aureus_backend.services.ingestion import enable_banking
+from aureus_backend.services.ingestion.enable_banking import iter_transaction_pages
+
+
+class _EndlessClient:
+    """Serves an endless history of one-transaction pages for every account."""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get_account_transactions(self, account_uid, date_from, continuation_key=None, aspsp=None):
+        with self._lock:
+            self.calls.append(account_uid)
+        time.sleep(0.005)
+        page = int(continuation_key or 0)
+        return {
+            "transactions": [{"entry_reference": f"{account_uid}-{page}"}],
+            "continuation_key": str(page + 1),
+        }
+
+
+class _RecordingExecutor(ThreadPoolExecutor):
+    instances = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.shutdowns = []
+        _RecordingExecutor.instances.append(self)
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        self.shutdowns.append({"wait": wait, "cancel_futures": cancel_futures})
+        super().shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+def test_closing_the_page_iterator_stops_the_fetchers(monkeypatch):
+    monkeypatch.setattr(enable_banking, "ThreadPoolExecutor", _RecordingExecutor)
+    monkeypatch.setattr(_RecordingExecutor, "instances", [])
+    client = _EndlessClient()
+    accounts = [{"uid": f"acc{n}"} for n in range(8)]
+    sessions = [{"aspsp": {"name": "Nordea", "country": "FI"}, "accounts": accounts}]
+    date_from = {account["uid"]: "2024-01-01" for account in accounts}
+
+    pages = iter_transaction_pages(client, "user", sessions, date_from, max_workers=2)
+    assert len(next(pages)) == 1
+    pages.close()
+
+    (executor,) = _RecordingExecutor.instances
+    assert executor.shutdowns == [{"wait": True, "cancel_futures": True}]
+    # Shut down with waiting: no fetcher is left running...
+    assert not any(thread.is_alive() for thread in executor._threads)
+    # ...no further page is fetched, and accounts not started yet never are
+    calls = len(client.calls)
+    time.sleep(0.05)
+    assert len(client.calls) == calls
+    assert len(set(client.calls)) <= 2
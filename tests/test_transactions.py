@@ -0,0 +1,58 @@
+import asyncio
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from aureus_backend.models.raw_transaction import RAW_TRANSACTIONS, TransactionFilters
+from aureus_backend.repositories.transactions import AsyncTransactionsRepository
+
+# (transaction_id, booking_date, value_date), in listing order: newest first,
+# transactions without any date last
+ROWS = [
+    ("t5", "2024-03-03", None),
+    ("t4", None, "2024-03-02"),
+    ("t3", "2024-03-01", "2024-02-28"),
+    ("t2", None, None),
+    ("t1", None, None),
+]
+
+
+def test_pagination_continues_past_transactions_without_a_date(
+    pg_engine, pg_schema, pg_async_engine, monkeypatch
+):
+    # Reads are qualified with the ingestion schema: point them at the test one
+    monkeypatch.setattr(RAW_TRANSACTIONS, "schema", pg_schema)
+    user_id = uuid4()
+    with pg_engine.begin() as connection:
+        connection.exec_driver_sql(
+            "create table raw_transactions (user_id varchar, account_uid varchar, "
+            "transaction_id varchar, entry_reference varchar, booking_date varchar, value_date varchar, "
+            "credit_debit_indicator varchar, transaction_amount__amount varchar, "
+            "_dlt_load_id varchar, _dlt_id varchar)"
+        )
+        for transaction_id, booking_date, value_date in ROWS:
+            connection.exec_driver_sql(
+                "insert into raw_transactions values "
+                "(%s, 'acc1', %s, %s, %s, %s, 'DBIT', '1.00', '1', %s)",
+                (str(user_id), transaction_id, transaction_id, booking_date, value_date,
+                 transaction_id)
+            )
+
+    async def list_all() -> list[list[str]]:
+        engine = pg_async_engine()
+        pages, after = [], None
+        try:
+            async with AsyncSession(engine) as session:
+                repository = AsyncTransactionsRepository(session)
+                while True:
+                    transactions, after = await repository.list(
+                        user_id, "acc1", TransactionFilters(), after=after, limit=2
+                    )
+                    pages.append([t["entry_reference"] for t in transactions])
+                    if after is None:
+                        return pages
+        finally:
+            await engine.dispose()
+
+    pages = asyncio.run(list_all())
+    assert pages == [["t5", "t4"], ["t3", "t2"], ["t1"]]